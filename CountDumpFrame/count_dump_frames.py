@@ -0,0 +1,119 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2023 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+
+import sys
+import os
+import json
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from dump_io import open_dump, compression_of, CHUNK_SIZE
+from frame_index import load_index, build_index
+
+parser = argparse.ArgumentParser(description='Count the frames of lammps dump files')
+parser.add_argument('dump_file', type=str, help='Path of the lammps dump file')
+parser.add_argument('-json', type=str, default=None, help='Path of a JSON file with the statistics (- for stdout)')
+parser.add_argument('-index', type=int, default=0, help='Store the frame index to the sidecar file (dump_file.idx)')
+
+def TrailingBytes(dump_file, indexed):
+   """
+   Returns the number of bytes after the last complete frame.
+   """
+   if compression_of(dump_file) is None:
+      return os.path.getsize(dump_file) - indexed
+   nbytes = 0
+   with open_dump(dump_file) as foo:
+      foo.seek(indexed)
+      while True:
+         data = foo.read(CHUNK_SIZE)
+         if not data:
+            break
+         nbytes += len(data)
+   return nbytes
+
+def FrameStats(dump_file, index):
+   """
+   Collects the frame count, timestep range and stride, atom count range and
+   the size of a truncated trailing frame of an indexed dump file.
+   """
+   timesteps = index.timesteps
+   n_atoms = index.n_atoms
+   strides = np.diff(timesteps)
+   trailing = TrailingBytes(dump_file, index.indexed)
+   stats = {
+      'file': dump_file,
+      'frames': len(index),
+      'timestep_first': None,
+      'timestep_last': None,
+      'stride': None,
+      'stride_min': None,
+      'stride_max': None,
+      'atoms_min': None,
+      'atoms_max': None,
+      'atoms_total': int(n_atoms.sum()),
+      'truncated_frames': int(trailing > 0),
+      'truncated_bytes': int(trailing),
+   }
+   if len(index):
+      stats['timestep_first'] = int(timesteps[0])
+      stats['timestep_last'] = int(timesteps[-1])
+      stats['atoms_min'] = int(n_atoms.min())
+      stats['atoms_max'] = int(n_atoms.max())
+   if len(strides):
+      stats['stride_min'] = int(strides.min())
+      stats['stride_max'] = int(strides.max())
+      if stats['stride_min'] == stats['stride_max']:
+         stats['stride'] = stats['stride_min']
+   return stats
+
+if __name__ == "__main__":
+   args = parser.parse_args()
+   dump_file = args.dump_file
+
+   # The headers are scanned and the atom lines are skipped block-wise
+   index = load_index(dump_file) if args.index else build_index(dump_file)
+   stats = FrameStats(dump_file, index)
+
+   if args.json == '-':
+      json.dump(stats, sys.stdout, indent=2)
+      print()
+      sys.exit(0)
+   if args.json is not None:
+      with open(args.json, 'w') as foo:
+         json.dump(stats, foo, indent=2)
+         foo.write('\n')
+
+   print("frames    : ", stats['frames'])
+   if stats['frames']:
+      print("timesteps : ", stats['timestep_first'], "-", stats['timestep_last'])
+   if stats['stride'] is not None:
+      print("stride    : ", stats['stride'])
+   elif stats['stride_min'] is not None:
+      print("stride    : ", "variable", stats['stride_min'], "-", stats['stride_max'])
+   if stats['frames']:
+      print("atoms     : ", stats['atoms_min'], "-", stats['atoms_max'])
+   if stats['truncated_frames']:
+      print("truncated : ", stats['truncated_frames'], "frame (%d bytes)" % stats['truncated_bytes'])
@@ -1,2 +1,2 @@
 #!/bin/bash
-rm o.log
+rm o.log o.json o.gcmc_trunc.log
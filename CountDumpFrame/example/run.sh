@@ -1,2 +1,3 @@
 #!/bin/bash
-../dump_count_frame.sh dump.lammpstrj
+python ../count_dump_frames.py dump.lammpstrj > o.log
+python ../count_dump_frames.py dump_gcmc_trunc.lammpstrj -json o.json > o.gcmc_trunc.log
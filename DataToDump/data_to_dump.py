@@ -24,26 +24,108 @@
 
 import sys
 import os
-import copy as cp
+import io
+import re
+import glob
 import argparse
+import functools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from atom_style import get_atom_style, read_atoms, set_columns, format_atoms, image_flags
+from data_file import read_data
 
 parser = argparse.ArgumentParser()
-parser.add_argument('data_file', type=str, help='Path of the lammps data file')
-parser.add_argument('atom_style',  type=str, help='Lammps atom style')
+parser.add_argument('data_file', type=str, nargs='+', help='Path(s) or glob pattern(s) of the lammps data file(s)')
+parser.add_argument('atom_style',  type=str, help='Lammps atom style (e.g., full, atomic, charge or "hybrid sphere dipole")')
 parser.add_argument('-fmt', '--fmt', help='format of Lammps dump file', type=str)
 parser.add_argument('-dump_file', type=str, default="dump.lammpstrj", help='Path of the Lammps dump file.')
 parser.add_argument('-file_type', type=str, default="lammpstrj", help='Type of the dump file.')
+parser.add_argument('-j', '--workers', type=int, default=1, help='Number of worker processes parsing the data files')
+
+def NaturalKey(path):
+   """Sort key ordering embedded numbers numerically (o.pos_2 before o.pos_10)."""
+   return [int(tok) if tok.isdigit() else tok for tok in re.split(r'(\d+)', path)]
+
+def ExpandFiles(patterns):
+   """Expands the glob patterns and returns the data files in natural order."""
+   files = []
+   for pattern in patterns:
+      matches = glob.glob(pattern)
+      files.extend(matches if matches else [pattern])
+   return sorted(set(files), key=NaturalKey)
+
+def ConvertDataFile(file_data, timestep, atom_style, fmt, file_type):
+   """
+   Converts the Atoms section of a data file to a dump frame.
+
+   Returns:
+      str: The frame in lammpstrj or xyz format.
+   """
+   data = read_data(file_data, parse=set())
+   style = get_atom_style(atom_style)
+   table = read_atoms(data['Atoms'].lines)
+   n_atom = table.shape[0]
+   (xlo, xhi), (ylo, yhi), (zlo, zhi) = [data.box_text.get(key, [str(val) for val in bounds])
+                                         for key, bounds in zip(('xlo xhi', 'ylo yhi', 'zlo zhi'), data.box.tolist())]
+   lx, ly, lz = data.lengths.tolist()
 
+   # Export the header of the dump file
+   frame = io.StringIO()
+   if file_type == "lammpstrj":
+      frame.write("ITEM: TIMESTEP\n")
+      frame.write("%d\n" % (timestep))
+      frame.write("ITEM: NUMBER OF ATOMS\n")
+      frame.write("%d\n" % (n_atom))
+      if data.tilt is None:
+         frame.write("ITEM: BOX BOUNDS pp pp pp\n")
+         frame.write("%s %s\n" % (xlo, xhi))
+         frame.write("%s %s\n" % (ylo, yhi))
+         frame.write("%s %s\n" % (zlo, zhi))
+      else:
+         # bounding box of the triclinic cell
+         xy, xz, yz = data.tilt.tolist()
+         frame.write("ITEM: BOX BOUNDS xy xz yz pp pp pp\n")
+         (xlo, xhi), (ylo, yhi), (zlo, zhi) = data.box.tolist()
+         frame.write("%s %s %s\n" % (xlo + min(0.0, xy, xz, xy+xz), xhi + max(0.0, xy, xz, xy+xz), xy))
+         frame.write("%s %s %s\n" % (ylo + min(0.0, yz), yhi + max(0.0, yz), xz))
+         frame.write("%s %s %s\n" % (zlo, zhi, yz))
+      frame.write("ITEM: ATOMS")
+      for kind in fmt:
+         frame.write(" %s" % (kind))
+      frame.write("\n")
+   elif file_type == "xyz":
+      frame.write("%d\n" % (n_atom))
+      for kind in fmt:
+         frame.write("%s " % (kind))
+      frame.write("\n")
+
+   # Unwrap the coordinates of the atoms with image flags; the other tokens
+   # are exported as they are in the data file
+   flags, valid = image_flags(table, style)
+   if valid.any():
+      xy, xz, yz = data.tilt.tolist() if data.tilt is not None else (0.0, 0.0, 0.0)
+      rr = table[valid][:, style.xyz].astype(np.float64) + flags[valid] @ np.array([[lx, 0.0, 0.0], [xy, ly, 0.0], [xz, yz, lz]])
+      table = set_columns(table, style.xyz, rr, np.flatnonzero(valid))
+
+   # Export the requested attributes to the dump frame
+   if n_atom:
+      frame.writelines(format_atoms(table[:, [style.col[kind] for kind in fmt]], end=' \n'))
+   return frame.getvalue()
 
 if __name__ == "__main__":
    args = parser.parse_args()
-   file_data = args.data_file
+   files_data = ExpandFiles(args.data_file)
    atom_style = args.atom_style
    file_dump = args.dump_file
    file_type = args.file_type
    fmt = [item for item in args.fmt.split(',')]
 
-   print("data file  : ", file_data)
+   if len(files_data) == 1:
+      print("data file  : ", files_data[0])
+   else:
+      print("data files : ", len(files_data), "(", files_data[0], "..", files_data[-1], ")")
    print("atom_style : ", atom_style)
    print("dump_file  : ", file_dump)
    print("format     : ", fmt)
@@ -53,116 +135,24 @@ if __name__ == "__main__":
       print("Unsupported file type ", file_type)
       sys.exit()
 
-   atoms = {}
-
-   n_atom = 0
-   xlo = xhi = ylo = yhi = zlo = zhi = lx = ly = lz = -1
-
-   col = {}
-   if atom_style == "full":
-      col["id"] = 0
-      col["mol"] = 1
-      col["type"] = 2
-      col["q"] = 3
-      col["x"] = 4
-      col["y"] = 5
-      col["z"] = 6
-   elif atom_style == "atomic":
-      col["id"] = 0
-      col["type"] = 1
-      col["x"] = 2
-      col["y"] = 3
-      col["z"] = 4
-   else:
+   try:
+      get_atom_style(atom_style)
+   except ValueError:
       print("Error: unsupported atom style ", atom_style)
       sys.exit()
 
-   foo = open(file_data, 'r')
-   lines = []
-   line_num = 0
-   while True:
-      line = foo.readline()
-
-      # Check if this is the end of file; if yes break the loop.
-      if line == '':
-         break
-
-      line_split = line.split()
-      if "atoms" in line:
-         n_atom = int(line_split[0])
-      if "xlo xhi" in line:
-         xlo = line_split[0]
-         xhi = line_split[1]
-         lx = float(xhi) - float(xlo)
-      if "ylo yhi" in line:
-         ylo = line_split[0]
-         yhi = line_split[1]
-         ly = float(yhi) - float(ylo)
-      if "zlo zhi" in line:
-         zlo = line_split[0]
-         zhi = line_split[1]
-         lz = float(zhi) - float(zlo)
-      if "Atoms" in line:
-         Atoms_start = line_num + 2
-      lines.append(line)
-      line_num += 1
-   foo.close()
-
-   # Export the header of the dump file
-   foo = open(file_dump, 'w')
-   if file_type == "lammpstrj":
-      foo.write("ITEM: TIMESTEP\n")
-      foo.write("0\n")
-      foo.write("ITEM: NUMBER OF ATOMS\n")
-      foo.write("%d\n" % (n_atom))
-      foo.write("ITEM: BOX BOUNDS pp pp pp\n")
-      foo.write("%s %s\n" % (xlo, xhi))
-      foo.write("%s %s\n" % (ylo, yhi))
-      foo.write("%s %s\n" % (zlo, zhi))
-      foo.write("ITEM: ATOMS")
-      for kind in fmt:
-         foo.write(" %s" % (kind))
-      foo.write("\n")
-   elif file_type == "xyz":
-      foo.write("%d\n" % (n_atom))
-      for kind in fmt:
-         foo.write("%s " % (kind))
-      foo.write("\n")
-   else:
-      sys.exit()
-
-   fmt_no_coord = cp.copy(fmt)
-   if "x" in fmt_no_coord:
-      fmt_no_coord.remove("x")
-   if "y" in fmt_no_coord:
-      fmt_no_coord.remove("y")
-   if "z" in fmt_no_coord:
-      fmt_no_coord.remove("z")
-
-   # Read the atom section of the data file while exporting the dump file
-   for ii in range(n_atom):
-      line = lines[Atoms_start+ii].split()
-      atom = {}
-
-      # deal with the coordinates
-      atom["x"] = line[col["x"]]
-      atom["y"] = line[col["y"]]
-      atom["z"] = line[col["z"]]
-      try:
-         ix = int(line[col["x"] + 3])
-         iy = int(line[col["y"] + 3])
-         iz = int(line[col["z"] + 3])
-         atom["x"] = str(float(atom["x"]) + ix*lx)
-         atom["y"] = str(float(atom["y"]) + iy*ly)
-         atom["z"] = str(float(atom["z"]) + iz*lz)
-      except:
-         pass
-      # deal with the other attributes
-      for kind in fmt_no_coord:
-         atom[kind] = line[col[kind]]
-
-      # export attributes to the dump file
-      for kind in fmt:
-         foo.write(atom[kind]+" ")
-      foo.write("\n")
-   foo.close()
+   #
+   # The data files are converted in natural order; the frame of the i-th
+   # file gets timestep i. With -j N they are parsed by N processes and the
+   # frames are written in order as they become available.
+   #
+   convert = functools.partial(ConvertDataFile, atom_style=atom_style, fmt=fmt, file_type=file_type)
+   timesteps = range(len(files_data))
+   with open(file_dump, 'w') as foo:
+      if args.workers <= 1:
+         for frame in map(convert, files_data, timesteps):
+            foo.write(frame)
+      else:
+         with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for frame in pool.map(convert, files_data, timesteps):
+               foo.write(frame)
@@ -23,11 +23,16 @@
 ###############################################################################
 
 import sys
+import os
 import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from atom_style import get_atom_style, read_atoms, set_columns, format_atoms
 
 parser = argparse.ArgumentParser(description='Deform lammps data file')
 parser.add_argument('data_file', type=str, help='Path of the lammps data file')
-parser.add_argument('-atomtype', type=str, default='full', help='specify the atomtype')
+parser.add_argument('-atomtype', type=str, default='full', help='specify the atomtype (e.g., full, atomic, charge or "hybrid sphere dipole")')
 parser.add_argument('-xlo', type=float, default=0.0, help='xlo')
 parser.add_argument('-ylo', type=float, default=0.0, help='ylo')
 parser.add_argument('-zlo', type=float, default=0.0, help='zlo')
@@ -47,11 +52,9 @@ if __name__ == "__main__":
 
    atomtype = args.atomtype
 
-   if atomtype == 'full':
-      col_x = 4
-      col_y = 5
-      col_z = 6
-   else:
+   try:
+      style = get_atom_style(atomtype)
+   except ValueError:
       print('Atom type %s not supported..' % (atomtype))
       sys.exit()
 
@@ -105,17 +108,11 @@ if __name__ == "__main__":
    lines[line_box + 1] = "%.15f %.15f ylo yhi\n" % (box_lo[1], box_hi[1])
    lines[line_box + 2] = "%.15f %.15f zlo zhi\n" % (box_lo[2], box_hi[2])
          
-   # replace atom coordinates with the transposed ones
-   for ii in range(atoms):
-      line = lines[line_Atoms + ii]
-      data = line.split()
-      rr = [data[col_x], data[col_y], data[col_z]]
-      # transpose
-      data[col_x] = str(float(data[col_x])*xscale)
-      data[col_y] = str(float(data[col_y])*yscale)
-      data[col_z] = str(float(data[col_z])*zscale)
-      line_scaled = ' '.join(data) + '\n'
-      lines[line_Atoms + ii] = line_scaled
+   # replace atom coordinates with the scaled ones
+   table = read_atoms(lines[line_Atoms:line_Atoms + atoms])
+   rr = table[:, style.xyz].astype(np.float64)
+   table = set_columns(table, style.xyz, rr * [xscale, yscale, zscale])
+   lines[line_Atoms:line_Atoms + atoms] = format_atoms(table)
 
 for line in lines:
    print(line, end='')
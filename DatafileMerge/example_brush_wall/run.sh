@@ -1,2 +1,2 @@
 #!/bin/bash
-python ../datafile_merge.py pos_brush.dat pos_wall.dat pos_brush_wall.dat -side -z -poffset 6 > o.merge.log
+python ../datafile_merge.py pos_brush.dat pos_wall.dat pos_brush_wall.dat -side=-z -poffset 6 > o.merge.log
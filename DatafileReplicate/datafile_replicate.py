@@ -0,0 +1,236 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+import sys
+import os
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from data_file import (read_data, data_counts, write_header, write_section_name, write_rows, write_coeffs,
+                       Coeffs, Topology, TOPOLOGY_SECTIONS, INT_COLUMNS, WRITE_ROWS, FLOAT_FMT)
+
+parser = argparse.ArgumentParser(description='Replicate lammps data files')
+parser.add_argument('data_file', type=str, help='Path of the lammps data file')
+parser.add_argument('data_file_new', type=str, help='Path of the replicated data file')
+parser.add_argument('nx', type=int, help='Number of replicas along x')
+parser.add_argument('ny', type=int, help='Number of replicas along y')
+parser.add_argument('nz', type=int, help='Number of replicas along z')
+parser.add_argument('-atom_style', type=str, default=None, help='Atom style of the data file (default: the comment of the Atoms section or full)')
+parser.add_argument('-bond_periodic', type=int, default=0, help='Connect the topology entries by the minimum image convention instead of the image flags')
+parser.add_argument('-float_fmt', type=str, default=FLOAT_FMT, help='Format of the floating point numbers (e.g., %%.6f)')
+
+def CellVectors(data):
+   """Returns the edge vectors a, b and c of the box as rows."""
+   lx, ly, lz = data.lengths
+   xy, xz, yz = data.tilt if data.tilt is not None else (0.0, 0.0, 0.0)
+   return np.array([[lx, 0.0, 0.0], [xy, ly, 0.0], [xz, yz, lz]])
+
+def ReplicaCells(reps, n_rep):
+   """Returns the cell (ix, iy, iz) of each replica; ix runs fastest, as in the replicate command of lammps."""
+   nx, ny, _ = n_rep
+   return np.column_stack((reps % nx, reps // nx % ny, reps // (nx * ny)))
+
+def ReplicaIndex(cells, n_rep):
+   """Returns the replica of each cell (..., 3); the cells are wrapped into the replicated box."""
+   nx, ny, nz = n_rep
+   return cells[..., 0] % nx + nx * (cells[..., 1] % ny + ny * (cells[..., 2] % nz))
+
+def ReplicaBlocks(n_replica, n_row):
+   """Yields the replicas in blocks of about WRITE_ROWS rows."""
+   step = max(1, WRITE_ROWS // max(n_row, 1))
+   for start in range(0, n_replica, step):
+      yield np.arange(start, min(start + step, n_replica), dtype=np.int64)
+
+def MaxId(ids):
+   return int(ids.max()) if len(ids) else 0
+
+def MinimumImageShifts(data, topo):
+   """
+   Returns the cell shift of the closest image of each atom of the topology
+   entries to the first atom of the entry (minimum image convention), shape
+   (n, n_atom_entry, 3).
+   """
+   atoms = data.atoms
+   lut = np.full(MaxId(atoms.ids) + 1, -1, dtype=np.int64)
+   lut[atoms.ids] = np.arange(len(atoms))
+   if topo.atoms.size and (topo.atoms.max() >= len(lut) or np.any(lut[topo.atoms] < 0)):
+      raise ValueError("the topology refers to atoms missing from the Atoms section")
+   xyz = atoms.xyz[lut[topo.atoms]]
+   frac = (xyz - xyz[:, [0], :]) @ np.linalg.inv(CellVectors(data))
+   return -np.rint(frac).astype(np.int64)
+
+def WriteAtoms(foo, data, n_rep, use_image, float_fmt):
+   """
+   Writes the Atoms section of the replicated data file in blocks of
+   replicas. The ids and molecule ids of replica r are shifted by r times
+   their largest value. With use_image, each atom is placed in the replica
+   of its unwrapped position and gets the image flags of the replicated box,
+   so that the image flags stay consistent with the topology.
+   """
+   atoms = data.atoms
+   cell_vectors = CellVectors(data)
+   max_id = MaxId(atoms.ids)
+   max_mol = MaxId(atoms.columns['mol']) if 'mol' in atoms.columns else 0
+   xyz = atoms.xyz
+   fmts = ['%d' if kind in INT_COLUMNS else float_fmt for kind in atoms.style.columns]
+   if use_image:
+      fmts += ['%d'] * 3
+   n_replica = int(np.prod(n_rep))
+   for reps in ReplicaBlocks(n_replica, len(atoms)):
+      cells = ReplicaCells(reps, n_rep)
+      if use_image:
+         cells = cells[:, None, :] + atoms.image[None, :, :]
+         image = np.floor_divide(cells, n_rep)
+         pos = (xyz[None, :, :] + (cells - image * n_rep) @ cell_vectors).reshape(-1, 3)
+      else:
+         pos = (xyz[None, :, :] + (cells @ cell_vectors)[:, None, :]).reshape(-1, 3)
+      columns = []
+      for kind in atoms.style.columns:
+         col = atoms.columns[kind]
+         if kind == 'id':
+            columns.append((col[None, :] + reps[:, None] * max_id).ravel())
+         elif kind == 'mol':
+            columns.append((col[None, :] + reps[:, None] * max_mol).ravel())
+         elif kind in ('x', 'y', 'z'):
+            columns.append(pos[:, 'xyz'.index(kind)])
+         else:
+            columns.append(np.tile(col, len(reps)))
+      if use_image:
+         columns += [image[:, :, dim].ravel() for dim in range(3)]
+      comments = atoms.comments * len(reps) if atoms.comments is not None else None
+      write_rows(foo, columns, fmts, comments)
+
+def WriteTopology(foo, topo, n_rep, max_id, shifts):
+   """
+   Writes a topology section of the replicated data file in blocks of
+   replicas. The entry ids of replica r are shifted by r times their largest
+   value and the atom ids by r times the largest atom id; with shifts (see
+   MinimumImageShifts), the atoms of each entry are taken from the replicas
+   next to the one of its first atom.
+   """
+   max_topo_id = MaxId(topo.ids)
+   n_atom_entry = topo.atoms.shape[1]
+   for reps in ReplicaBlocks(int(np.prod(n_rep)), len(topo)):
+      columns = [(topo.ids[None, :] + reps[:, None] * max_topo_id).ravel(), np.tile(topo.types, len(reps))]
+      if shifts is None:
+         atom_reps = np.broadcast_to(reps[:, None, None], (len(reps), 1, n_atom_entry))
+      else:
+         cells = ReplicaCells(reps, n_rep)
+         atom_reps = ReplicaIndex(cells[:, None, None, :] + shifts[None, :, :, :], n_rep)
+      atom_ids = topo.atoms[None, :, :] + atom_reps * max_id
+      columns += [atom_ids[:, :, ii].ravel() for ii in range(n_atom_entry)]
+      comments = topo.comments * len(reps) if topo.comments is not None else None
+      write_rows(foo, columns, ['%d'] * len(columns), comments)
+
+def WriteVelocities(foo, section, n_rep, max_id, float_fmt):
+   """Writes the Velocities section of the replicated data file; the ids are shifted as those of the atoms."""
+   rows = np.array([line.partition('#')[0].split() for line in section.lines], dtype=np.float64)
+   ids = rows[:, 0].astype(np.int64)
+   fmts = ['%d'] + [float_fmt] * (rows.shape[1] - 1)
+   for reps in ReplicaBlocks(int(np.prod(n_rep)), len(ids)):
+      columns = [(ids[None, :] + reps[:, None] * max_id).ravel()]
+      columns += [np.tile(rows[:, ii], len(reps)) for ii in range(1, rows.shape[1])]
+      write_rows(foo, columns, fmts)
+
+def ReplicateDataFile(path, data, n_rep, bond_periodic=False, float_fmt=FLOAT_FMT):
+   """
+   Writes a data file replicated nx x ny x nz times, as the replicate command
+   of lammps does. The sections are streamed in blocks of replicas, so only
+   the original data file is held in memory.
+
+   The topology entries crossing the periodic boundaries are connected with
+   the image flags of the atoms: the entry of replica r joins the atoms of
+   replica r, each placed at its unwrapped position in the replicated box
+   and given new image flags. Without image flags (or with bond_periodic),
+   the atoms keep the position they have in the original box and each entry
+   joins the atoms of the replicas closest to its first atom (minimum image
+   convention); the image flags are then not written.
+
+   Args:
+      path (str): Path of the replicated data file.
+      data (DataFile): The contents of the data file.
+      n_rep (numpy.ndarray): Number of replicas along x, y and z.
+      bond_periodic (bool): Use the minimum image convention even if the atoms have image flags.
+      float_fmt (str): Format of the floating point numbers.
+   """
+   for name, section in data.sections.items():
+      if name not in ('Velocities', 'Atoms') and name not in TOPOLOGY_SECTIONS and not isinstance(section, Coeffs):
+         raise ValueError("replicating the %s section is not supported (supported: Atoms, Velocities, %s and the coefficient sections)"
+                          % (name, ', '.join(TOPOLOGY_SECTIONS)))
+   atoms = data.atoms
+   use_image = atoms.image is not None and not bond_periodic
+   max_id = MaxId(atoms.ids)
+   n_replica = int(np.prod(n_rep))
+
+   counts = data_counts(data)
+   for keyword in ('atoms',) + tuple(keyword for keyword, _, _ in TOPOLOGY_SECTIONS.values()):
+      if keyword in counts:
+         counts[keyword] *= n_replica
+   box = data.box
+   replicated = type(data)(data.title)
+   replicated.header = data.header
+   replicated.styles = data.styles
+   replicated.box = np.column_stack((box[:, 0], box[:, 0] + data.lengths * n_rep))
+   if data.tilt is not None:
+      replicated.tilt = data.tilt * n_rep[[1, 2, 2]]
+
+   with open(path, 'w') as foo:
+      write_header(foo, replicated, counts, float_fmt)
+      for name, section in data.sections.items():
+         write_section_name(foo, replicated, name)
+         if name == 'Atoms':
+            WriteAtoms(foo, data, n_rep, use_image, float_fmt)
+         elif isinstance(section, Topology):
+            shifts = None if use_image else MinimumImageShifts(data, section)
+            WriteTopology(foo, section, n_rep, max_id, shifts)
+         elif name == 'Velocities':
+            WriteVelocities(foo, section, n_rep, max_id, float_fmt)
+         else:
+            write_coeffs(foo, section)
+
+if __name__ == "__main__":
+   args = parser.parse_args()
+   n_rep = np.array([args.nx, args.ny, args.nz], dtype=np.int64)
+   if np.any(n_rep < 1):
+      parser.error("the numbers of replicas must be positive")
+
+   print("Reading the datafile:", args.data_file)
+   data = read_data(args.data_file, atom_style=args.atom_style)
+   if data.atoms is None:
+      sys.exit("ERROR: the data file has no Atoms section")
+   print("atoms:", len(data.atoms))
+   for name in TOPOLOGY_SECTIONS:
+      print("%s:" % name.lower(), len(data[name]) if name in data else 0)
+   if data.atoms.image is not None and not args.bond_periodic:
+      print("The topology is replicated with the image flags")
+   else:
+      print("The topology is replicated with the minimum image convention")
+
+   print("Replicas: %d x %d x %d" % tuple(n_rep))
+   print("Generate the replicated datafile:", args.data_file_new)
+   try:
+      ReplicateDataFile(args.data_file_new, data, n_rep, args.bond_periodic, args.float_fmt)
+   except ValueError as err:
+      sys.exit("ERROR: %s" % err)
@@ -0,0 +1,3 @@
+#!/bin/bash
+rm o.replicate.log
+rm datafile.rep
@@ -0,0 +1,2 @@
+#!/bin/bash
+python ../datafile_replicate.py datafile.orig datafile.rep 2 2 2 > o.replicate.log
@@ -23,390 +23,99 @@
 ###############################################################################
 
 import sys
+import os
 import argparse
+import numpy as np
 
-parser = argparse.ArgumentParser(description='Decimate lammps dump files')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from data_file import read_data, write_data, remap_types, coeff_key, group_keys, Coeffs, COEFF_SECTIONS
+
+parser = argparse.ArgumentParser(description='Remove duplicate coefficients from lammps data files')
 parser.add_argument('data_file_orig', type=str, help='Path of the original datafile')
 parser.add_argument('data_file_final', type=str, help='Path of the final datafile')
 parser.add_argument('-unique_pair_coeff', type=int, default=1, help='Generate the new lists containing the unique pair coefficients')
-
-args = parser.parse_args()
-data_file_orig  = args.data_file_orig
-data_file_final = args.data_file_final
-unique_pair_coeff    = args.unique_pair_coeff
-
-#
-# A class containing the id of the type and coeffs.
-#
-class c_coeff:
-   def __init__(self, Id, coeffs):
-      self.Id = Id
-      self.coeffs = coeffs
-      self.mass = ""
-#
-# This function removes the duplicate coefficients and returns
-# a list with the unique coefficients plus a dictionary which
-# returns the new unique id having as an input the old type id.
-#
-def rmv_duplicate_coeffs(type_coeffs_all):
-   newId = 1
-   type_coeffs_short = []
-   type_coeffs_swap_id = {}
-   for old in type_coeffs_all:
-      firstTime = True
-      for new in type_coeffs_short:
-         if str(old.coeffs) == str(new.coeffs):
-            firstTime = False
-            break
-      if firstTime:
-         type_coeffs_short.append( c_coeff(newId, old.coeffs) )
-         type_coeffs_swap_id[old.Id] = newId
-         newId += 1
-      else:
-         type_coeffs_swap_id[old.Id] = new.Id
-
-   return [type_coeffs_short, type_coeffs_swap_id]
-
-g = open(data_file_orig, 'r')
-
-atoms = 0
-bonds = 0
-angles = 0
-dihedrals = 0
-impropers = 0
-
-atom_types = 0
-bond_types = 0
-angle_types = 0
-dihedral_types = 0
-improper_types = 0
-
-lines = []
-line_num = 0
-while True:
-   line = g.readline()
-   # Check if this is the end of file; if yes break the loop.
-   if line == '':
-      break
-
-   line_split = line.split()
-
-   if "atoms" in line:
-      atoms = int(line_split[0])
-   if "bonds" in line:
-      bonds = int(line_split[0])
-   if "angles" in line:
-      angles = int(line_split[0])
-   if "dihedrals" in line:
-      dihedrals = int(line_split[0])
-   if "impropers" in line:
-      impropers = int(line_split[0])
-
-   if "atom types" in line:
-      atom_types = int(line_split[0])
-   if "bond types" in line:
-      bond_types = int(line_split[0])
-   if "angle types" in line:
-      angle_types = int(line_split[0])
-   if "dihedral types" in line:
-      dihedral_types = int(line_split[0])
-   if "improper types" in line:
-      improper_types = int(line_split[0])
-
-   if "xlo xhi" in line:
-      xlo = line_split[0]
-      xhi = line_split[1]
-   if "ylo yhi" in line:
-      ylo = line_split[0]
-      yhi = line_split[1]
-   if "zlo zhi" in line:
-      zlo = line_split[0]
-      zhi = line_split[1]
-
-   if "Pair Coeffs" in line:
-      Pair_coeffs_start = line_num + 2
-   if "Bond Coeffs" in line:
-      Bond_coeffs_start = line_num + 2
-   if "Angle Coeffs" in line:
-      Angle_coeffs_start = line_num + 2
-   if "Dihedral Coeffs" in line:
-      Dihedral_coeffs_start = line_num + 2
-   if "Improper Coeffs" in line:
-      Improper_coeffs_start = line_num + 2
-
-   if "Masses" in line:
-      Masses_start = line_num + 2
-   if "Atoms" in line:
-      Atoms_start = line_num + 2
-   if "Bonds" in line:
-      Bonds_start = line_num + 2
-   if "Angles" in line:
-      Angles_start = line_num + 2
-   if "Dihedrals" in line:
-      Dihedrals_start = line_num + 2
-   if "Impropers" in line:
-      Impropers_start = line_num + 2
-
-   lines.append(line)
-   line_num += 1
-
-g.close()
-
-#
-# Read the bond coeffs
-#
-bond_coeffs_all = [ 0 for ii in range(bond_types)]
-for ii in range(bond_types):
-   line = lines[Bond_coeffs_start+ii].split()
-   Id = int(line[0])
-   coeffs = []
-   for jj in range(1,len(line)):
-      icoeff = line[jj]
-      if icoeff == '#':
-         break
-      else:
-         coeffs.append(icoeff)
-   bond_coeffs_all[ii] = c_coeff(Id, coeffs)
-#
-# Read the angle coeffs
-#
-angle_coeffs_all = [ 0 for ii in range(angle_types)]
-for ii in range(angle_types):
-   line = lines[Angle_coeffs_start+ii].split()
-   Id = int(line[0])
-   coeffs = []
-   for jj in range(1,len(line)):
-      icoeff = line[jj]
-      if icoeff == '#':
-         break
-      else:
-         coeffs.append(icoeff)
-   angle_coeffs_all[ii] = c_coeff(Id, coeffs)
-#
-# Read the dihedral coeffs
-#
-dihedral_coeffs_all = [ 0 for ii in range(dihedral_types)]
-for ii in range(dihedral_types):
-   line = lines[Dihedral_coeffs_start+ii].split()
-   Id = int(line[0])
-   coeffs = []
-   for jj in range(1,len(line)):
-      icoeff = line[jj]
-      if icoeff == '#':
-         break
-      else:
-         coeffs.append(icoeff)
-   dihedral_coeffs_all[ii] = c_coeff(Id, coeffs)
-#
-# Read the improper coeffs
-#
-improper_coeffs_all = [ 0 for ii in range(improper_types)]
-for ii in range(improper_types):
-   line = lines[Improper_coeffs_start+ii].split()
-   Id = int(line[0])
-   coeffs = []
-   for jj in range(1,len(line)):
-      icoeff = line[jj]
-      if icoeff == '#':
-         break
-      else:
-         coeffs.append(icoeff)
-   improper_coeffs_all[ii] = c_coeff(Id, coeffs)
-#
-# Read the pair coeffs and masses
-#
-pair_coeffs_all = [ 0 for ii in range(atom_types)]
-for ii in range(atom_types):
-   line = lines[Pair_coeffs_start+ii].split()
-   Id = int(line[0])
-   coeffs = []
-   for jj in range(1,len(line)):
-      icoeff = line[jj]
-      if icoeff == '#':
-         break
-      else:
-         coeffs.append(icoeff)
-   pair_coeffs_all[Id-1] = c_coeff(Id, coeffs)
-for ii in range(atom_types):
-   line = lines[Masses_start+ii].split()
-   Id = int(line[0])
-   mass = line[1]
-   pair_coeffs_all[Id-1].mass = mass
-#
-# Generate the new lists containing the unique pair coefficients
-#
-if unique_pair_coeff:
-   type_coeffs_all = pair_coeffs_all
-   newId = 1
-   type_coeffs_short = []
-   type_coeffs_swap_id = {}
-   for old in type_coeffs_all:
-      firstTime = True
-      for new in type_coeffs_short:
-         if str(old.coeffs) == str(new.coeffs):
-            firstTime = False
-            if str(old.mass) != str(new.mass):
-               print("ERROR: Atoms with same coeffs have different masses!")
-               print("Please rerun with the unique_pair_coeff flag set to False..")
-               print("Exiting..")
-               sys.exit()
-            break
-      if firstTime:
-         icoeff = c_coeff(newId, old.coeffs)
-         icoeff.mass = old.mass
-         type_coeffs_short.append( icoeff )
-         type_coeffs_swap_id[old.Id] = newId
-         newId += 1
-      else:
-         type_coeffs_swap_id[old.Id] = new.Id
-
-   pair_coeffs_short = type_coeffs_short
-   pair_coeffs_swap_id = type_coeffs_swap_id
-else:
-  type_coeffs_swap_id = {}
-  for id in range(1,atom_types+1):
-     type_coeffs_swap_id[id] = id
-  [pair_coeffs_short, pair_coeffs_swap_id] = [pair_coeffs_all, type_coeffs_swap_id]
-
-[bond_coeffs_short, bond_coeffs_swap_id] = rmv_duplicate_coeffs(bond_coeffs_all)
-[angle_coeffs_short, angle_coeffs_swap_id] = rmv_duplicate_coeffs(angle_coeffs_all)
-[dihedral_coeffs_short, dihedral_coeffs_swap_id] = rmv_duplicate_coeffs(dihedral_coeffs_all)
-[improper_coeffs_short, improper_coeffs_swap_id] = rmv_duplicate_coeffs(improper_coeffs_all)
-
-atom_types = len(pair_coeffs_short)
-bond_types = len(bond_coeffs_short)
-angle_types = len(angle_coeffs_short)
-dihedral_types = len(dihedral_coeffs_short)
-improper_types = len(improper_coeffs_short)
-
-#for kk in pair_coeffs_short: print(kk.Id, kk.coeffs)
-#for kk in bond_coeffs_short: print(kk.Id, kk.coeffs)
-#for kk in angle_coeffs_short: print(kk.Id, kk.coeffs)
-#for kk in dihedral_coeffs_short: print(kk.Id, kk.coeffs)
-#for kk in improper_coeffs_short: print(kk.Id, kk.coeffs)
-
-#
-# Generate the new datafile
-#
-f = open(data_file_final, 'w')
-
-f.write(lines[0])
-f.write(lines[1])
-f.write('%d atoms\n' % atoms)
-f.write('%d bonds\n' % bonds)
-f.write('%d angles\n' % angles)
-f.write('%d dihedrals\n' % dihedrals)
-f.write('%d impropers\n' % impropers)
-f.write('\n')
-f.write('%d atom types\n' % atom_types)
-f.write('%d bond types\n' % bond_types)
-f.write('%d angle types\n' % angle_types)
-f.write('%d dihedral types\n' % dihedral_types)
-f.write('%d improper types\n' % improper_types)
-f.write('\n')
-f.write('%s %s xlo xhi\n' % (xlo, xhi))
-f.write('%s %s ylo yhi\n' % (ylo, yhi))
-f.write('%s %s zlo zhi\n' % (zlo, zhi))
-f.write('\n')
-f.write('Masses\n')
-f.write('\n')
-for ii in pair_coeffs_short:
-   f.write("%d %s\n" % (ii.Id, ii.mass))
-#
-#for ii in range(atom_types):
-#   line = lines[Masses_start + ii]
-f.write('\n')
-f.write('Atoms\n')
-f.write('\n')
-for ii in range(atoms):
-   line_split = lines[Atoms_start + ii].split()
-   id_mol = ' '.join(line_split[0:2])
-   old_type = int(line_split[2])
-   new_type = pair_coeffs_swap_id[old_type]
-
-   rest = ' '.join(line_split[3::])
-   f.write("%s %d %s\n" % ( id_mol, new_type, rest ))
-if bonds:
-   f.write('\n')
-   f.write('Bonds\n')
-   f.write('\n')
-   for ii in range(bonds):
-      line_split = lines[Bonds_start + ii].split()
-      id = line_split[0]
-      old_type = int(line_split[1])
-      new_type = bond_coeffs_swap_id[old_type]
-      coeffs = ' '.join(line_split[2::])
-      f.write("%s %d %s\n" % ( id, new_type, coeffs ))
-if angles:
-   f.write('\n')
-   f.write('Angles\n')
-   f.write('\n')
-   for ii in range(angles):
-      line_split = lines[Angles_start + ii].split()
-      id = line_split[0]
-      old_type = int(line_split[1])
-      new_type = angle_coeffs_swap_id[old_type]
-      coeffs = ' '.join(line_split[2::])
-      f.write("%s %d %s\n" % ( id, new_type, coeffs ))
-if dihedrals:
-   f.write('\n')
-   f.write('Dihedrals\n')
-   f.write('\n')
-   for ii in range(dihedrals):
-      line_split = lines[Dihedrals_start + ii].split()
-      id = line_split[0]
-      old_type = int(line_split[1])
-      new_type = dihedral_coeffs_swap_id[old_type]
-      coeffs = ' '.join(line_split[2::])
-      f.write("%s %d %s\n" % ( id, new_type, coeffs ))
-if impropers:
-   f.write('\n')
-   f.write('Impropers\n')
-   f.write('\n')
-   for ii in range(impropers):
-      line_split = lines[Impropers_start + ii].split()
-      id = line_split[0]
-      old_type = int(line_split[1])
-      new_type = improper_coeffs_swap_id[old_type]
-      coeffs = ' '.join(line_split[2::])
-      f.write("%s %d %s\n" % ( id, new_type, coeffs ))
-f.write('\n')
-f.write('Pair Coeffs\n')
-f.write('\n')
-for ii in pair_coeffs_short:
-   id = ii.Id
-   coeffs = ' '.join(ii.coeffs)
-   f.write("%d %s\n" % (id, coeffs))
-if bonds:
-   f.write('\n')
-   f.write('Bond Coeffs\n')
-   f.write('\n')
-   for ii in bond_coeffs_short:
-      id = ii.Id
-      coeffs = ' '.join(ii.coeffs)
-      f.write("%d %s\n" % (id, coeffs))
-if angles:
-   f.write('\n')
-   f.write('Angle Coeffs\n')
-   f.write('\n')
-   for ii in angle_coeffs_short:
-      id = ii.Id
-      coeffs = ' '.join(ii.coeffs)
-      f.write("%d %s\n" % (id, coeffs))
-if dihedrals:
-   f.write('\n')
-   f.write('Dihedral Coeffs\n')
-   f.write('\n')
-   for ii in dihedral_coeffs_short:
-      id = ii.Id
-      coeffs = ' '.join(ii.coeffs)
-      f.write("%d %s\n" % (id, coeffs))
-if impropers:
-   f.write('\n')
-   f.write('Improper Coeffs\n')
-   f.write('\n')
-   for ii in improper_coeffs_short:
-      id = ii.Id
-      coeffs = ' '.join(ii.coeffs)
-      f.write("%d %s\n" % (id, coeffs))
-f.close()
+parser.add_argument('-tol', type=float, default=0.0, help='Tolerance of the comparison of the coefficients; the numbers are rounded to multiples of tol (default: 0, exact comparison)')
+parser.add_argument('-atom_style', type=str, default=None, help='Atom style of the data file (default: the comment of the Atoms section or full)')
+
+#
+# This function removes the duplicate coefficients and returns the positions
+# of the unique entries plus a lookup table which returns the new unique id
+# having as an input the old type id. The types with the same key get the id
+# of the first one; the keys are hashed, so each type is compared once.
+#
+def rmv_duplicate_coeffs(type_ids, keys):
+   unique, groups = group_keys(keys)
+   lut = np.zeros(max(type_ids) + 1, dtype=np.int64)
+   lut[type_ids] = groups + 1
+   return unique, lut
+
+def SortedById(coeffs, type_ids):
+   """Returns the positions of type_ids in a coefficient section."""
+   pos = {type_id: ii for ii, type_id in enumerate(coeffs.ids.tolist())}
+   return [pos[type_id] for type_id in type_ids]
+
+def RmvDuplicateTypes(data, keyword, names, type_ids, tol=0.0):
+   """
+   Removes the types of one kind with the same coefficients in the sections
+   names (see coeff_key for the tolerance tol) and renumbers them in all
+   sections with a lookup table. The types are kept in the order of
+   type_ids; the coefficient comments are dropped.
+
+   Returns:
+      numpy.ndarray: The positions (in type_ids) of the unique types.
+   """
+   sections = [data[name] for name in names]
+   columns = [[sec.values[ii] for ii in SortedById(sec, type_ids)] for sec in sections]
+   keys = [tuple(coeff_key(value, tol) for value in row) for row in zip(*columns)]
+   unique, lut = rmv_duplicate_coeffs(type_ids, keys)
+   remap_types(data, keyword, lut)
+   for name, values in zip(names, columns):
+      data.sections[name] = Coeffs(np.arange(1, len(unique) + 1), [values[ii] for ii in unique])
+   data.counts[keyword] = len(unique)
+   return unique
+
+if __name__ == "__main__":
+   args = parser.parse_args()
+   try:
+      data = read_data(args.data_file_orig, atom_style=args.atom_style)
+   except ValueError as err:
+      sys.exit("ERROR: %s" % err)
+
+   #
+   # The pair coefficients are compared in the order of the atom types; the
+   # atom types with the same pair coefficients must have the same masses.
+   #
+   if args.unique_pair_coeff and 'Pair Coeffs' in data:
+      type_ids = sorted(data['Pair Coeffs'].ids.tolist())
+      masses = data['Masses']
+      mass_values = [masses.values[ii] for ii in SortedById(masses, type_ids)]
+      pair_coeffs = data['Pair Coeffs']
+      pair_values = [pair_coeffs.values[ii] for ii in SortedById(pair_coeffs, type_ids)]
+      unique, lut = rmv_duplicate_coeffs(type_ids, [coeff_key(value, args.tol) for value in pair_values])
+      mass_groups = group_keys([coeff_key(value, args.tol) for value in mass_values])[1]
+      if np.any(mass_groups != mass_groups[unique[lut[type_ids] - 1]]):
+         print("ERROR: Atoms with same coeffs have different masses!")
+         print("Please rerun with the unique_pair_coeff flag set to False..")
+         print("Exiting..")
+         sys.exit()
+      RmvDuplicateTypes(data, 'atom types', ['Masses', 'Pair Coeffs'], type_ids, args.tol)
+   else:
+      for name in ('Masses', 'Pair Coeffs'):
+         if name in data:
+            order = np.argsort(data[name].ids, kind='stable')
+            data.sections[name] = Coeffs(data[name].ids[order], [data[name].values[ii] for ii in order])
+
+   #
+   # The other coefficients are compared in file order; the class2 cross
+   # terms of a type (e.g., BondBond Coeffs of the angle types) are part of
+   # the comparison.
+   #
+   for main, keyword in (('Bond Coeffs', 'bond types'), ('Angle Coeffs', 'angle types'),
+                         ('Dihedral Coeffs', 'dihedral types'), ('Improper Coeffs', 'improper types')):
+      if main not in data:
+         continue
+      names = [main] + [name for name in data.sections if name != main and COEFF_SECTIONS.get(name) == keyword]
+      RmvDuplicateTypes(data, keyword, names, data[main].ids.tolist(), args.tol)
+
+   # the lines are written with single spaces between the tokens
+   write_data(args.data_file_final, data, verbatim=False)
@@ -23,14 +23,18 @@
 ###############################################################################
 
 import sys
+import os
 import argparse
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from atom_style import get_atom_style, read_atoms, format_atoms
+
 parser = argparse.ArgumentParser(description='Swap coefficients in lammps data files')
 parser.add_argument('data_file', type=str, help='Path of the lammps data file')
 parser.add_argument('d0', type=str, help='Path of the output data file')
 parser.add_argument('d1', type=str, help='Path of the output data file')
 parser.add_argument('d2', type=str, help='Path of the output data file')
-parser.add_argument('-atomtype', type=str, default='full', help='Set the atomtype in the Lammps data file (e.g., full, atomic, etc.)')
+parser.add_argument('-atomtype', type=str, default='full', help='Set the atomtype in the Lammps data file (e.g., full, atomic, charge or "hybrid sphere dipole")')
 
 dim2int = {'x':0, 'y':1, 'z':2}
 
@@ -42,11 +46,9 @@ if __name__ == "__main__":
    d2 = dim2int[args.d2]
    atomtype = args.atomtype
 
-   if atomtype == 'full':
-      col_x = 4
-      col_y = 5
-      col_z = 6
-   else:
+   try:
+      style = get_atom_style(atomtype)
+   except ValueError:
       print('Atom type %s not supported..' % (atomtype))
       sys.exit()
 
@@ -81,16 +83,10 @@ if __name__ == "__main__":
    lines[line_box + 2] = "%s %s zlo zhi\n" % (box_lo[d2], box_hi[d2])
          
    # replace atom coordinates with the transposed ones
-   for ii in range(atoms):
-      line = lines[line_Atoms + ii]
-      data = line.split()
-      rr = [data[col_x], data[col_y], data[col_z]]
-      # transpose
-      data[col_x] = rr[d0]
-      data[col_y] = rr[d1]
-      data[col_z] = rr[d2]
-      line_transpose = ' '.join(data) + '\n'
-      lines[line_Atoms + ii] = line_transpose
+   table = read_atoms(lines[line_Atoms:line_Atoms + atoms])
+   xyz = style.xyz
+   table[:, xyz] = table[:, [xyz[d0], xyz[d1], xyz[d2]]]
+   lines[line_Atoms:line_Atoms + atoms] = format_atoms(table)
 
 for line in lines:
    print(line, end='')
@@ -0,0 +1,57 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from dump_cache import write_cache, read_cache, cache_path
+
+parser = argparse.ArgumentParser(description='Convert lammps dump files to a columnar binary cache')
+parser.add_argument('dump_file', type=str, help='Path of the lammps dump file')
+parser.add_argument('-o', '--output', type=str, default=None, help='Path of the cache directory (default: dump_file.bin)')
+parser.add_argument('-force', type=int, default=0, help='Rewrite the cache even if it is up to date')
+
+if __name__ == "__main__":
+   args = parser.parse_args()
+   dump_file = args.dump_file
+   path_cache = args.output if args.output is not None else cache_path(dump_file)
+
+   print("dump file  : ", dump_file)
+   print("cache      : ", path_cache)
+
+   cache = read_cache(dump_file, path_cache)
+   if cache is None or args.force:
+      write_cache(dump_file, path_cache)
+      cache = read_cache(dump_file, path_cache)
+   else:
+      print("The cache is up to date")
+
+   print("frames     : ", len(cache))
+   print("columns    : ", " ".join(cache.columns))
+   if len(cache):
+      print("timesteps  : ", cache.timestep[0], "-", cache.timestep[-1])
+      print("atoms      : ", cache.n_atom.min(), "-", cache.n_atom.max())
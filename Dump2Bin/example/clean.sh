@@ -0,0 +1,2 @@
+#!/bin/bash
+rm -r o.log dump.lammpstrj.bin
@@ -0,0 +1,2 @@
+#!/bin/bash
+python ../dump2bin.py dump.lammpstrj > o.log
@@ -24,65 +24,79 @@
 
 import sys
 import os
+import io
 import argparse
-from itertools import islice
+import functools
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from dump_io import read_frames, line_offsets, open_dump
+from frame_pool import write_frames
 
 parser = argparse.ArgumentParser()
 parser.add_argument('dump_file', type=str, help='Path of the lammps dump file')
 parser.add_argument('n_atom', type=int, help='const number of atoms')
 parser.add_argument('dummy_attrib', type=str, help='attributes of dummy atoms')
+parser.add_argument('-renumber', type=int, default=0, help='Renumber the ids of the atoms of each frame contiguously (1..n)')
+parser.add_argument('-mmap', type=int, default=0, help='Memory-map the dump file and write the frames without copying')
+parser.add_argument('-j', '--workers', type=int, default=1, help='Number of worker processes')
+parser.add_argument('-o', '--output', type=str, default='-', help='Path of the output dump file (.gz, .xz and .zst are compressed; default: stdout)')
+
+@functools.lru_cache(maxsize=None)
+def PaddingBlock(n_atom_const, dummy_str):
+   """
+   Builds the lines of the dummy atoms with ids 1..n_atom_const once; the
+   padding of a frame with n atoms is the slice from line n onwards.
+
+   Returns:
+      tuple: The lines (bytes) and the byte offset of each line.
+   """
+   ids = np.arange(1, n_atom_const+1).astype(np.bytes_)
+   lines = np.char.add(ids, (" %s\n" % dummy_str).encode())
+   offsets = np.zeros(n_atom_const+1, dtype=np.int64)
+   np.cumsum(np.char.str_len(lines), out=offsets[1:])
+   return b''.join(lines.tolist()), offsets
+
+def RenumberBlock(block, n_atom, id_col):
+   """Returns the atom lines with the ids replaced by 1..n_atom."""
+   if n_atom == 0:
+      return b''
+   table = np.loadtxt(io.BytesIO(block), dtype=np.bytes_, ndmin=2, comments=None)
+   table[:, id_col] = np.arange(1, n_atom+1).astype(np.bytes_)
+   lines = table[:, 0]
+   for col in range(1, table.shape[1]):
+      lines = np.char.add(np.char.add(lines, b' '), table[:, col])
+   return b'\n'.join(lines.tolist()) + b'\n'
+
+def PadFrame(frame, out, n_atom_const, dummy_str, renumber=False):
+   """Writes the frame with n_atom_const atoms."""
+   n_atom_frame = min(frame.n_atom, n_atom_const)
+
+   # The atoms of the frame (truncated to n_atom_const)
+   block = frame.block
+   if frame.n_atom > n_atom_const:
+      block = memoryview(block)[:line_offsets(block)[n_atom_const]]
+   if renumber:
+      block = RenumberBlock(block, n_atom_frame, frame.columns.index('id'))
+
+   # Extra atoms so the total is n_atom_const
+   padding, offsets = PaddingBlock(n_atom_const, dummy_str)
+
+   out.write(b''.join((frame.header_bytes(n_atom_const), block, memoryview(padding)[offsets[n_atom_frame]:])))
 
 if __name__ == "__main__":
    args = parser.parse_args()
    dump_file    = args.dump_file
    n_atom_const = args.n_atom
    dummy_str    = args.dummy_attrib
+   workers      = args.workers
+   renumber     = bool(args.renumber)
 
    print(dump_file)
    print(n_atom_const)
    print(dummy_str)
-
-
-   with open(dump_file, 'r') as infile:
-      while True:
-
-         # Read the first header line
-         line = infile.readline()
-         if (line == ""):
-           break;
-
-         # Write the first header line
-         print(line, end='') # ITEM: TIMESTEP
-
-         # Read the remaining 8 lines from header
-         lines_header   = []
-         for line in islice(infile, 8):
-            lines_header.append(line)
-         n_atom_frame = int(lines_header[2])
-
-         # Write the remaining header lines
-         print(lines_header[0],end='')
-         print(lines_header[1],end='') # ITEM: NUMBER OF ATOMS
-         print(n_atom_const)
-         print(lines_header[3],end='') # ITEM: BOX BOUNDS
-         print(lines_header[4],end='')
-         print(lines_header[5],end='')
-         print(lines_header[6],end='')
-         print(lines_header[7],end='') # ITEM: ATOMS
-
-         lines_atom   = []
-         for line in islice(infile, n_atom_frame):
-            lines_atom.append(line)
-
-         id = 1
-         for ii in range(min(n_atom_frame, n_atom_const)):
-            print(lines_atom[ii], end='')
-            #tmp = lines.split()
-            #tmp[0] = id
-            #for attrib in tmp:
-            #   print(attrib, end='')
-            id += 1
-
-         # Add extra atoms so the total is n_atom_const
-         for id in range(n_atom_frame+1, n_atom_const+1):
-            print(id, dummy_str)
+   frames = read_frames(dump_file, use_mmap=bool(args.mmap) and workers <= 1)
+   transform = functools.partial(PadFrame, n_atom_const=n_atom_const, dummy_str=dummy_str,
+                                 renumber=renumber)
+   with open_dump(args.output, 'wb') as out:
+      write_frames(frames, transform, out, workers)
@@ -2,3 +2,4 @@
 python ../dump_const_atom.py dump.lammpstrj 1 "-1 0.0 0.0 0.0" > dump_max_1_orig000.lammpstrj
 python ../dump_const_atom.py dump.lammpstrj 6 "-1 0.0 0.0 0.0" > dump_max_6_orig000.lammpstrj
 python ../dump_const_atom.py dump.lammpstrj 6 "-1 5.0 5.0 5.0" > dump_max_6_orig555.lammpstrj
+python ../dump_const_atom.py dump_gcmc.lammpstrj 6 "-1 0.0 0.0 0.0" -renumber 1 > dump_max_6_gcmc_renumber.lammpstrj
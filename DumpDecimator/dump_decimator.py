@@ -25,27 +25,109 @@
 import sys
 import os
 import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from dump_io import ChunkReader, MmapReader, N_HEADER_LINES, copy_bytes, open_dump, compression_of, check_follow
+from follow import FollowReader
+from frame_index import load_index
 
 parser = argparse.ArgumentParser(description='Decimate lammps dump files')
 parser.add_argument('dump_file', type=str, help='Path of the lammps dump file')
-parser.add_argument('factor', type=int, help='Decimation degree')
+parser.add_argument('factor', type=int, nargs='?', default=1, help='Decimation degree')
+parser.add_argument('-start', type=int, default=None, help='First timestep to be kept')
+parser.add_argument('-stop', type=int, default=None, help='Last timestep to be kept')
+parser.add_argument('-step', type=int, default=None, help='Keep timesteps start, start+step, ..')
+parser.add_argument('-timesteps', type=str, default=None, help='Comma separated list of timesteps to be kept')
+parser.add_argument('-index', type=int, default=0, help='Use (and create) the .idx frame index of the dump file')
+parser.add_argument('-mmap', type=int, default=0, help='Memory-map the dump file and write the frames without copying')
+parser.add_argument('-follow', type=int, default=0, help='Keep decimating the frames appended by a running simulation')
+parser.add_argument('-interval', type=float, default=5.0, help='Time between checks for appended frames with -follow (s)')
+parser.add_argument('-timeout', type=float, default=0, help='Stop following when no frame was appended for this long (s; 0: never)')
+parser.add_argument('-o', '--output', type=str, default='-', help='Path of the output dump file (.gz, .xz and .zst are compressed; default: stdout)')
+
+def SelectTimesteps(timesteps, start, stop, step, keep_list):
+  """Returns a mask of the timesteps passing the timestep selectors."""
+  timesteps = np.asarray(timesteps)
+  mask = np.ones(len(timesteps), dtype=bool)
+  if start is not None:
+    mask &= timesteps >= start
+  if stop is not None:
+    mask &= timesteps <= stop
+  if step is not None:
+    mask &= (timesteps - (start if start is not None else 0)) % step == 0
+  if keep_list is not None:
+    mask &= np.isin(timesteps, keep_list)
+  return mask
 
-def IncreaseCycleIter(i,n):
-  if i == n:
-    return 1
-  else:
-    return i+1
+def DecimateIndexed(dump_file, factor, selectors, out):
+  """Copies the selected frames as byte ranges located through the frame index."""
+  index = load_index(dump_file)
+  selected = np.flatnonzero(SelectTimesteps(index.timesteps, *selectors))[::factor]
+  if len(selected) == 0:
+    return
+  # merge consecutive frames into contiguous byte ranges
+  offset = index.records['offset'][selected]
+  nbytes = index.records['nbytes'][selected]
+  split = np.flatnonzero(offset[1:] != offset[:-1] + nbytes[:-1]) + 1
+  with open_dump(dump_file) as fin:
+    for first, last in zip(np.r_[0, split], np.r_[split, len(selected)]):
+      copy_bytes(fin, out, int(offset[first]), int(offset[last-1] + nbytes[last-1] - offset[first]))
+
+def DecimateStream(dump_file, factor, selectors, out, use_mmap=False, follow=None):
+  """
+  Reads only the frame headers and skips the atom lines of the dropped frames.
+  With follow=(interval, timeout) it waits for the frames appended to the file.
+  """
+  n_selected = 0
+  with open_dump(dump_file) as fin:
+    if use_mmap and follow is None and compression_of(dump_file) is None:
+      reader = MmapReader(fin)
+    else:
+      reader = ChunkReader(fin)
+    if follow is not None:
+      reader = FollowReader(reader, *follow, on_wait=out.flush)
+    while True:
+      header = reader.read_lines(N_HEADER_LINES)
+      if header is None:
+        break
+      lines = bytes(header).split(b'\n', 4)
+      n_atom = int(lines[3])
+      keep = SelectTimesteps([int(lines[1])], *selectors)[0]
+      if keep:
+        keep = n_selected % factor == 0
+        n_selected += 1
+      if keep:
+        block = reader.read_lines(n_atom)
+        if block is None:
+          break
+        out.write(header)
+        out.write(block)
+      elif not reader.skip_lines(n_atom):
+        break
 
 if __name__ == "__main__":
   args = parser.parse_args()
   dump_file = args.dump_file
   factor = args.factor
-  foo = open(dump_file, 'r')
-  do_write = factor
-  for line in foo:
-    line = line.rstrip('\n')
-    if 'TIMESTEP' in line:
-      do_write = IncreaseCycleIter(do_write,factor)
-    if do_write == 1:
-      print(line)
-  foo.close()
+  keep_list = None
+  if args.timesteps is not None:
+    keep_list = [int(item) for item in args.timesteps.split(',')]
+  selectors = (args.start, args.stop, args.step, keep_list)
+  follow = None
+  if args.follow:
+    try:
+      check_follow(dump_file)
+    except ValueError as err:
+      print("Error:", err, file=sys.stderr)
+      sys.exit(1)
+    follow = (args.interval, args.timeout)
+
+  with open_dump(args.output, 'wb') as out:
+    if args.index and follow is None:
+      DecimateIndexed(dump_file, factor, selectors, out)
+    else:
+      try:
+        DecimateStream(dump_file, factor, selectors, out, bool(args.mmap), follow)
+      except KeyboardInterrupt:
+        pass
@@ -0,0 +1,73 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from dump_io import open_dump
+from frame_index import load_index, build_index
+
+parser = argparse.ArgumentParser(description='Index the frames of lammps dump files')
+parser.add_argument('dump_file', type=str, help='Path of the lammps dump file')
+parser.add_argument('-timestep', type=int, default=None, help='Export the frame with this timestep')
+parser.add_argument('-frame', type=int, default=None, help='Export the frame with this position (0-based)')
+parser.add_argument('-list', type=int, default=0, help='List the indexed frames')
+parser.add_argument('-rebuild', type=int, default=0, help='Rebuild the index from scratch')
+parser.add_argument('-o', '--output', type=str, default='-', help='Path of the exported frame (.gz, .xz and .zst are compressed; default: stdout)')
+
+if __name__ == "__main__":
+   args = parser.parse_args()
+   dump_file = args.dump_file
+
+   if args.rebuild:
+      index = build_index(dump_file)
+      index.save()
+   else:
+      index = load_index(dump_file)
+
+   # Export a single frame
+   iframe = args.frame
+   if args.timestep is not None:
+      iframe = index.find(args.timestep)
+      if iframe < 0:
+         print("Error: timestep %d not found in %s" % (args.timestep, dump_file), file=sys.stderr)
+         sys.exit(1)
+   if iframe is not None:
+      with open_dump(dump_file) as foo, open_dump(args.output, 'wb') as out:
+         out.write(index.read_raw(foo, iframe))
+      sys.exit(0)
+
+   if args.list:
+      print("%-10s %-16s %-16s %-10s" % ("frame", "offset", "timestep", "atoms"))
+      for ii, rec in enumerate(index.records):
+         print("%-10d %-16d %-16d %-10d" % (ii, rec['offset'], rec['timestep'], rec['n_atom']))
+      sys.exit(0)
+
+   print("frames    : ", len(index))
+   if len(index):
+      print("timesteps : ", index.timesteps[0], "-", index.timesteps[-1])
+      print("atoms     : ", index.n_atoms.min(), "-", index.n_atoms.max())
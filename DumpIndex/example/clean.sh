@@ -0,0 +1,2 @@
+#!/bin/bash
+rm o.* dump.lammpstrj.idx
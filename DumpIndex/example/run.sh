@@ -0,0 +1,4 @@
+#!/bin/bash
+python ../dump_index.py dump.lammpstrj > o.log
+python ../dump_index.py dump.lammpstrj -list 1 > o.list
+python ../dump_index.py dump.lammpstrj -timestep 20 > o.dump_t20.lammpstrj
@@ -1,3 +1,4 @@
 #!/bin/bash
 python ../sort_col.py dump.lammpstrj 1 > dump_col1.lammpstrj
 python ../sort_col.py dump.lammpstrj 2 > dump_col2.lammpstrj
+python ../sort_col.py dump.lammpstrj type,id -descending 1,0 > dump_col_type_id_desc.lammpstrj
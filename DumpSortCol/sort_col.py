@@ -25,43 +25,53 @@
 import sys
 import os
 import argparse
+import functools
+import numpy as np
 
-parser = argparse.ArgumentParser(description='Decimate lammps dump files')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from dump_io import read_frames, open_dump, write_permuted_lines
+from frame_pool import write_frames
+
+parser = argparse.ArgumentParser(description='Sort the atoms of lammps dump files')
 parser.add_argument('dump_file', type=str, help='Path of the lammps dump file')
-parser.add_argument('column', type=int, help='Column to be sorted')
+parser.add_argument('column', type=str, help='Column(s) to be sorted; comma separated numbers (1-based) or names, e.g. 2,1 or type,id')
+parser.add_argument('-descending', type=str, default='0', help='Sort in descending order; a single flag or one per column, e.g. 1 or 0,1')
+parser.add_argument('-j', '--workers', type=int, default=1, help='Number of worker processes')
+parser.add_argument('-o', '--output', type=str, default='-', help='Path of the output dump file (.gz, .xz and .zst are compressed; default: stdout)')
+
+def DescendingKey(key):
+   """Returns a key sorting in the reverse order; strings (e.g., element) are replaced by their rank first."""
+   if not np.issubdtype(key.dtype, np.number):
+      key = np.unique(key, return_inverse=True)[1].ravel()
+   return -key
+
+def SortOrder(keys, descending):
+   """Returns the stable permutation sorting the rows by the key columns (first key is primary)."""
+   keys = [DescendingKey(keys[name]) if desc else keys[name] for name, desc in zip(keys.dtype.names, descending)]
+   if len(keys) == 1:
+      return np.argsort(keys[0], kind='stable')
+   return np.lexsort(keys[::-1])
+
+def SortFrame(frame, out, columns, descending):
+   """Writes the frame with the atoms sorted by the key columns."""
+   order = SortOrder(frame.select_columns(columns), descending)
+   out.write(frame.header_bytes())
+   write_permuted_lines(out, frame.block, order, frame.line_offsets)
 
 if __name__ == "__main__":
    args = parser.parse_args()
    dump_file = args.dump_file
-   column = args.column - 1
+   columns = [int(item) - 1 if item.isdigit() else item for item in args.column.split(',')]
+   descending = [bool(int(item)) for item in args.descending.split(',')]
+   if len(descending) == 1:
+      descending = descending * len(columns)
+   if len(descending) != len(columns):
+      print("Error: %d descending flags given for %d columns" % (len(descending), len(columns)))
+      sys.exit()
 
    #
-   # Start reading the frames and stripping the chosen types!
+   # Start reading the frames and sorting the chosen columns!
    #
-   data_file = open(dump_file,'rt')
-   while True:
-      current_line = data_file.readline() #ITEM: TIMESTEP
-      # Check if we reached end of file
-      if current_line == '': break
-      print( current_line, end = "")
-
-      print( data_file.readline(), end ="")
-      print( data_file.readline(), end ="") #ITEM: NUMBER OF ATOMS
-      n_atom = int(data_file.readline())
-      print( n_atom)
-      print( data_file.readline(), end ="") #ITEM: BOX BOUNDS pp pp pp
-      print( data_file.readline(), end ="")
-      print( data_file.readline(), end ="")
-      print( data_file.readline(), end ="")
-      print( data_file.readline(), end ="") #ATOM STYLE FORMAT
-
-      lines_sorted = {}
-      for ii in range(n_atom):
-         current_line = data_file.readline()
-         current_line_split = current_line.split()
-         col_val = int(current_line_split[column])
-
-         lines_sorted[col_val] = current_line
-
-      for ii in sorted(lines_sorted):
-         print( lines_sorted[ii], end ="")
+   transform = functools.partial(SortFrame, columns=columns, descending=descending)
+   with open_dump(args.output, 'wb') as out:
+      write_frames(read_frames(dump_file), transform, out, args.workers)
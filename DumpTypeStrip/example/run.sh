@@ -1,3 +1,5 @@
 #!/bin/bash
 python ../type_strip.py dump.lammpstrj 2 -l "2,3" > dump_t1.lammpstrj
 python ../type_strip.py dump.lammpstrj 2 -l "1"   > dump_t2_3.lammpstrj
+python ../type_strip.py dump_gcmc.lammpstrj type -l 2-3 > dump_t1_gcmc.lammpstrj
+python ../type_strip.py dump_gcmc.lammpstrj element -l O,H -invert 1 > dump_t2_3_gcmc.lammpstrj
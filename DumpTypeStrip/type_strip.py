@@ -25,68 +25,93 @@
 import sys
 import os
 import argparse
+import functools
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from dump_io import read_frames, write_lines, open_dump, check_follow
+from frame_pool import write_frames
 
 parser = argparse.ArgumentParser()
 parser.add_argument('dump_file', type=str, help='Path of the lammps dump file')
-parser.add_argument('type_col', type=int, help='column of the atom type')
-parser.add_argument('-l', '--list', help='delimited list input', type=str)
+parser.add_argument('type_col', type=str, help='column of the atom type (1-based number or name, e.g. 2, type or element)')
+parser.add_argument('-l', '--list', help='delimited list of types; numbers, ranges or names, e.g. 1,3-5 or C,H', type=str, required=True)
+parser.add_argument('-invert', type=int, default=0, help='Keep the listed types and strip all others')
+parser.add_argument('-mmap', type=int, default=0, help='Memory-map the dump file and write the kept lines without copying')
+parser.add_argument('-j', '--workers', type=int, default=1, help='Number of worker processes')
+parser.add_argument('-follow', type=int, default=0, help='Keep processing the frames appended by a running simulation')
+parser.add_argument('-interval', type=float, default=5.0, help='Time between checks for appended frames with -follow (s)')
+parser.add_argument('-timeout', type=float, default=0, help='Stop following when no frame was appended for this long (s; 0: never)')
+parser.add_argument('-o', '--output', type=str, default='-', help='Path of the output dump file (.gz, .xz and .zst are compressed; default: stdout)')
 
-if __name__ == "__main__":
-   args = parser.parse_args()
-   fileName = args.dump_file
-   typeColumn = args.type_col
-   strippedTypes = [int(item) for item in args.list.split(',')]
+def ParseTypes(typeList):
+   """Splits the type list to integer types, integer ranges (lo, hi) and type names."""
+   types = []
+   ranges = []
+   names = []
+   for item in typeList.split(','):
+      item = item.strip()
+      lo, sep, hi = item.partition('-')
+      if item.isdigit():
+         types.append(int(item))
+      elif sep and lo.isdigit() and hi.isdigit():
+         ranges.append((int(lo), int(hi)))
+      else:
+         names.append(item)
+   return types, ranges, names
 
-   newNumberOfAtoms = 0
+def KeptAtoms(frame, typeColumn, strippedTypes, invert):
+   """Returns the mask of the atoms whose type is not stripped."""
+   types, ranges, names = strippedTypes
+   if names:
+      # compare the types as strings (type labels or elements)
+      itype = frame.column(typeColumn, dtype=np.str_)
+      listed = np.isin(itype, names + [str(ii) for ii in types])
+      if ranges:
+         numeric = np.char.isdigit(itype)
+         ivalue = np.where(numeric, itype, '0').astype(np.int64)
+         for lo, hi in ranges:
+            listed |= numeric & (ivalue >= lo) & (ivalue <= hi)
+   else:
+      itype = frame.column(typeColumn)
+      listed = np.isin(itype, types)
+      for lo, hi in ranges:
+         listed |= (itype >= lo) & (itype <= hi)
+   return listed if invert else ~listed
 
-   #
-   #Read the first frame so an to compute the new number of atoms
-   #
-   data_file = open(fileName,'rt')
+def StripFrame(frame, out, typeColumn, strippedTypes, invert):
+   """Writes the frame without the atoms of the stripped types."""
+   keep = KeptAtoms(frame, typeColumn, strippedTypes, invert)
+   out.write(frame.header_bytes(int(np.count_nonzero(keep))))
+   write_lines(out, frame.block, keep)
 
-   data_file.readline() #ITEM: TIMESTEP
-   data_file.readline()
-   data_file.readline() #ITEM: NUMBER OF ATOMS
-   oldNumberOfAtoms = int(data_file.readline())
-   data_file.readline() #ITEM: BOX BOUNDS pp pp pp
-   data_file.readline()
-   data_file.readline()
-   data_file.readline()
-   data_file.readline() #ITEM: ATOMS id mol x y z
-   for ii in range(0, oldNumberOfAtoms):
-      currentLine = data_file.readline()
-      currentLineSplit = currentLine.split()
-      itype = int(currentLineSplit[typeColumn-1])
-      if not itype in strippedTypes:
-         newNumberOfAtoms += 1
-   data_file.close()
+if __name__ == "__main__":
+   args = parser.parse_args()
+   fileName = args.dump_file
+   typeColumn = int(args.type_col) - 1 if args.type_col.isdigit() else args.type_col
+   strippedTypes = ParseTypes(args.list)
+   invert = bool(args.invert)
+   workers = args.workers
+   follow = bool(args.follow)
+   if follow:
+      try:
+         check_follow(fileName)
+      except ValueError as err:
+         print("Error:", err, file=sys.stderr)
+         sys.exit(1)
+      # the frames are written as soon as they are appended
+      workers = 1
 
    #
    # Start reading the frames and stripping the chosen types!
+   # The number of atoms of each frame is written to its header.
    #
-   data_file = open(fileName,'rt')
-   while True:
-      current_line = data_file.readline() #ITEM: TIMESTEP
-      # Check if we reached end of file
-      if current_line == '': break
-      print( current_line, end='')
-      print( data_file.readline(), end='')
-      print( data_file.readline(), end='') #ITEM: NUMBER OF ATOMS
-      data_file.readline()
-      print( newNumberOfAtoms)
-      print( data_file.readline(), end='') #ITEM: BOX BOUNDS pp pp pp
-      print( data_file.readline(), end='')
-      print( data_file.readline(), end='')
-      print( data_file.readline(), end='')
-      print( data_file.readline(), end='') #ATOM STYLE FORMAT
-
-      id = 0
-      for ii in range(oldNumberOfAtoms):
-         currentLine = data_file.readline()
-         currentLineSplit = currentLine.split()
-         itype = int(currentLineSplit[typeColumn-1])
-
-         if not itype in strippedTypes:
-            id += 1
-            print( currentLine, end='')
-   data_file.close()
+   transform = functools.partial(StripFrame, typeColumn=typeColumn, strippedTypes=strippedTypes,
+                                 invert=invert)
+   with open_dump(args.output, 'wb') as out:
+      frames = read_frames(fileName, use_mmap=bool(args.mmap) and workers <= 1, follow=follow,
+                           interval=args.interval, timeout=args.timeout, on_wait=out.flush)
+      try:
+         write_frames(frames, transform, out, workers)
+      except KeyboardInterrupt:
+         pass
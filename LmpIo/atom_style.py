@@ -0,0 +1,197 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+import functools
+import numpy as np
+
+# Columns of the Atoms section of lammps data files for each atom style (see
+# the read_data command). The names follow the dump attributes (id, mol,
+# type, q, x, y, z, ..). Optional image flags (ix iy iz) follow the columns.
+ATOM_STYLES = {
+    'angle':        ('id', 'mol', 'type', 'x', 'y', 'z'),
+    'atomic':       ('id', 'type', 'x', 'y', 'z'),
+    'body':         ('id', 'type', 'bodyflag', 'mass', 'x', 'y', 'z'),
+    'bond':         ('id', 'mol', 'type', 'x', 'y', 'z'),
+    'bpm/sphere':   ('id', 'mol', 'type', 'diameter', 'density', 'x', 'y', 'z'),
+    'charge':       ('id', 'type', 'q', 'x', 'y', 'z'),
+    'dielectric':   ('id', 'type', 'q', 'x', 'y', 'z', 'normx', 'normy', 'normz',
+                     'area', 'ed', 'em', 'epsilon', 'curvature'),
+    'dipole':       ('id', 'type', 'q', 'x', 'y', 'z', 'mux', 'muy', 'muz'),
+    'dpd':          ('id', 'type', 'theta', 'x', 'y', 'z'),
+    'edpd':         ('id', 'type', 'edpd_temp', 'edpd_cv', 'x', 'y', 'z'),
+    'electron':     ('id', 'type', 'q', 'espin', 'eradius', 'x', 'y', 'z'),
+    'ellipsoid':    ('id', 'type', 'ellipsoidflag', 'density', 'x', 'y', 'z'),
+    'full':         ('id', 'mol', 'type', 'q', 'x', 'y', 'z'),
+    'line':         ('id', 'mol', 'type', 'lineflag', 'density', 'x', 'y', 'z'),
+    'mdpd':         ('id', 'type', 'rho', 'x', 'y', 'z'),
+    'molecular':    ('id', 'mol', 'type', 'x', 'y', 'z'),
+    'peri':         ('id', 'type', 'volume', 'density', 'x', 'y', 'z'),
+    'rheo':         ('id', 'type', 'status', 'rho', 'x', 'y', 'z'),
+    'rheo/thermal': ('id', 'type', 'status', 'rho', 'energy', 'x', 'y', 'z'),
+    'sph':          ('id', 'type', 'rho', 'esph', 'cv', 'x', 'y', 'z'),
+    'sphere':       ('id', 'type', 'diameter', 'density', 'x', 'y', 'z'),
+    'spin':         ('id', 'type', 'x', 'y', 'z', 'spx', 'spy', 'spz', 'sp'),
+    'template':     ('id', 'type', 'mol', 'template_index', 'template_atom', 'x', 'y', 'z'),
+    'tri':          ('id', 'mol', 'type', 'triangleflag', 'density', 'x', 'y', 'z'),
+    'wavepacket':   ('id', 'type', 'q', 'espin', 'eradius', 'etag', 'cs_re', 'cs_im', 'x', 'y', 'z'),
+}
+
+# Columns shared by all sub-styles of the hybrid style
+HYBRID_COLUMNS = ('id', 'type', 'x', 'y', 'z')
+
+class AtomStyle:
+    """
+    Layout of the Atoms section of a lammps data file.
+
+    Attributes:
+        name (str): The atom style (e.g., 'full' or 'hybrid sphere dipole').
+        columns (tuple): Names of the columns.
+        col (dict): Index of each column by name.
+        xyz (list): Indices of the x, y and z columns.
+        image (slice): Columns of the optional image flags.
+    """
+
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = tuple(columns)
+        self.col = {kind: ii for ii, kind in enumerate(self.columns)}
+        self.xyz = [self.col['x'], self.col['y'], self.col['z']]
+        self.image = slice(len(self.columns), len(self.columns) + 3)
+
+    def __len__(self):
+        return len(self.columns)
+
+@functools.lru_cache(maxsize=None)
+def get_atom_style(atom_style):
+    """
+    Returns the layout of an atom style.
+
+    The columns of a hybrid style ('hybrid sub1 sub2 ..') are id, type, x, y
+    and z followed by the other columns of each sub-style in order, each
+    listed once.
+
+    Args:
+        atom_style (str): Name of the atom style.
+
+    Returns:
+        AtomStyle: The layout of the Atoms section.
+
+    Raises:
+        ValueError: If the atom style is unknown.
+    """
+    words = atom_style.split()
+    if not words:
+        raise ValueError('empty atom style')
+    if words[0] != 'hybrid':
+        if len(words) > 1 or words[0] not in ATOM_STYLES:
+            raise ValueError('unsupported atom style: %s' % atom_style)
+        return AtomStyle(atom_style, ATOM_STYLES[words[0]])
+    columns = list(HYBRID_COLUMNS)
+    for sub in words[1:]:
+        if sub not in ATOM_STYLES:
+            raise ValueError('unsupported sub-style of %s: %s' % (atom_style, sub))
+        columns += [kind for kind in ATOM_STYLES[sub] if kind not in columns]
+    return AtomStyle(atom_style, columns)
+
+def read_atoms(lines):
+    """
+    Splits the lines of the Atoms section to a table of tokens.
+
+    Args:
+        lines (list): The atom lines (str).
+
+    Returns:
+        numpy.ndarray: Array of strings of shape (n_atom, n_token). Lines with
+        fewer tokens (e.g., without image flags or comments) are padded with
+        empty strings.
+    """
+    if len(lines) == 0:
+        return np.empty((0, 0), dtype=np.str_)
+    try:
+        return np.loadtxt(lines, dtype=np.str_, comments=None, ndmin=2)
+    except ValueError:
+        # the lines have different numbers of tokens
+        tokens = [line.split() for line in lines]
+        width = max(len(tok) for tok in tokens)
+        return np.array([tok + [''] * (width - len(tok)) for tok in tokens], dtype=np.str_)
+
+def set_columns(table, cols, values, rows=None):
+    """
+    Replaces columns of a table of tokens.
+
+    Args:
+        table (numpy.ndarray): Array of strings of shape (n_atom, n_token).
+        cols (list): Indices of the replaced columns.
+        values (numpy.ndarray): The new values of shape (n_atom, len(cols)),
+            or (len(rows), len(cols)); numbers are formatted with str().
+        rows (numpy.ndarray): Indices of the replaced rows (default: all).
+
+    Returns:
+        numpy.ndarray: The table, widened if the new tokens are longer.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind != 'U':
+        values = values.astype(np.str_)
+    if values.dtype.itemsize > table.dtype.itemsize:
+        table = table.astype(values.dtype)
+    if rows is None:
+        table[:, cols] = values
+    else:
+        table[np.ix_(rows, cols)] = values
+    return table
+
+def format_atoms(table, sep=' ', end='\n'):
+    """
+    Joins a table of tokens to atom lines.
+
+    Args:
+        table (numpy.ndarray): Array of strings of shape (n_atom, n_token).
+        sep (str): Separator of the tokens.
+        end (str): Appended to each line.
+
+    Returns:
+        list: The atom lines (str); empty padding tokens are dropped.
+    """
+    if table.shape[0] == 0:
+        return []
+    lines = table[:, 0]
+    for col in range(1, table.shape[1]):
+        lines = np.char.add(np.char.add(lines, sep), table[:, col])
+    if table.shape[1] > 1 and np.any(table[:, -1] == ''):
+        lines = np.char.rstrip(lines, sep)
+    return np.char.add(lines, end).tolist()
+
+def image_flags(table, style):
+    """
+    Returns the image flags of the atoms and a mask of the atoms which have
+    them (three integer tokens following the columns of the style).
+    """
+    n_atom = table.shape[0]
+    flags = np.zeros((n_atom, 3), dtype=np.int64)
+    if table.shape[1] < style.image.stop:
+        return flags, np.zeros(n_atom, dtype=bool)
+    tokens = table[:, style.image]
+    valid = np.all(np.char.isdigit(np.char.lstrip(tokens, '-+')), axis=1)
+    flags[valid] = tokens[valid].astype(np.int64)
+    return flags, valid
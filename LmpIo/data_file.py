@@ -0,0 +1,997 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+import io
+import math
+import warnings
+import itertools
+import numpy as np
+
+from atom_style import get_atom_style, read_atoms, set_columns, format_atoms, image_flags
+
+# Keywords of the header lines with counts (e.g., '941 atoms')
+HEADER_COUNTS = ('atoms', 'bonds', 'angles', 'dihedrals', 'impropers',
+                 'atom types', 'bond types', 'angle types', 'dihedral types', 'improper types',
+                 'extra bond per atom', 'extra angle per atom', 'extra dihedral per atom',
+                 'extra improper per atom', 'extra special per atom',
+                 'ellipsoids', 'lines', 'triangles', 'bodies')
+
+# Topology sections: header counts of the entries and types and number of
+# atoms of each entry
+TOPOLOGY_SECTIONS = {
+    'Bonds':     ('bonds', 'bond types', 2),
+    'Angles':    ('angles', 'angle types', 3),
+    'Dihedrals': ('dihedrals', 'dihedral types', 4),
+    'Impropers': ('impropers', 'improper types', 4),
+}
+
+# Coefficient sections and the header count of their entries
+COEFF_SECTIONS = {
+    'Masses':                   'atom types',
+    'Pair Coeffs':              'atom types',
+    'Bond Coeffs':              'bond types',
+    'Angle Coeffs':             'angle types',
+    'Dihedral Coeffs':          'dihedral types',
+    'Improper Coeffs':          'improper types',
+    'BondBond Coeffs':          'angle types',
+    'BondAngle Coeffs':         'angle types',
+    'MiddleBondTorsion Coeffs': 'dihedral types',
+    'EndBondTorsion Coeffs':    'dihedral types',
+    'AngleTorsion Coeffs':      'dihedral types',
+    'AngleAngleTorsion Coeffs': 'dihedral types',
+    'BondBond13 Coeffs':        'dihedral types',
+    'AngleAngle Coeffs':        'improper types',
+}
+
+# Sections kept as text: header count of their lines
+TEXT_SECTIONS = {
+    'Velocities': 'atoms',
+    'Ellipsoids': 'ellipsoids',
+    'Lines':      'lines',
+    'Triangles':  'triangles',
+}
+
+SECTIONS = ('Atoms', 'PairIJ Coeffs') + tuple(TOPOLOGY_SECTIONS) + tuple(COEFF_SECTIONS) + tuple(TEXT_SECTIONS)
+
+# Columns of the Atoms section holding integers
+INT_COLUMNS = ('id', 'mol', 'type', 'bodyflag', 'ellipsoidflag', 'lineflag', 'triangleflag',
+               'template_index', 'template_atom', 'status', 'etag')
+
+# Atom style of data files without an 'Atoms # style' comment
+DEFAULT_ATOM_STYLE = 'full'
+
+# Format of the floating point numbers of the new rows written by write_data
+# (%r writes the shortest text which reads back to the same value); the lines
+# read from a file keep their text
+FLOAT_FMT = '%r'
+
+# Rows formatted at once by write_data
+WRITE_ROWS = 1 << 20
+
+# Integer type of the ids, types and atom ids of the Atoms and topology
+# sections (int64 is used for values which do not fit)
+INDEX_DTYPE = np.int32
+
+class Coeffs:
+    """
+    Entries of a coefficient section (Masses, Pair Coeffs, Bond Coeffs, ..).
+
+    Attributes:
+        ids (numpy.ndarray): Type of each entry (int64; shape (n, 2) for
+            PairIJ Coeffs).
+        values (list): Coefficients of each entry as text (e.g., '12.011' or
+            '0.0951 3.47299'); they may contain words (e.g., hybrid styles).
+        comments (list): Text after '#' of each entry ('' if none).
+        lines (list): Line of each entry as read (None for new entries) or
+            None; entries with unchanged ids and coefficients are written as
+            read.
+    """
+
+    def __init__(self, ids, values, comments=None, lines=None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.values = list(values)
+        self.comments = list(comments) if comments is not None else [''] * len(self.values)
+        self.lines = lines
+
+    def __len__(self):
+        return len(self.values)
+
+    def find(self, type_id):
+        """Returns the position of the entry of a type or -1."""
+        hits = np.flatnonzero(self.ids == type_id)
+        return int(hits[0]) if len(hits) else -1
+
+    def offset(self, type_offset):
+        """Adds an offset to the types of the entries."""
+        self.ids = self.ids + type_offset
+        return self
+
+    @staticmethod
+    def concatenate(sections):
+        """Returns the entries of several coefficient sections in order."""
+        return Coeffs(np.concatenate([sec.ids for sec in sections]),
+                      [val for sec in sections for val in sec.values],
+                      [com for sec in sections for com in sec.comments],
+                      _concat_lines(sections))
+
+def index_array(values):
+    """
+    Converts ids, types or atom ids to INDEX_DTYPE, or to int64 if they do
+    not fit.
+    """
+    values = np.asarray(values)
+    info = np.iinfo(INDEX_DTYPE)
+    if values.size and (values.max() > info.max or values.min() < info.min):
+        return values.astype(np.int64, copy=False)
+    return values.astype(INDEX_DTYPE, copy=False)
+
+def _shifted(values, offset):
+    # adds an offset to an index array without overflowing INDEX_DTYPE
+    if not offset:
+        return values
+    return index_array(values.astype(np.int64) + offset)
+
+def _take_lines(lines, n_row, index):
+    # the lines of the rows at the given positions (or boolean mask)
+    if lines is None:
+        return None
+    return [lines[ii] for ii in np.arange(n_row)[index]]
+
+def _concat_lines(sections):
+    # the lines of concatenated sections; None if no section has any
+    if all(sec.lines is None for sec in sections):
+        return None
+    lines = []
+    for sec in sections:
+        lines.extend(sec.lines if sec.lines is not None else [None] * len(sec))
+    return lines
+
+def _concat_comments(sections):
+    # the comments of concatenated sections; None if no section has any
+    if all(sec.comments is None for sec in sections):
+        return None
+    comments = []
+    for sec in sections:
+        comments.extend(sec.comments if sec.comments is not None else [''] * len(sec))
+    return comments
+
+class Topology:
+    """
+    Entries of a topology section (Bonds, Angles, Dihedrals or Impropers)
+    stored as arrays (struct of arrays).
+
+    Attributes:
+        ids (numpy.ndarray): Id of each entry.
+        types (numpy.ndarray): Type of each entry.
+        atoms (numpy.ndarray): Atom ids of each entry, shape (n, 2..4).
+        comments (list): Text after '#' of each entry or None.
+        lines (list): Line of each entry as read (None for new entries) or
+            None; see write_topology.
+    """
+
+    def __init__(self, ids, types, atoms, comments=None, lines=None):
+        self.ids = index_array(ids)
+        self.types = index_array(types)
+        self.atoms = index_array(atoms)
+        self.comments = comments
+        self.lines = lines
+
+    def __len__(self):
+        return len(self.ids)
+
+    def offset(self, id_offset=0, type_offset=0, atom_offset=0):
+        """Adds offsets to the ids, types and atom ids of the entries."""
+        self.ids = _shifted(self.ids, id_offset)
+        self.types = _shifted(self.types, type_offset)
+        self.atoms = _shifted(self.atoms, atom_offset)
+        return self
+
+    def take(self, index):
+        """Returns the entries at the given positions (or boolean mask)."""
+        comments = None
+        if self.comments is not None:
+            comments = [self.comments[ii] for ii in np.arange(len(self))[index]]
+        return Topology(self.ids[index], self.types[index], self.atoms[index], comments,
+                        _take_lines(self.lines, len(self), index))
+
+    def renumber(self, atom_lut=None):
+        """
+        Renumbers the entries 1..n in their current order and, if atom_lut is
+        set, the atom ids (the new id of atom i is atom_lut[i]).
+        """
+        self.ids = index_array(np.arange(1, len(self) + 1))
+        if atom_lut is not None:
+            self.atoms = index_array(atom_lut[self.atoms])
+        return self
+
+    @staticmethod
+    def concatenate(sections):
+        """Returns the entries of several topology sections in order."""
+        return Topology(np.concatenate([sec.ids for sec in sections]),
+                        np.concatenate([sec.types for sec in sections]),
+                        np.concatenate([sec.atoms for sec in sections]),
+                        _concat_comments(sections), _concat_lines(sections))
+
+class Atoms:
+    """
+    Atoms section of a data file stored as one array per column (struct of
+    arrays).
+
+    Attributes:
+        style (AtomStyle): Layout of the section (see atom_style.py).
+        columns (dict): Array of each column of the style by name; id, mol,
+            type and the flags are INDEX_DTYPE, the other columns float64.
+        image (numpy.ndarray): Image flags of shape (n, 3) or None.
+        comments (list): Text after '#' of each atom or None.
+        lines (list): Line of each atom as read (None for new atoms) or None;
+            see write_atoms.
+    """
+
+    def __init__(self, style, columns, image=None, comments=None, lines=None):
+        self.style = style
+        self.columns = {kind: index_array(col) if kind in INT_COLUMNS else col
+                        for kind, col in columns.items()}
+        self.image = image
+        self.comments = comments
+        self.lines = lines
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    @property
+    def ids(self):
+        return self.columns['id']
+
+    @ids.setter
+    def ids(self, values):
+        self.columns['id'] = index_array(values)
+
+    @property
+    def types(self):
+        return self.columns['type']
+
+    @types.setter
+    def types(self, values):
+        self.columns['type'] = index_array(values)
+
+    @property
+    def xyz(self):
+        """Coordinates of shape (n, 3) (a copy)."""
+        return np.column_stack((self.columns['x'], self.columns['y'], self.columns['z']))
+
+    @xyz.setter
+    def xyz(self, values):
+        for dim, kind in enumerate('xyz'):
+            self.columns[kind] = np.ascontiguousarray(values[:, dim], dtype=np.float64)
+
+    def offset(self, id_offset=0, type_offset=0, mol_offset=0, shift=None):
+        """
+        Adds offsets to the ids, types and molecule ids of the atoms and a
+        shift (x, y, z) to their coordinates.
+        """
+        self.columns['id'] = _shifted(self.columns['id'], id_offset)
+        self.columns['type'] = _shifted(self.columns['type'], type_offset)
+        if 'mol' in self.columns:
+            self.columns['mol'] = _shifted(self.columns['mol'], mol_offset)
+        if shift is not None:
+            for dim, kind in enumerate('xyz'):
+                if shift[dim]:
+                    self.columns[kind] = self.columns[kind] + shift[dim]
+        return self
+
+    def unwrap(self, lengths, tilt=None):
+        """
+        Unwraps the coordinates with the image flags, which are dropped.
+
+        Args:
+            lengths (numpy.ndarray): Box lengths along x, y and z.
+            tilt (numpy.ndarray): xy, xz and yz of triclinic boxes or None.
+        """
+        if self.image is None:
+            return self
+        lx, ly, lz = lengths
+        xy, xz, yz = tilt if tilt is not None else (0.0, 0.0, 0.0)
+        self.xyz = self.xyz + self.image @ np.array([[lx, 0.0, 0.0], [xy, ly, 0.0], [xz, yz, lz]])
+        self.image = None
+        return self
+
+    def take(self, index):
+        """Returns the atoms at the given positions (or boolean mask)."""
+        comments = None
+        if self.comments is not None:
+            comments = [self.comments[ii] for ii in np.arange(len(self))[index]]
+        image = self.image[index] if self.image is not None else None
+        return Atoms(self.style, {kind: col[index] for kind, col in self.columns.items()}, image, comments,
+                     _take_lines(self.lines, len(self), index))
+
+    def renumber(self):
+        """
+        Renumbers the atoms 1..n in their current order.
+
+        Returns:
+            numpy.ndarray: Lookup table of the new id of each old id, for
+            renumbering the atom ids of the topology sections.
+        """
+        lut = np.zeros(int(self.ids.max()) + 1 if len(self) else 1, dtype=np.int64)
+        lut[self.ids] = np.arange(1, len(self) + 1)
+        self.ids = np.arange(1, len(self) + 1)
+        return lut
+
+    @staticmethod
+    def concatenate(sections):
+        """
+        Returns the atoms of several Atoms sections of the same style in
+        order; the image flags are kept if any section has them.
+        """
+        style = sections[0].style
+        for sec in sections[1:]:
+            if sec.style.columns != style.columns:
+                raise ValueError('cannot concatenate atom styles %s and %s' % (style.name, sec.style.name))
+        columns = {kind: np.concatenate([sec.columns[kind] for sec in sections]) for kind in style.columns}
+        image = None
+        if any(sec.image is not None for sec in sections):
+            image = np.concatenate([sec.image if sec.image is not None else np.zeros((len(sec), 3), dtype=INDEX_DTYPE)
+                                    for sec in sections])
+        return Atoms(style, columns, image, _concat_comments(sections), _concat_lines(sections))
+
+class TextSection:
+    """A section kept as text (e.g., Velocities or sections which are not parsed)."""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __len__(self):
+        return len(self.lines)
+
+class DataFile:
+    """
+    Contents of a lammps data file.
+
+    Attributes:
+        title (str): The first line.
+        counts (dict): Header counts by keyword (e.g., counts['atom types']).
+        box (numpy.ndarray): lo and hi of x, y and z, shape (3, 2).
+        tilt (numpy.ndarray): xy, xz and yz of triclinic boxes or None.
+        box_text (dict): The numbers of the box lines as read (e.g.,
+            ['0.000000', '22.767784'] for 'xlo xhi'), written back while
+            the box is unchanged.
+        header (list): Other header lines, written as they are.
+        sections (dict): Sections in file order by name: Atoms, Topology,
+            Coeffs or TextSection.
+        styles (dict): Comment of the section lines (e.g., 'full' for
+            'Atoms # full').
+    """
+
+    def __init__(self, title='LAMMPS data file'):
+        self.title = title
+        self.counts = {}
+        self.box = np.zeros((3, 2))
+        self.tilt = None
+        self.box_text = {}
+        self.header = []
+        self.sections = {}
+        self.styles = {}
+
+    def __getitem__(self, name):
+        return self.sections[name]
+
+    def __contains__(self, name):
+        return name in self.sections
+
+    def get(self, name, default=None):
+        return self.sections.get(name, default)
+
+    @property
+    def atoms(self):
+        return self.sections.get('Atoms')
+
+    @property
+    def lengths(self):
+        """Box lengths along x, y and z."""
+        return self.box[:, 1] - self.box[:, 0]
+
+def _split_comment(line):
+    data, _, comment = line.partition('#')
+    return data, comment.rstrip('\n')
+
+def _is_blank(line):
+    # blank or comment lines (e.g., the column names written by some tools
+    # after the section header)
+    return not _split_comment(line)[0].strip()
+
+def _parse_numbers(body, n_row, dtype):
+    # parses the numbers of a block of lines at once; returns None if the
+    # block holds other tokens or the rows have different lengths
+    if n_row == 0:
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            values = np.fromstring(body, dtype=dtype, sep=' ')
+        except (ValueError, DeprecationWarning):
+            return None
+    if len(values) % n_row:
+        return None
+    return values.reshape(n_row, -1)
+
+def _split_lines(lines):
+    # tokens and comments of lines; comments is None if no line has one
+    tokens, comments = [], []
+    for line in lines:
+        data, comment = _split_comment(line)
+        tokens.append(data.split())
+        comments.append(comment)
+    if not any(comments):
+        comments = None
+    return tokens, comments
+
+def parse_topology(lines, n_atom_entry):
+    """Parses the lines of a topology section to a Topology."""
+    body = ''.join(lines)
+    comments = None
+    table = _parse_numbers(body, len(lines), np.int64) if '#' not in body else None
+    if table is None:
+        tokens, comments = _split_lines(lines)
+        table = np.array(tokens, dtype=np.int64).reshape(len(lines), 2 + n_atom_entry)
+    if table.shape[1] != 2 + n_atom_entry:
+        raise ValueError('topology entries with %d tokens instead of %d' % (table.shape[1], 2 + n_atom_entry))
+    return Topology(table[:, 0], table[:, 1], table[:, 2:], comments, lines)
+
+def parse_atoms(lines, style):
+    """
+    Parses the lines of the Atoms section to an Atoms. Lines without
+    comments holding only numbers are parsed with one NumPy call; the others
+    are split with atom_style.read_atoms. Three integers after the columns
+    of the style are the image flags (see atom_style.image_flags), kept if
+    any atom has them (zero for the others); other extra tokens (e.g.,
+    columns added by other tools) are skipped and kept in the lines of the
+    atoms.
+
+    Raises:
+        ValueError: If a line has fewer tokens than the columns of the style.
+    """
+    n_col = len(style)
+    body = ''.join(lines)
+    comments = None
+    table = _parse_numbers(body, len(lines), np.float64) if '#' not in body else None
+    if table is not None and table.shape[1] == n_col + 3 and np.any(table[:, n_col:] != np.round(table[:, n_col:])):
+        table = None
+    if table is not None and table.shape[1] in (n_col, n_col + 3):
+        values = table[:, :n_col]
+        image = table[:, n_col:].astype(INDEX_DTYPE) if table.shape[1] == n_col + 3 else None
+    else:
+        tokens = read_atoms(lines)
+        if tokens.shape[1] < n_col:
+            tokens = np.pad(tokens, ((0, 0), (0, n_col - tokens.shape[1])), constant_values='')
+        short = np.flatnonzero(np.any((tokens[:, :n_col] == '') | np.char.startswith(tokens[:, :n_col], '#'), axis=1))
+        if len(short):
+            line = lines[short[0]]
+            raise ValueError('atom line with %d tokens for the %d columns of atom style %s: %s'
+                             % (len(_split_comment(line)[0].split()), n_col, style.name, line.strip()))
+        values = tokens[:, :n_col].astype(np.float64)
+        flags, valid = image_flags(tokens, style)
+        image = flags.astype(INDEX_DTYPE) if valid.any() else None
+        if '#' in body:
+            comments = [_split_comment(line)[1] for line in lines]
+    columns = {}
+    for ii, kind in enumerate(style.columns):
+        columns[kind] = index_array(values[:, ii]) if kind in INT_COLUMNS else values[:, ii].copy()
+    return Atoms(style, columns, image, comments, lines)
+
+def parse_coeffs(lines, n_id=1):
+    """Parses the lines of a coefficient section to a Coeffs."""
+    ids, values, comments = [], [], []
+    for line in lines:
+        data, comment = _split_comment(line)
+        tokens = data.split()
+        ids.append([int(tok) for tok in tokens[:n_id]])
+        values.append(' '.join(tokens[n_id:]))
+        comments.append(comment)
+    ids = np.array(ids, dtype=np.int64).reshape(len(lines), n_id)
+    return Coeffs(ids[:, 0] if n_id == 1 else ids, values, comments, list(lines))
+
+def _section_name(line):
+    # the name of a section header line or None
+    data, comment = _split_comment(line)
+    name = ' '.join(data.split())
+    return (name, comment.strip()) if name in SECTIONS else (None, None)
+
+def _other_section_name(line):
+    # the name of a header line of a section which is not in SECTIONS (e.g.,
+    # CMAP) or None; header and data lines start with numbers
+    data, comment = _split_comment(line)
+    tokens = data.split()
+    if tokens and tokens[0][0].isalpha():
+        return ' '.join(tokens), comment.strip()
+    return None, None
+
+def _count_keyword(name):
+    # the header count of the lines of a section
+    if name == 'Atoms':
+        return 'atoms'
+    if name in TOPOLOGY_SECTIONS:
+        return TOPOLOGY_SECTIONS[name][0]
+    if name in COEFF_SECTIONS:
+        return COEFF_SECTIONS[name]
+    if name == 'PairIJ Coeffs':
+        return 'atom types'
+    return TEXT_SECTIONS[name]
+
+def _count_lines(lines, iline):
+    # the lines from iline to the next blank line or section header
+    count = 0
+    while iline + count < len(lines) and not _is_blank(lines[iline + count]) \
+            and _section_name(lines[iline + count])[0] is None:
+        count += 1
+    return count
+
+def _parse_header_line(data, line):
+    tokens = _split_comment(line)[0].split()
+    if not tokens:
+        return
+    keyword = ' '.join(tokens[1:])
+    if keyword in HEADER_COUNTS:
+        data.counts[keyword] = int(tokens[0])
+        return
+    for dim, keyword in enumerate(('xlo xhi', 'ylo yhi', 'zlo zhi')):
+        if ' '.join(tokens[2:]) == keyword:
+            data.box[dim] = [float(tokens[0]), float(tokens[1])]
+            data.box_text[keyword] = tokens[:2]
+            return
+    if ' '.join(tokens[3:]) == 'xy xz yz':
+        data.tilt = np.array([float(val) for val in tokens[:3]])
+        data.box_text['xy xz yz'] = tokens[:3]
+        return
+    data.header.append(line.rstrip('\n'))
+
+def read_data(path, atom_style=None, parse=None):
+    """
+    Reads a lammps data file.
+
+    The lines are split once; a line is a section header only if it equals
+    a section name (apart from a comment), so words in comments or
+    coefficients are never taken for headers. Each section holds as many
+    lines as the corresponding header count, or runs to the next blank line
+    if the header lacks the count. Topology sections and the
+    Atoms section are parsed with one NumPy call when their lines have no
+    comments. Sections which are not in SECTIONS (e.g., the CMAP section of
+    CHARMM data files) run to the next blank line and are kept as
+    TextSection, so that they are written back unchanged.
+
+    Args:
+        path (str): Path of the data file.
+        atom_style (str): Atom style of the Atoms section; the default is the
+            comment of the Atoms line (e.g., 'Atoms # full') or else 'full'.
+        parse (set): Names of the sections parsed to arrays; the others are
+            kept as TextSection. All sections are parsed by default.
+
+    Returns:
+        DataFile: The contents of the file.
+
+    Raises:
+        ValueError: If a section is shorter than its header count or the
+        lines of a section cannot be parsed.
+    """
+    with open(path, 'r') as foo:
+        lines = foo.readlines()
+    if lines and not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+    data = DataFile(lines[0].rstrip('\n') if lines else '')
+    iline = 1
+    while iline < len(lines):
+        name, style = _section_name(lines[iline])
+        if name is not None or _other_section_name(lines[iline])[0] is not None:
+            break
+        _parse_header_line(data, lines[iline])
+        iline += 1
+    while iline < len(lines):
+        name, style = _section_name(lines[iline])
+        if name is None:
+            name, style = _other_section_name(lines[iline])
+        iline += 1
+        if name is None:
+            if not _is_blank(lines[iline - 1]):
+                raise ValueError('%s: unexpected line %d: %s' % (path, iline, lines[iline - 1].strip()))
+            continue
+        while iline < len(lines) and _is_blank(lines[iline]):
+            iline += 1
+        if name not in SECTIONS:
+            # other sections (e.g., CMAP) run to the next blank line and
+            # are kept as text
+            count = _count_lines(lines, iline)
+            data.sections[name] = TextSection(lines[iline:iline + count])
+            if style:
+                data.styles[name] = style
+            iline += count
+            continue
+        keyword = _count_keyword(name)
+        if keyword in data.counts:
+            count = data.counts[keyword]
+            if name == 'PairIJ Coeffs':
+                count = count * (count + 1) // 2
+        else:
+            # the header lacks the count (e.g., hand edited files); the
+            # section ends at the next blank line
+            count = _count_lines(lines, iline)
+            if name != 'PairIJ Coeffs':
+                data.counts[keyword] = count
+        body = lines[iline:iline + count]
+        if len(body) < count:
+            raise ValueError('%s: the %s section has %d of %d lines' % (path, name, len(body), count))
+        iline += count
+        if style:
+            data.styles[name] = style
+        if parse is not None and name not in parse:
+            data.sections[name] = TextSection(body)
+        elif name == 'Atoms':
+            data.sections[name] = parse_atoms(body, get_atom_style(atom_style or style or DEFAULT_ATOM_STYLE))
+        elif name in TOPOLOGY_SECTIONS:
+            data.sections[name] = parse_topology(body, TOPOLOGY_SECTIONS[name][2])
+        elif name in COEFF_SECTIONS:
+            data.sections[name] = parse_coeffs(body)
+        elif name == 'PairIJ Coeffs':
+            data.sections[name] = parse_coeffs(body, 2)
+        else:
+            data.sections[name] = TextSection(body)
+    return data
+
+def coeff_key(value, tol=0.0):
+    """
+    Returns a hashable key of the coefficients of a type given as text, so
+    that types with the same coefficients are found with one dict lookup
+    each. The numbers are compared by value (e.g., '1.0' equals '1.000') and,
+    if tol is set, after rounding to multiples of tol; words (e.g., the
+    styles of hybrid coefficients) are compared as text.
+
+    Args:
+        value (str): The coefficients (e.g., '0.0951 3.47299').
+        tol (float): Tolerance of the comparison of the numbers (0: exact).
+
+    Returns:
+        tuple: The canonical tokens of the coefficients.
+    """
+    key = []
+    for token in value.split():
+        try:
+            number = float(token)
+        except ValueError:
+            key.append(token)
+            continue
+        key.append(round(number / tol) if tol > 0 and math.isfinite(number) else number + 0.0)
+    return tuple(key)
+
+def group_keys(keys):
+    """
+    Groups equal (hashable) keys in order of first appearance.
+
+    Returns:
+        tuple: The positions of the first key of each group (numpy.ndarray)
+        and the group of each key (numpy.ndarray, 0-based).
+    """
+    groups = {}
+    first = []
+    inverse = np.empty(len(keys), dtype=np.int64)
+    for ii, key in enumerate(keys):
+        group = groups.setdefault(key, len(groups))
+        if group == len(first):
+            first.append(ii)
+        inverse[ii] = group
+    return np.array(first, dtype=np.int64), inverse
+
+def type_lut(mapping, n_type):
+    """
+    Returns a lookup table mapping the types 0..n_type (and the types of a
+    mapping) to themselves, except the old types of the mapping which are
+    mapped to the new ones.
+    """
+    lut = np.arange(max([n_type] + list(mapping)) + 1, dtype=np.int64)
+    for old, new in mapping.items():
+        lut[old] = new
+    return lut
+
+def remap_types(data, keyword, lut):
+    """
+    Renumbers the types of one kind in all sections with a lookup table (the
+    new type of type t is lut[t]): the types of the Atoms or topology entries
+    and the ids of the coefficient sections.
+
+    Args:
+        data (DataFile): The contents of a data file; changed in place.
+        keyword (str): The header count of the types (e.g., 'bond types').
+        lut (numpy.ndarray): The new type of each old type.
+    """
+    for name, section in data.sections.items():
+        if isinstance(section, Coeffs) and COEFF_SECTIONS.get(name) == keyword:
+            section.ids = lut[section.ids]
+        elif name == 'PairIJ Coeffs' and keyword == 'atom types' and isinstance(section, Coeffs):
+            section.ids = lut[section.ids]
+        elif name == 'Atoms' and keyword == 'atom types' and isinstance(section, Atoms):
+            section.types = index_array(lut[section.types])
+        elif name in TOPOLOGY_SECTIONS and TOPOLOGY_SECTIONS[name][1] == keyword and isinstance(section, Topology):
+            section.types = index_array(lut[section.types])
+
+def read_section_lines(path):
+    """
+    Reads a file holding sections in the layout of data files, e.g. lists of
+    types or coefficients (Masses, Bond Coeffs, ..); each section ends at a
+    blank line or at the next section.
+
+    Returns:
+        dict: The lines of each section by name.
+    """
+    sections = {}
+    name = None
+    with open(path, 'r') as foo:
+        for line in foo:
+            header = _section_name(line)[0]
+            if header is not None:
+                name = header
+                sections[name] = []
+            elif name is not None:
+                if line.strip():
+                    sections[name].append(line)
+                elif sections[name]:
+                    name = None
+    return sections
+
+def write_rows(foo, columns, fmts, comments=None, end='\n'):
+    """
+    Writes the rows of a set of columns with one formatting operation per
+    block of WRITE_ROWS rows.
+
+    Args:
+        foo: Text file object.
+        columns (list): The columns (numpy.ndarray of equal lengths).
+        fmts (list): Format of each column (e.g., '%d').
+        comments (list): Comment of each row ('' for none) or None.
+        end (str): Appended to each row.
+    """
+    n_row = len(columns[0]) if columns else 0
+    row_fmt = ' '.join(fmts)
+    if comments is not None:
+        row_fmt += '%s'
+    row_fmt += end
+    for start in range(0, n_row, WRITE_ROWS):
+        block = [col[start:start + WRITE_ROWS].tolist() for col in columns]
+        if comments is not None:
+            block.append([' #' + com if com else '' for com in comments[start:start + WRITE_ROWS]])
+        foo.write((row_fmt * len(block[0])) % tuple(itertools.chain.from_iterable(zip(*block))))
+
+def _replace_tokens(lines, columns, old_columns, fmts):
+    # the tokens of lines (see atom_style.read_atoms) with the values of the
+    # columns which differ from old_columns formatted with fmts
+    table = read_atoms(lines)
+    for col, (new, old, fmt) in enumerate(zip(columns, old_columns, fmts)):
+        rows = np.flatnonzero(new != old)
+        if len(rows):
+            table = set_columns(table, [col], np.array([[fmt % val] for val in new[rows].tolist()]), rows)
+    return table
+
+def _write_lines(foo, lines, columns, old_columns, fmts, comments, verbatim, fresh=None):
+    # writes rows which were read from a file: unchanged rows as read and the
+    # others with the changed tokens replaced; rows without a line (or set in
+    # fresh) are formatted with write_rows
+    n_row = len(columns[0])
+    read = np.array([line is not None for line in lines], dtype=bool)
+    if fresh is not None:
+        read &= ~fresh
+    rows = np.flatnonzero(read)
+    changed = np.zeros(len(rows), dtype=bool)
+    for new, old in zip(columns, old_columns):
+        changed |= new[rows] != old[rows]
+    if not verbatim:
+        changed[:] = True
+    if len(rows) == n_row and not changed.any():
+        foo.writelines(lines)
+        return
+    out = list(lines)
+    edit = rows[changed]
+    if len(edit):
+        table = _replace_tokens([lines[ii] for ii in edit], [col[edit] for col in columns],
+                                [col[edit] for col in old_columns], fmts)
+        for ii, line in zip(edit.tolist(), format_atoms(table)):
+            out[ii] = line
+    new_rows = np.flatnonzero(~read)
+    if len(new_rows):
+        block = io.StringIO()
+        write_rows(block, [col[new_rows] for col in columns], fmts,
+                   [comments[ii] for ii in new_rows] if comments is not None else None)
+        for ii, line in zip(new_rows.tolist(), block.getvalue().splitlines(True)):
+            out[ii] = line
+    foo.writelines(out)
+
+def _read_rows(lines, n_row, parse):
+    # the values of the rows read from a file (zero for rows without a line)
+    read = [ii for ii, line in enumerate(lines) if line is not None]
+    columns = parse([lines[ii] for ii in read])
+    values = [np.zeros(n_row, dtype=col.dtype) for col in columns]
+    for full, col in zip(values, columns):
+        full[read] = col
+    return values
+
+def write_atoms(foo, atoms, float_fmt=FLOAT_FMT, verbatim=True):
+    """
+    Writes the lines of an Atoms section.
+
+    The atoms read from a file are written as read if their values are
+    unchanged; otherwise only the tokens of the changed values are replaced
+    (formatted with float_fmt or %d) and the tokens are joined with single
+    spaces, so that comments and extra columns are kept. New atoms are
+    formatted in large blocks. With verbatim False, the tokens of all atoms
+    read from a file are joined with single spaces.
+    """
+    columns = [atoms.columns[kind] for kind in atoms.style.columns]
+    fmts = ['%d' if kind in INT_COLUMNS else float_fmt for kind in atoms.style.columns]
+    if atoms.image is not None:
+        columns += [atoms.image[:, dim] for dim in range(3)]
+        fmts += ['%d'] * 3
+    if atoms.lines is None:
+        write_rows(foo, columns, fmts, atoms.comments)
+        return
+    n_col = len(atoms.style)
+    dropped = []
+
+    def parse(lines):
+        old = parse_atoms(lines, atoms.style)
+        old_columns = [old.columns[kind] for kind in atoms.style.columns]
+        if atoms.image is not None:
+            image = old.image if old.image is not None else np.zeros((len(old), 3), dtype=INDEX_DTYPE)
+            old_columns += [image[:, dim] for dim in range(3)]
+        elif old.image is not None:
+            dropped.append(True)
+        return old_columns
+
+    old_columns = _read_rows(atoms.lines, len(atoms), parse)
+    fresh = None
+    if dropped:
+        # the image flags were dropped (e.g., by unwrap)
+        fresh = np.ones(len(atoms), dtype=bool)
+    elif atoms.image is not None:
+        # atoms with new image flags whose lines have no image flags
+        moved = np.any(atoms.image != np.column_stack(old_columns[n_col:]), axis=1)
+        fresh = np.zeros(len(atoms), dtype=bool)
+        for ii in np.flatnonzero(moved).tolist():
+            line = atoms.lines[ii]
+            fresh[ii] = line is not None and len(_split_comment(line)[0].split()) != n_col + 3
+    _write_lines(foo, atoms.lines, columns, old_columns, fmts, atoms.comments, verbatim, fresh)
+
+def write_topology(foo, topo, verbatim=True):
+    """Writes the lines of a topology section (see write_atoms for the entries read from a file)."""
+    columns = [topo.ids, topo.types] + [topo.atoms[:, ii] for ii in range(topo.atoms.shape[1])]
+    fmts = ['%d'] * len(columns)
+    if topo.lines is None:
+        write_rows(foo, columns, fmts, topo.comments)
+        return
+
+    def parse(lines):
+        old = parse_topology(lines, topo.atoms.shape[1])
+        return [old.ids, old.types] + [old.atoms[:, ii] for ii in range(old.atoms.shape[1])]
+
+    old_columns = _read_rows(topo.lines, len(topo), parse)
+    _write_lines(foo, topo.lines, columns, old_columns, fmts, topo.comments, verbatim)
+
+def write_coeffs(foo, coeffs, verbatim=True):
+    """
+    Writes the lines of a coefficient section. The entries read from a file
+    with unchanged coefficients are written as read, with the tokens of
+    their ids replaced if they changed (see write_atoms).
+    """
+    ids = coeffs.ids.reshape(len(coeffs), -1).tolist()
+    lines = coeffs.lines if coeffs.lines is not None else [None] * len(coeffs)
+    for type_ids, value, comment, line in zip(ids, coeffs.values, coeffs.comments, lines):
+        if line is not None:
+            data, old_comment = _split_comment(line)
+            tokens = data.split()
+            if ' '.join(tokens[len(type_ids):]) == value and old_comment == comment:
+                if verbatim and tokens[:len(type_ids)] == [str(tid) for tid in type_ids]:
+                    foo.write(line)
+                    continue
+                tokens = line.split()
+                tokens[:len(type_ids)] = [str(tid) for tid in type_ids]
+                foo.write(' '.join(tokens) + '\n')
+                continue
+        line = ' '.join(str(tid) for tid in type_ids + ([value] if value else []))
+        foo.write(line + (' #' + comment if comment else '') + '\n')
+
+def data_counts(data):
+    """
+    Returns the header counts of a data file: the counts of the atoms and
+    topology entries are taken from the sections, the other counts (e.g.,
+    the numbers of types) from data.counts.
+    """
+    counts = dict(data.counts)
+    if data.atoms is not None:
+        counts['atoms'] = len(data.atoms)
+    for name, (keyword, _, _) in TOPOLOGY_SECTIONS.items():
+        if name in data.sections:
+            counts[keyword] = len(data.sections[name])
+    return counts
+
+def _box_text(data, keyword, values, float_fmt):
+    # the numbers of a box line as read, or formatted if they changed
+    text = data.box_text.get(keyword)
+    if text is None or [float(val) for val in text] != values.tolist():
+        text = [float_fmt % val for val in values.tolist()]
+    return ' '.join(text)
+
+def write_header(foo, data, counts, float_fmt=FLOAT_FMT):
+    """
+    Writes the title, the header counts, the other header lines and the box
+    of a data file.
+
+    Args:
+        foo: Text file object.
+        data (DataFile): The contents.
+        counts (dict): The header counts by keyword.
+        float_fmt (str): Format of the floating point numbers.
+    """
+    foo.write(data.title + '\n\n')
+    for keyword in HEADER_COUNTS:
+        if keyword in counts:
+            if keyword == 'atom types':
+                foo.write('\n')
+            foo.write('%d %s\n' % (counts[keyword], keyword))
+    for line in data.header:
+        foo.write(line + '\n')
+    foo.write('\n')
+    for dim, keyword in enumerate(('xlo xhi', 'ylo yhi', 'zlo zhi')):
+        foo.write('%s %s\n' % (_box_text(data, keyword, data.box[dim], float_fmt), keyword))
+    if data.tilt is not None:
+        foo.write('%s xy xz yz\n' % _box_text(data, 'xy xz yz', data.tilt, float_fmt))
+
+def write_section_name(foo, data, name):
+    """Writes the line of a section name (e.g., 'Atoms # full') and the blank lines around it."""
+    style = data.styles.get(name)
+    foo.write('\n%s%s\n\n' % (name, ' # ' + style if style else ''))
+
+def write_data(path, data, float_fmt=FLOAT_FMT, verbatim=True):
+    """
+    Writes a lammps data file.
+
+    The counts of the atoms and topology entries are taken from the sections;
+    the other counts (e.g., the numbers of types) from data.counts. The lines
+    read from a file are written as read unless their values changed, in
+    which case only the changed tokens are replaced (see write_atoms); the
+    box lines likewise. New rows of the Atoms and topology sections are
+    formatted in large blocks.
+
+    Args:
+        path (str): Path of the data file.
+        data (DataFile): The contents.
+        float_fmt (str): Format of the floating point numbers of new rows.
+        verbatim (bool): If False, the tokens of all lines read from a file
+            are joined with single spaces.
+    """
+    with open(path, 'w') as foo:
+        write_header(foo, data, data_counts(data), float_fmt)
+        for name, section in data.sections.items():
+            write_section_name(foo, data, name)
+            if isinstance(section, Atoms):
+                write_atoms(foo, section, float_fmt, verbatim)
+            elif isinstance(section, Topology):
+                write_topology(foo, section, verbatim)
+            elif isinstance(section, Coeffs):
+                write_coeffs(foo, section, verbatim)
+            else:
+                foo.writelines(section.lines)
@@ -0,0 +1,210 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+
+import os
+import json
+import numpy as np
+
+from dump_io import read_frames, column_dtype
+from frame_index import load_index
+
+# Extension of the cache directory (e.g., dump.lammpstrj.bin)
+CACHE_EXT = '.bin'
+
+# Version of the cache layout
+CACHE_VERSION = 1
+
+def cache_path(path):
+    """Returns the default path of the cache directory of a dump file."""
+    return path + CACHE_EXT
+
+def write_cache(path, path_cache=None):
+    """
+    Converts a text dump file to a columnar binary cache.
+
+    The cache is a directory of .npy files: timestep, n_atom and box hold one
+    entry per frame, frame_start holds the row offsets of the frames (n_frame+1
+    entries) and each dump column is stored as one contiguous array over all
+    frames. meta.json holds the column names and the size and modification
+    time of the dump file.
+
+    Args:
+        path (str): Path of the dump file (may be compressed).
+        path_cache (str): Path of the cache directory (default: path + '.bin').
+
+    Returns:
+        str: The path of the cache directory.
+    """
+    if path_cache is None:
+        path_cache = cache_path(path)
+    os.makedirs(path_cache, exist_ok=True)
+
+    # the headers are scanned first so that the arrays are allocated once
+    index = load_index(path, save=False)
+    n_frame = len(index)
+    frame_start = np.zeros(n_frame + 1, dtype=np.int64)
+    np.cumsum(index.n_atoms, out=frame_start[1:])
+    np.save(os.path.join(path_cache, 'timestep.npy'), index.timesteps)
+    np.save(os.path.join(path_cache, 'n_atom.npy'), index.n_atoms)
+    np.save(os.path.join(path_cache, 'box.npy'), index.records['box'])
+    np.save(os.path.join(path_cache, 'frame_start.npy'), frame_start)
+
+    columns = None
+    arrays = {}
+    for iframe, frame in enumerate(read_frames(path)):
+        if iframe == n_frame:
+            break
+        if columns is None:
+            columns = frame.columns
+            dtype = column_dtype(columns)
+            for name in columns:
+                if frame_start[-1] == 0:
+                    np.save(os.path.join(path_cache, name + '.npy'), np.empty(0, dtype=dtype[name]))
+                    continue
+                arrays[name] = np.lib.format.open_memmap(
+                    os.path.join(path_cache, name + '.npy'), mode='w+',
+                    dtype=dtype[name], shape=(int(frame_start[-1]),))
+        elif frame.columns != columns:
+            raise ValueError('the columns of frame %d differ from the first frame' % frame.timestep)
+        if frame.n_atom == 0:
+            continue
+        atoms = frame.atoms
+        rows = slice(frame_start[iframe], frame_start[iframe + 1])
+        for name in columns:
+            arrays[name][rows] = atoms[name]
+    for array in arrays.values():
+        array.flush()
+
+    stat = os.stat(path)
+    meta = {'version': CACHE_VERSION, 'columns': columns or [],
+            'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+    with open(os.path.join(path_cache, 'meta.json'), 'w') as foo:
+        json.dump(meta, foo, indent=1)
+    return path_cache
+
+class CachedFrame:
+    """
+    A frame of a dump cache with the interface of DumpFrame for reading; the
+    columns are memory-mapped views of the cache.
+    """
+
+    def __init__(self, cache, iframe):
+        self.cache = cache
+        self.iframe = iframe
+        self.timestep = int(cache.timestep[iframe])
+        self.n_atom = int(cache.n_atom[iframe])
+        self.columns = cache.columns
+        self.box = cache.box[iframe]
+        self._rows = slice(int(cache.frame_start[iframe]), int(cache.frame_start[iframe + 1]))
+
+    def column(self, col):
+        """Returns a view of a column (index (0-based) or name) of the frame."""
+        if not isinstance(col, str):
+            col = self.columns[col]
+        return self.cache.arrays[col][self._rows]
+
+    def select_columns(self, cols):
+        """Returns a structured array with the selected columns of the frame."""
+        names = [col if isinstance(col, str) else self.columns[col] for col in cols]
+        atoms = np.empty(self.n_atom, dtype=column_dtype(names))
+        for name in names:
+            atoms[name] = self.column(name)
+        return atoms
+
+    @property
+    def atoms(self):
+        """Structured array with all columns of the frame."""
+        return self.select_columns(self.columns)
+
+class DumpCache:
+    """
+    Memory-mapped columnar cache of a dump file (see write_cache).
+
+    Attributes:
+        columns (list): Names of the dump columns.
+        timestep, n_atom, box, frame_start (numpy.ndarray): Per frame arrays.
+        arrays (dict): Memory-mapped array of each column over all frames.
+    """
+
+    def __init__(self, path_cache):
+        with open(os.path.join(path_cache, 'meta.json')) as foo:
+            self.meta = json.load(foo)
+        self.columns = self.meta['columns']
+        load = lambda name: np.load(os.path.join(path_cache, name + '.npy'), mmap_mode='r')
+        self.timestep = load('timestep')
+        self.n_atom = load('n_atom')
+        self.box = load('box')
+        self.frame_start = load('frame_start')
+        self.arrays = {name: load(name) for name in self.columns}
+
+    def __len__(self):
+        return len(self.timestep)
+
+    def __getitem__(self, iframe):
+        return CachedFrame(self, iframe)
+
+    def __iter__(self):
+        for iframe in range(len(self)):
+            yield CachedFrame(self, iframe)
+
+def read_cache(path, path_cache=None):
+    """
+    Opens the cache of a dump file if it is up to date.
+
+    Args:
+        path (str): Path of the dump file.
+        path_cache (str): Path of the cache directory (default: path + '.bin').
+
+    Returns:
+        DumpCache: The cache or None if it is missing or older than the dump.
+    """
+    if path_cache is None:
+        path_cache = cache_path(path)
+    path_meta = os.path.join(path_cache, 'meta.json')
+    if not os.path.exists(path_meta):
+        return None
+    with open(path_meta) as foo:
+        meta = json.load(foo)
+    stat = os.stat(path)
+    if (meta.get('version') != CACHE_VERSION or meta['size'] != stat.st_size
+            or meta['mtime'] != stat.st_mtime_ns):
+        return None
+    return DumpCache(path_cache)
+
+def load_frames(path):
+    """
+    Iterates over the frames of a dump file, reading them from its binary
+    cache when an up-to-date one exists and parsing the text otherwise.
+
+    Args:
+        path (str): Path of the dump file.
+
+    Returns:
+        Iterable of CachedFrame or DumpFrame objects.
+    """
+    cache = read_cache(path)
+    if cache is not None:
+        return iter(cache)
+    return read_frames(path)
@@ -0,0 +1,557 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+import sys
+import os
+import io
+import mmap
+import gzip
+import lzma
+import numpy as np
+
+from follow import FollowReader, FOLLOW_INTERVAL
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Number of header lines of a lammps dump frame
+#   ITEM: TIMESTEP / step / ITEM: NUMBER OF ATOMS / n_atom /
+#   ITEM: BOX BOUNDS .. / 3 x box lines / ITEM: ATOMS ..
+N_HEADER_LINES = 9
+
+# Default size of the chunks read from the dump file (bytes)
+CHUNK_SIZE = 1 << 24
+
+# Lines gathered at once by write_permuted_lines
+GATHER_LINES = 1 << 16
+
+# Magic bytes and extensions of the supported compression formats
+COMPRESSION_MAGIC = {b'\x1f\x8b': 'gz', b'\xfd7zXZ\x00': 'xz', b'\x28\xb5\x2f\xfd': 'zst'}
+COMPRESSION_EXT = {'.gz': 'gz', '.xz': 'xz', '.zst': 'zst'}
+
+# Dump attributes stored as integers; everything else is stored as float
+INT_COLUMNS = {'id', 'mol', 'type', 'proc', 'procp1', 'ix', 'iy', 'iz'}
+# Dump attributes stored as strings
+STR_COLUMNS = {'element'}
+
+def column_dtype(columns):
+    """
+    Builds the structured dtype of the ATOMS block of a dump frame.
+
+    Args:
+        columns (list): Names of the dump columns (e.g., ['id', 'type', 'x']).
+
+    Returns:
+        numpy.dtype: Structured dtype with one field per column.
+    """
+    fields = []
+    for name in columns:
+        if name in INT_COLUMNS:
+            fields.append((name, np.int64))
+        elif name in STR_COLUMNS:
+            fields.append((name, 'U8'))
+        else:
+            fields.append((name, np.float64))
+    return np.dtype(fields)
+
+class ChunkReader:
+    """
+    Line reader over a binary file object that reads large chunks and keeps
+    the offsets of the newlines of the current chunk in a NumPy array, so that
+    a block of n lines is located with a single lookup instead of n readline()
+    calls.
+    """
+
+    def __init__(self, fobj, chunk_size=CHUNK_SIZE):
+        self.fobj = fobj
+        self.chunk_size = chunk_size
+        self.buf = b''
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+        self._nl = np.empty(0, dtype=np.int64)
+        self._inl = 0
+        self.line_offsets = None
+
+    def tell(self):
+        """Returns the absolute file offset of the next unread byte."""
+        return self.offset + self.pos
+
+    def _fill(self, size):
+        data = self.fobj.read(max(size, self.chunk_size))
+        if not data:
+            self.eof = True
+            return
+        # keep the unread tail and shift the newline offsets accordingly
+        tail = self.buf[self.pos:]
+        tail_nl = self._nl[self._inl:] - self.pos
+        new_nl = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 10) + len(tail)
+        self.offset += self.pos
+        self.buf = tail + data
+        self.pos = 0
+        self._nl = np.concatenate((tail_nl, new_nl))
+        self._inl = 0
+
+    def _advance(self, n):
+        # moves past the next n lines if they are complete
+        while len(self._nl) - self._inl < n and not self.eof:
+            self._fill(len(self.buf) - self.pos)
+        if len(self._nl) - self._inl < n:
+            return False
+        if n > 0:
+            self.pos = int(self._nl[self._inl + n - 1]) + 1
+            self._inl += n
+        return True
+
+    def _start(self, n):
+        # position of the next n lines in the buffer after any refill
+        while len(self._nl) - self._inl < n and not self.eof:
+            self._fill(len(self.buf) - self.pos)
+        return self.pos
+
+    def read_lines(self, n):
+        """
+        Reads the next n lines.
+
+        Args:
+            n (int): Number of lines.
+
+        Returns:
+            bytes: The lines including their newlines or None if the file
+            ends before n complete lines (the position is then unchanged).
+        """
+        start = self._start(n)
+        inl = self._inl
+        if not self._advance(n):
+            return None
+        # the line offsets of the lines read (see line_offsets)
+        self.line_offsets = np.concatenate(([0], self._nl[inl:inl + n] + 1 - start))
+        return self.buf[start:self.pos]
+
+    def skip_lines(self, n):
+        """
+        Skips the next n lines without copying them.
+
+        Args:
+            n (int): Number of lines.
+
+        Returns:
+            bool: False if the file ends before n complete lines (the
+            position is then unchanged).
+        """
+        return self._advance(n)
+
+class MmapReader:
+    """
+    Line reader over a memory-mapped file with the interface of ChunkReader.
+    The blocks are returned as memoryview slices of the mapping, so they can
+    be written to the output without being copied or decoded. The newlines
+    are located by scanning windows of the mapping with NumPy.
+    """
+
+    def __init__(self, fobj, window_size=CHUNK_SIZE):
+        size = os.fstat(fobj.fileno()).st_size
+        self.mm = mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.buf = memoryview(self.mm)
+        self.window_size = window_size
+        self.pos = 0
+        self.offset = 0
+        self._line_len = 64
+
+    def tell(self):
+        """Returns the absolute file offset of the next unread byte."""
+        return self.pos
+
+    def _find_end(self, n):
+        # offset just after the n-th newline from pos or -1
+        pos = self.pos
+        size = len(self.buf)
+        if n <= 0:
+            return pos
+        if n <= N_HEADER_LINES:
+            for ii in range(n):
+                pos = self.mm.find(b'\n', pos) + 1
+                if pos == 0:
+                    return -1
+            return pos
+        while pos < size:
+            count = min(size - pos, max(int(n*self._line_len*1.05) + 256, 4096),
+                        self.window_size)
+            window = np.frombuffer(self.buf[pos:pos+count], dtype=np.uint8)
+            nl = np.flatnonzero(window == 10)
+            if len(nl) >= n:
+                return pos + int(nl[n-1]) + 1
+            n -= len(nl)
+            pos += count
+        return -1
+
+    def _advance(self, n):
+        end = self._find_end(n)
+        if end < 0:
+            return False
+        if n > N_HEADER_LINES:
+            self._line_len = (end - self.pos) / n
+        self.pos = end
+        return True
+
+    def read_lines(self, n):
+        """
+        Reads the next n lines.
+
+        Args:
+            n (int): Number of lines.
+
+        Returns:
+            memoryview: The lines including their newlines or None if the file
+            ends before n complete lines (the position is then unchanged).
+        """
+        start = self.pos
+        if not self._advance(n):
+            return None
+        return self.buf[start:self.pos]
+
+    def skip_lines(self, n):
+        """
+        Skips the next n lines without copying them.
+
+        Args:
+            n (int): Number of lines.
+
+        Returns:
+            bool: False if the file ends before n complete lines (the
+            position is then unchanged).
+        """
+        return self._advance(n)
+
+def line_offsets(block):
+    """
+    Returns the offsets of the lines of a block.
+
+    Args:
+        block (bytes or memoryview): Lines including their newlines.
+
+    Returns:
+        numpy.ndarray: n_line+1 offsets; line ii spans offsets[ii]:offsets[ii+1].
+    """
+    nl = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+    return np.concatenate(([0], nl + 1))
+
+def write_lines(out, block, mask, offsets=None):
+    """
+    Writes the selected lines of a block. Consecutive selected lines are
+    written as a single slice of the block.
+
+    Args:
+        out: Binary file object.
+        block (bytes or memoryview): Lines including their newlines.
+        mask (numpy.ndarray): Boolean mask of the lines to be written.
+        offsets (numpy.ndarray): Line offsets of the block (see line_offsets).
+    """
+    if offsets is None:
+        offsets = line_offsets(block)
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    view = memoryview(block)
+    for first, last in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+        out.write(view[offsets[first]:offsets[last]])
+
+def write_permuted_lines(out, block, order, offsets=None):
+    """
+    Writes the lines of a block in the given order. The bytes of the lines
+    are gathered with one NumPy indexing operation per GATHER_LINES lines.
+
+    Args:
+        out: Binary file object.
+        block (bytes or memoryview): Lines including their newlines.
+        order (numpy.ndarray): Positions of the lines in the output order.
+        offsets (numpy.ndarray): Line offsets of the block (see line_offsets).
+    """
+    if offsets is None:
+        offsets = line_offsets(block)
+    data = np.frombuffer(block, dtype=np.uint8)
+    for start in range(0, len(order), GATHER_LINES):
+        rows = order[start:start + GATHER_LINES]
+        first = offsets[rows]
+        lengths = offsets[rows + 1] - first
+        ends = np.cumsum(lengths)
+        # byte k of the output comes from the first byte of its line plus
+        # its distance from the start of the line in the output
+        index = np.arange(ends[-1]) + np.repeat(first - (ends - lengths), lengths)
+        out.write(data[index].tobytes())
+
+class DumpFrame:
+    """
+    A single frame of a lammps dump file.
+
+    Attributes:
+        header (list): The 9 header lines (bytes, including newlines).
+        block (bytes or memoryview): The lines of the ATOMS section.
+        offset (int): Byte offset of the frame in the dump file.
+        line_offsets (numpy.ndarray): Offsets of the lines of the ATOMS
+            section (see line_offsets); computed on first use unless the
+            reader provides them.
+        timestep (int): Timestep of the frame.
+        n_atom (int): Number of atoms of the frame.
+        columns (list): Names of the columns of the ATOMS section.
+    """
+
+    def __init__(self, header, block, offset=0, offsets=None):
+        self.header = header
+        self.block = block
+        self.offset = offset
+        self._offsets = offsets
+        self.timestep = int(header[1])
+        self.n_atom = int(header[3])
+        self.columns = header[8].decode().split()[2:]
+        self._atoms = None
+
+    @property
+    def box(self):
+        """Box bounds as an array of shape (3, 2) or (3, 3) for triclinic boxes."""
+        return np.array([line.split() for line in self.header[5:8]], dtype=np.float64)
+
+    @property
+    def line_offsets(self):
+        if self._offsets is None:
+            self._offsets = line_offsets(self.block)
+        return self._offsets
+
+    @property
+    def lines(self):
+        """Lines of the ATOMS section (bytes, including newlines)."""
+        return bytes(self.block).splitlines(keepends=True)
+
+    @property
+    def atoms(self):
+        """Structured array of the ATOMS section with one field per column."""
+        if self._atoms is None:
+            dtype = column_dtype(self.columns)
+            if self.n_atom == 0:
+                self._atoms = np.empty(0, dtype=dtype)
+            else:
+                self._atoms = np.loadtxt(io.BytesIO(self.block), dtype=dtype,
+                                         ndmin=1, comments=None)
+        return self._atoms
+
+    def column(self, col, dtype=None):
+        """
+        Parses a single column of the ATOMS section.
+
+        Args:
+            col (int or str): Index (0-based) or name of the column.
+            dtype: If set, overrides the default dtype of the column (e.g.,
+                str for type labels).
+
+        Returns:
+            numpy.ndarray: The values of the column.
+        """
+        if isinstance(col, str):
+            col = self.columns.index(col)
+        if self._atoms is not None and dtype is None:
+            return self._atoms[self.columns[col]]
+        if dtype is None:
+            dtype = column_dtype([self.columns[col]])[0]
+        if self.n_atom == 0:
+            return np.empty(0, dtype=dtype)
+        return np.loadtxt(io.BytesIO(self.block), dtype=dtype, usecols=col,
+                          ndmin=1, comments=None)
+
+    def select_columns(self, cols):
+        """
+        Parses a subset of the columns of the ATOMS section.
+
+        Args:
+            cols (list): Indices (0-based) or names of the columns.
+
+        Returns:
+            numpy.ndarray: Structured array with one field per selected column.
+        """
+        cols = [self.columns.index(col) if isinstance(col, str) else col for col in cols]
+        names = [self.columns[col] for col in cols]
+        if self._atoms is not None:
+            return self._atoms[names]
+        dtype = column_dtype(names)
+        if self.n_atom == 0:
+            return np.empty(0, dtype=dtype)
+        return np.loadtxt(io.BytesIO(self.block), dtype=dtype, usecols=cols,
+                          ndmin=1, comments=None)
+
+    def header_bytes(self, n_atom=None):
+        """
+        Returns the header of the frame.
+
+        Args:
+            n_atom (int): If set, replaces the number of atoms of the header.
+
+        Returns:
+            bytes: The 9 header lines.
+        """
+        if n_atom is None:
+            return b''.join(self.header)
+        header = list(self.header)
+        header[3] = b'%d\n' % n_atom
+        return b''.join(header)
+
+    def raw(self):
+        """Returns the frame exactly as it appears in the dump file."""
+        return b''.join(self.header) + bytes(self.block)
+
+def _magic_compression(head):
+    for magic, kind in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return kind
+    return None
+
+def compression_of(path):
+    """
+    Returns the compression of a file ('gz', 'xz', 'zst' or None) from its
+    magic bytes or, for files that do not exist yet, from its extension.
+    """
+    if path == '-':
+        return None
+    if os.path.exists(path):
+        with open(path, 'rb') as foo:
+            return _magic_compression(foo.read(6))
+    return COMPRESSION_EXT.get(os.path.splitext(path)[1])
+
+def _wrap(raw, kind, mode, threads):
+    if kind is None:
+        return raw
+    if kind == 'gz':
+        return gzip.GzipFile(fileobj=raw, mode=mode)
+    if kind == 'xz':
+        return lzma.LZMAFile(raw, mode=mode)
+    if zstandard is None:
+        raise ImportError('the zstandard module is required for .zst files')
+    if 'r' in mode:
+        return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+    return zstandard.ZstdCompressor(threads=threads).stream_writer(raw, closefd=True)
+
+def open_dump(path, mode='rb', threads=-1):
+    """
+    Opens a dump file in binary mode with transparent (de)compression.
+
+    When reading, gzip, xz and zstd files are detected from their magic
+    bytes; when writing, the compression is set by the extension (.gz, .xz
+    or .zst). zstd requires the zstandard module and compresses with
+    multiple threads. '-' refers to the standard streams, which are left
+    open when the returned file object is closed.
+
+    Args:
+        path (str): Path of the dump file or '-'.
+        mode (str): 'rb', 'wb' or 'ab'.
+        threads (int): Number of zstd compression threads (-1: all cores).
+
+    Returns:
+        Binary file object.
+    """
+    if path == '-':
+        if 'r' in mode:
+            raw = open(sys.stdin.fileno(), 'rb', closefd=False)
+            return _wrap(raw, _magic_compression(raw.peek(6)[:6]), 'rb', threads)
+        sys.stdout.flush()
+        return open(sys.stdout.fileno(), 'wb', closefd=False)
+    if 'r' in mode:
+        kind = compression_of(path)
+    else:
+        kind = COMPRESSION_EXT.get(os.path.splitext(path)[1])
+    if kind is None:
+        return open(path, mode)
+    if kind == 'gz':
+        return gzip.open(path, mode, compresslevel=6)
+    if kind == 'xz':
+        return lzma.open(path, mode)
+    return _wrap(open(path, mode), kind, mode, threads)
+
+def copy_bytes(fin, fout, offset, nbytes, chunk_size=CHUNK_SIZE):
+    """
+    Copies a byte range of a file to another file without decoding it.
+
+    Args:
+        fin: Binary file object of the source (must support seek).
+        fout: Binary file object of the destination.
+        offset (int): Byte offset of the range.
+        nbytes (int): Size of the range.
+        chunk_size (int): Size of the chunks copied at once (bytes).
+    """
+    fin.seek(offset)
+    while nbytes > 0:
+        data = fin.read(min(nbytes, chunk_size))
+        if not data:
+            break
+        fout.write(data)
+        nbytes -= len(data)
+
+def check_follow(path):
+    """Raises ValueError if a dump file cannot be followed while it grows."""
+    if path != '-' and compression_of(path) is not None:
+        raise ValueError('compressed dump files cannot be followed: %s' % path)
+
+def read_frames(fobj, chunk_size=CHUNK_SIZE, use_mmap=False, follow=False,
+                interval=FOLLOW_INTERVAL, timeout=0, on_wait=None):
+    """
+    Generator over the frames of a lammps dump file.
+
+    Args:
+        fobj: Binary file object or path of the dump file.
+        chunk_size (int): Size of the chunks read from the file (bytes).
+        use_mmap (bool): Memory-map the file; the ATOMS blocks of the frames
+            are then memoryview slices of the mapping.
+        follow (bool): Wait for frames appended to the file by a running
+            simulation (see FollowReader); use_mmap is then ignored.
+        interval (float): Time between checks for appended frames (seconds).
+        timeout (float): Stop following after the file did not grow for this
+            long (seconds); 0 follows indefinitely.
+        on_wait: Function called before each wait (e.g., out.flush).
+
+    Yields:
+        DumpFrame: The complete frames of the file. A truncated trailing frame
+        (e.g., from a running simulation) is not yielded.
+    """
+    if isinstance(fobj, str):
+        if follow:
+            check_follow(fobj)
+        # compressed files cannot be memory-mapped
+        use_mmap = use_mmap and not follow and fobj != '-' and compression_of(fobj) is None
+        with open_dump(fobj) as foo:
+            yield from read_frames(foo, chunk_size, use_mmap, follow, interval, timeout, on_wait)
+        return
+
+    if use_mmap and not follow:
+        reader = MmapReader(fobj, chunk_size)
+    else:
+        reader = ChunkReader(fobj, chunk_size)
+    if follow:
+        reader = FollowReader(reader, interval, timeout, on_wait)
+    while True:
+        offset = reader.tell()
+        header = reader.read_lines(N_HEADER_LINES)
+        if header is None:
+            break
+        header = bytes(header).splitlines(keepends=True)
+        block = reader.read_lines(int(header[3]))
+        if block is None:
+            break
+        yield DumpFrame(header, block, offset, getattr(reader, 'line_offsets', None))
@@ -0,0 +1,119 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+import time
+
+# Default interval between checks for appended data (seconds)
+FOLLOW_INTERVAL = 5.0
+
+class FollowReader:
+    """
+    Wraps a ChunkReader of a file that is still being written (e.g., the dump
+    file of a running simulation). When the requested lines are not complete
+    yet, it waits for the file to grow instead of stopping. The incomplete
+    lines stay in the buffer of the wrapped reader, so only the appended bytes
+    are read after each wait.
+
+    Attributes:
+        reader (ChunkReader): The wrapped reader.
+        interval (float): Time between checks for appended data (seconds).
+        timeout (float): Stop after the file did not grow for this long
+            (seconds); 0 waits indefinitely.
+        on_wait: Function called before each wait (e.g., flushing the output).
+    """
+
+    def __init__(self, reader, interval=FOLLOW_INTERVAL, timeout=0, on_wait=None):
+        self.reader = reader
+        self.interval = interval
+        self.timeout = timeout
+        self.on_wait = on_wait
+
+    def tell(self):
+        return self.reader.tell()
+
+    def _read_size(self):
+        # bytes read from the file so far (the buffer holds the partial lines)
+        return self.reader.offset + len(self.reader.buf)
+
+    def _wait(self, read, n):
+        waited = 0.0
+        size = self._read_size()
+        while True:
+            result = read(n)
+            if result is not None and result is not False:
+                return result
+            if self._read_size() > size:
+                # the file grew, so the timeout restarts
+                size = self._read_size()
+                waited = 0.0
+            if self.timeout > 0 and waited >= self.timeout:
+                return result
+            if self.on_wait is not None:
+                self.on_wait()
+            time.sleep(self.interval)
+            waited += self.interval
+            # look past the end of file again on the next read
+            self.reader.eof = False
+
+    def read_lines(self, n):
+        """Reads the next n lines, waiting until they are complete."""
+        return self._wait(self.reader.read_lines, n)
+
+    def skip_lines(self, n):
+        """Skips the next n lines, waiting until they are complete."""
+        return self._wait(self.reader.skip_lines, n)
+
+def follow_lines(fobj, interval=FOLLOW_INTERVAL, timeout=0, on_wait=None):
+    """
+    Generator over the complete lines of a text file that is still being
+    written (e.g., log.lammps). A partial trailing line is kept until its
+    newline is appended.
+
+    Args:
+        fobj: Text file object.
+        interval (float): Time between checks for appended data (seconds).
+        timeout (float): Stop after the file did not grow for this long
+            (seconds); 0 waits indefinitely.
+        on_wait: Function called before each wait.
+
+    Yields:
+        str: The lines including their newlines.
+    """
+    partial = ''
+    waited = 0.0
+    while True:
+        line = fobj.readline()
+        if line:
+            partial += line
+            waited = 0.0
+            if partial.endswith('\n'):
+                yield partial
+                partial = ''
+            continue
+        if timeout > 0 and waited >= timeout:
+            return
+        if on_wait is not None:
+            on_wait()
+        time.sleep(interval)
+        waited += interval
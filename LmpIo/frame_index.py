@@ -0,0 +1,317 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+import os
+import numpy as np
+
+from dump_io import ChunkReader, DumpFrame, N_HEADER_LINES, open_dump, compression_of
+
+# Extension of the index sidecar file (e.g., dump.lammpstrj.idx)
+INDEX_EXT = '.idx'
+
+# Magic bytes and version of the index sidecar file
+INDEX_MAGIC = b'LMPIDX\x00\x01'
+
+# Sidecar header: magic, indexed bytes, size and mtime of the dump, frames
+INDEX_HEADER = np.dtype([('magic', 'S8'), ('indexed', '<i8'), ('size', '<i8'),
+                         ('mtime', '<i8'), ('n_frame', '<i8')])
+
+# One record per frame; box rows hold (lo, hi, tilt) of x, y and z
+INDEX_RECORD = np.dtype([('offset', '<i8'), ('nbytes', '<i8'), ('timestep', '<i8'),
+                         ('n_atom', '<i8'), ('box', '<f8', (3, 3))])
+
+def write_sidecar(path, path_idx, magic, indexed, records):
+    """
+    Writes an index sidecar: an INDEX_HEADER holding the magic bytes, the
+    indexed bytes and the size and modification time of the indexed file,
+    followed by the records.
+    """
+    stat = os.stat(path)
+    head = np.array([(magic, indexed, stat.st_size, stat.st_mtime_ns, len(records))],
+                    dtype=INDEX_HEADER)
+    with open(path_idx, 'wb') as foo:
+        foo.write(head.tobytes())
+        foo.write(records.tobytes())
+
+def read_sidecar(path, path_idx, magic, dtype):
+    """
+    Reads an index sidecar written by write_sidecar.
+
+    Args:
+        path (str): Path of the indexed file.
+        path_idx (str): Path of the sidecar.
+        magic (bytes): Expected magic bytes (kind and version of the index).
+        dtype (numpy.dtype): Dtype of the records.
+
+    Returns:
+        tuple: The records, the indexed bytes and the (size, mtime) of the
+        indexed file when the sidecar was written, or None if the sidecar is
+        missing, has another format or the indexed file was truncated since
+        it was written.
+    """
+    if not os.path.exists(path_idx):
+        return None
+    with open(path_idx, 'rb') as foo:
+        head = np.frombuffer(foo.read(INDEX_HEADER.itemsize), dtype=INDEX_HEADER)
+        if len(head) != 1 or head['magic'][0] != magic:
+            return None
+        records = np.fromfile(foo, dtype=dtype, count=int(head['n_frame'][0]))
+    if len(records) != int(head['n_frame'][0]):
+        return None
+    stat = os.stat(path)
+    if compression_of(path) is not None:
+        # the offsets refer to the decompressed stream; any change of the
+        # compressed file invalidates them
+        if stat.st_size != int(head['size'][0]) or stat.st_mtime_ns != int(head['mtime'][0]):
+            return None
+    elif stat.st_size < int(head['indexed'][0]):
+        return None
+    return records, int(head['indexed'][0]), (int(head['size'][0]), int(head['mtime'][0]))
+
+def is_current(path, index):
+    """
+    Checks an index read from a sidecar against the indexed file. If the
+    size or the modification time of the file changed since the sidecar was
+    written, only appended records may be indexed incrementally: the first
+    and the last indexed records must still match the file (see the matches
+    method of the index), so that a rewritten file is not read with a stale
+    index. The sidecars of compressed files are checked by read_sidecar.
+
+    Args:
+        path (str): Path of the indexed file.
+        index: FrameIndex or ProfileIndex holding the stamp of the sidecar.
+
+    Returns:
+        bool: True if the index can be reused.
+    """
+    if not len(index) or compression_of(path) is not None:
+        return True
+    stat = os.stat(path)
+    if index.stamp == (stat.st_size, stat.st_mtime_ns):
+        return True
+    with open(path, 'rb') as fobj:
+        return index.matches(fobj)
+
+def parse_box(lines):
+    """
+    Parses the three box lines of a dump header.
+
+    Args:
+        lines (list): The box lines ('lo hi' or 'lo hi tilt').
+
+    Returns:
+        numpy.ndarray: Array of shape (3, 3) holding lo, hi and tilt of each
+        dimension; the tilt is zero for orthogonal boxes.
+    """
+    box = np.zeros((3, 3))
+    for ii, line in enumerate(lines):
+        vals = line.split()
+        box[ii, :len(vals)] = [float(val) for val in vals[:3]]
+    return box
+
+def scan_frames(fobj, offset=0, records=None):
+    """
+    Scans the headers of a dump file and skips over the atom lines.
+
+    Args:
+        fobj: Binary file object of the dump file.
+        offset (int): Byte offset of the first frame to be scanned.
+        records (list): If set, the records are appended to this list.
+
+    Returns:
+        tuple: The list of records (offset, nbytes, timestep, n_atom, box) and
+        the byte offset just after the last complete frame.
+    """
+    if records is None:
+        records = []
+    fobj.seek(offset)
+    reader = ChunkReader(fobj)
+    reader.offset = offset
+    end = offset
+    while True:
+        start = reader.tell()
+        header = reader.read_lines(N_HEADER_LINES)
+        if header is None:
+            break
+        header = header.split(b'\n')
+        n_atom = int(header[3])
+        if not reader.skip_lines(n_atom):
+            break
+        end = reader.tell()
+        records.append((start, end - start, int(header[1]), n_atom, parse_box(header[5:8])))
+    return records, end
+
+class FrameIndex:
+    """
+    Byte-offset index of the frames of a lammps dump file.
+
+    Attributes:
+        path (str): Path of the dump file.
+        records (numpy.ndarray): One INDEX_RECORD per complete frame.
+        indexed (int): Byte offset just after the last indexed frame.
+        stamp (tuple): Size and mtime (ns) of the dump file when the sidecar
+            was written or None.
+    """
+
+    def __init__(self, path, records, indexed, stamp=None):
+        self.path = path
+        self.records = records
+        self.indexed = indexed
+        self.stamp = stamp
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def timesteps(self):
+        return self.records['timestep']
+
+    @property
+    def n_atoms(self):
+        return self.records['n_atom']
+
+    def find(self, timestep):
+        """
+        Returns the position of the (first) frame with the given timestep or
+        -1 if the timestep is not in the index.
+        """
+        hits = np.flatnonzero(self.records['timestep'] == timestep)
+        return int(hits[0]) if len(hits) else -1
+
+    def read_raw(self, fobj, iframe):
+        """Reads the bytes of frame iframe from an open binary file object."""
+        rec = self.records[iframe]
+        fobj.seek(int(rec['offset']))
+        return fobj.read(int(rec['nbytes']))
+
+    def read_frame(self, fobj, iframe):
+        """Reads frame iframe from an open binary file object as a DumpFrame."""
+        raw = self.read_raw(fobj, iframe)
+        lines = raw.split(b'\n', N_HEADER_LINES)
+        header = [line + b'\n' for line in lines[:N_HEADER_LINES]]
+        return DumpFrame(header, lines[N_HEADER_LINES], int(self.records[iframe]['offset']))
+
+    def matches(self, fobj):
+        """
+        Checks that the first and the last indexed frames of an open binary
+        file object still start at their offsets with the indexed timestep
+        and number of atoms.
+        """
+        for iframe in sorted({0, len(self) - 1}):
+            rec = self.records[iframe]
+            fobj.seek(int(rec['offset']))
+            lines = [fobj.readline().strip() for _ in range(4)]
+            if lines[0] != b'ITEM: TIMESTEP' or lines[2] != b'ITEM: NUMBER OF ATOMS':
+                return False
+            try:
+                if int(lines[1]) != rec['timestep'] or int(lines[3]) != rec['n_atom']:
+                    return False
+            except ValueError:
+                return False
+        return True
+
+    def update(self):
+        """
+        Indexes the frames appended to the dump file since the last update.
+
+        Returns:
+            int: The number of new frames.
+        """
+        with open_dump(self.path) as fobj:
+            records, self.indexed = scan_frames(fobj, self.indexed)
+        if records:
+            self.records = np.concatenate((self.records, np.array(records, dtype=INDEX_RECORD)))
+        return len(records)
+
+    def save(self, path_idx=None):
+        """Writes the index to the sidecar file (default: path + '.idx')."""
+        if path_idx is None:
+            path_idx = self.path + INDEX_EXT
+        write_sidecar(self.path, path_idx, INDEX_MAGIC, self.indexed, self.records)
+
+def build_index(path):
+    """
+    Indexes a dump file in one pass.
+
+    Args:
+        path (str): Path of the dump file.
+
+    Returns:
+        FrameIndex: The index of the complete frames of the file.
+    """
+    with open_dump(path) as fobj:
+        records, indexed = scan_frames(fobj)
+    return FrameIndex(path, np.array(records, dtype=INDEX_RECORD), indexed)
+
+def read_index(path, path_idx=None):
+    """
+    Reads the sidecar index of a dump file.
+
+    Args:
+        path (str): Path of the dump file.
+        path_idx (str): Path of the sidecar (default: path + '.idx').
+
+    Returns:
+        FrameIndex: The stored index or None if the sidecar is missing, has an
+        unknown format or the dump file was truncated since it was written.
+    """
+    if path_idx is None:
+        path_idx = path + INDEX_EXT
+    sidecar = read_sidecar(path, path_idx, INDEX_MAGIC, INDEX_RECORD)
+    if sidecar is None:
+        return None
+    return FrameIndex(path, *sidecar)
+
+def load_index(path, save=True):
+    """
+    Returns an up-to-date index of a dump file.
+
+    The sidecar is reused when it is valid; frames appended to the dump file
+    since it was written are indexed incrementally. If the size or the
+    modification time of the dump file changed since then, the first and the
+    last indexed frames are checked against the file, so that a rewritten
+    file is not read with a stale index. Otherwise the file is indexed from
+    scratch. The offsets of compressed dump files refer to the
+    decompressed stream, so seeking in them requires decompression.
+
+    Args:
+        path (str): Path of the dump file.
+        save (bool): Write the sidecar if it was created or updated.
+
+    Returns:
+        FrameIndex: The index of the complete frames of the file.
+    """
+    index = read_index(path)
+    compressed = compression_of(path) is not None
+    if index is not None and not is_current(path, index):
+        index = None
+    if index is None:
+        index = build_index(path)
+        if save:
+            index.save()
+        return index
+    stat = os.stat(path)
+    if not compressed and stat.st_size != index.indexed and index.update() and save:
+        index.save()
+    return index
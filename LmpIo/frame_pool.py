@@ -0,0 +1,89 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+
+import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Frames are sent to the workers in batches of at least this size (bytes)
+BATCH_BYTES = 1 << 22
+
+def _transform_batch(transform, batch):
+    out = io.BytesIO()
+    for frame in batch:
+        transform(frame, out)
+    return out.getvalue()
+
+def _batches(frames, batch_bytes):
+    batch = []
+    size = 0
+    for frame in frames:
+        if isinstance(frame.block, memoryview):
+            frame.block = bytes(frame.block)
+        batch.append(frame)
+        size += len(frame.block)
+        if size >= batch_bytes:
+            yield batch
+            batch = []
+            size = 0
+    if batch:
+        yield batch
+
+def write_frames(frames, transform, out, workers=1, batch_bytes=BATCH_BYTES, max_pending=None):
+    """
+    Applies a transformation to each frame and writes the results in the
+    original frame order.
+
+    With more than one worker the frames are grouped in batches and
+    transformed by a pool of processes, while the results are written by
+    the calling process as soon as the preceding batches are done. At most
+    max_pending batches are in flight, which bounds the memory use.
+
+    Args:
+        frames: Iterable of DumpFrame objects (e.g., read_frames(path)).
+        transform: Function transform(frame, out) writing the transformed
+            frame to the binary file object out. It must be picklable (a
+            module-level function or a functools.partial of one).
+        out: Binary file object.
+        workers (int): Number of worker processes.
+        batch_bytes (int): Minimum size of the batches sent to the workers.
+        max_pending (int): Maximum number of batches in flight (default:
+            2 x workers).
+    """
+    if workers <= 1:
+        for frame in frames:
+            transform(frame, out)
+        return
+
+    if max_pending is None:
+        max_pending = 2 * workers
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in _batches(frames, batch_bytes):
+            pending.append(pool.submit(_transform_batch, transform, batch))
+            if len(pending) >= max_pending:
+                out.write(pending.popleft().result())
+        while pending:
+            out.write(pending.popleft().result())
@@ -0,0 +1,211 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+import os
+import numpy as np
+
+from dump_io import ChunkReader, open_dump, compression_of
+from frame_index import INDEX_EXT, write_sidecar, read_sidecar, is_current
+
+# Magic bytes and version of the index sidecar of profile files
+PROFILE_MAGIC = b'LMPPRF\x00\x01'
+
+# One record per block: byte range, timestep and number of rows (chunks)
+PROFILE_RECORD = np.dtype([('offset', '<i8'), ('nbytes', '<i8'), ('timestep', '<i8'),
+                           ('n_row', '<i8')])
+
+def scan_blocks(fobj, offset=0, records=None):
+    """
+    Scans the block headers of a profile file (output of fix ave/chunk) and
+    skips over the rows. Each block starts with a line 'timestep n_row ..'
+    followed by n_row rows; the comment lines at the top of the file are
+    skipped.
+
+    Args:
+        fobj: Binary file object of the profile file.
+        offset (int): Byte offset of the first block to be scanned.
+        records (list): If set, the records are appended to this list.
+
+    Returns:
+        tuple: The list of records (offset, nbytes, timestep, n_row) and the
+        byte offset just after the last complete block.
+    """
+    if records is None:
+        records = []
+    fobj.seek(offset)
+    reader = ChunkReader(fobj)
+    reader.offset = offset
+    end = offset
+    while True:
+        start = reader.tell()
+        line = reader.read_lines(1)
+        if line is None:
+            break
+        if line.startswith(b'#'):
+            end = reader.tell()
+            continue
+        vals = line.split()
+        n_row = int(vals[1])
+        if not reader.skip_lines(n_row):
+            break
+        end = reader.tell()
+        records.append((start, end - start, int(vals[0]), n_row))
+    return records, end
+
+class ProfileIndex:
+    """
+    Byte-offset index of the blocks of a profile file.
+
+    Attributes:
+        path (str): Path of the profile file.
+        records (numpy.ndarray): One PROFILE_RECORD per complete block.
+        indexed (int): Byte offset just after the last indexed block.
+        stamp (tuple): Size and mtime (ns) of the profile file when the
+            sidecar was written or None.
+    """
+
+    def __init__(self, path, records, indexed, stamp=None):
+        self.path = path
+        self.records = records
+        self.indexed = indexed
+        self.stamp = stamp
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def timesteps(self):
+        return self.records['timestep']
+
+    def select(self, tmin=None, tmax=None, every=1):
+        """
+        Returns the positions of the blocks with tmin <= timestep <= tmax;
+        of these, the 1st, (every+1)th, (2*every+1)th, .. are kept.
+        """
+        keep = np.ones(len(self.records), dtype=bool)
+        if tmin is not None:
+            keep &= self.timesteps >= tmin
+        if tmax is not None:
+            keep &= self.timesteps <= tmax
+        return np.flatnonzero(keep)[::every]
+
+    def read_raw(self, fobj, iblocks):
+        """
+        Reads the bytes of the given blocks from an open binary file object;
+        runs of adjacent blocks are read with a single seek and read.
+        """
+        recs = self.records[iblocks]
+        if len(recs) == 0:
+            return b''
+        # a run starts where a block does not follow the previous one
+        breaks = np.flatnonzero(recs['offset'][1:] != (recs['offset'] + recs['nbytes'])[:-1]) + 1
+        parts = []
+        for run in np.split(np.arange(len(recs)), breaks):
+            fobj.seek(int(recs['offset'][run[0]]))
+            parts.append(fobj.read(int(recs['offset'][run[-1]] + recs['nbytes'][run[-1]]
+                                       - recs['offset'][run[0]])))
+        return b''.join(parts)
+
+    def matches(self, fobj):
+        """
+        Checks that the first and the last indexed blocks of an open binary
+        file object still start at their offsets with the indexed timestep
+        and number of rows.
+        """
+        for iblock in sorted({0, len(self) - 1}):
+            rec = self.records[iblock]
+            fobj.seek(int(rec['offset']))
+            vals = fobj.readline().split()
+            try:
+                if len(vals) < 2 or int(vals[0]) != rec['timestep'] or int(vals[1]) != rec['n_row']:
+                    return False
+            except ValueError:
+                return False
+        return True
+
+    def update(self):
+        """
+        Indexes the blocks appended to the profile file since the last update.
+
+        Returns:
+            int: The number of new blocks.
+        """
+        with open_dump(self.path) as fobj:
+            records, self.indexed = scan_blocks(fobj, self.indexed)
+        if records:
+            self.records = np.concatenate((self.records, np.array(records, dtype=PROFILE_RECORD)))
+        return len(records)
+
+    def save(self, path_idx=None):
+        """Writes the index to the sidecar file (default: path + '.idx')."""
+        if path_idx is None:
+            path_idx = self.path + INDEX_EXT
+        write_sidecar(self.path, path_idx, PROFILE_MAGIC, self.indexed, self.records)
+
+def build_profile_index(path):
+    """Indexes a profile file in one pass."""
+    with open_dump(path) as fobj:
+        records, indexed = scan_blocks(fobj)
+    return ProfileIndex(path, np.array(records, dtype=PROFILE_RECORD), indexed)
+
+def read_profile_index(path, path_idx=None):
+    """
+    Reads the sidecar index of a profile file; returns None if it is
+    missing, has another format or the profile file was truncated.
+    """
+    if path_idx is None:
+        path_idx = path + INDEX_EXT
+    sidecar = read_sidecar(path, path_idx, PROFILE_MAGIC, PROFILE_RECORD)
+    if sidecar is None:
+        return None
+    return ProfileIndex(path, *sidecar)
+
+def load_profile_index(path, save=True):
+    """
+    Returns an up-to-date index of a profile file.
+
+    The sidecar is reused when it is valid and extended with the blocks
+    appended to the profile file since it was written. If the profile file
+    changed otherwise (see frame_index.is_current), or the sidecar is not
+    valid, the file is indexed from scratch.
+
+    Args:
+        path (str): Path of the profile file.
+        save (bool): Write the sidecar if it was created or updated.
+
+    Returns:
+        ProfileIndex: The index of the complete blocks of the file.
+    """
+    index = read_profile_index(path)
+    compressed = compression_of(path) is not None
+    if index is not None and not is_current(path, index):
+        index = None
+    if index is None:
+        index = build_profile_index(path)
+        if save:
+            index.save()
+        return index
+    if not compressed and os.stat(path).st_size != index.indexed and index.update() and save:
+        index.save()
+    return index
@@ -0,0 +1,236 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+import numpy as np
+
+def block_average(data):
+    """
+    Error of the mean of correlated samples by block averaging (Flyvbjerg
+    and Petersen, J. Chem. Phys. 91, 461 (1989)).
+
+    The samples are averaged pairwise repeatedly; at level l the blocks hold
+    2^l samples and the standard error of the mean is estimated from the
+    variance of the block averages. Each level costs a single NumPy reduction.
+
+    Args:
+        data (numpy.ndarray): The samples.
+
+    Returns:
+        tuple: Arrays with the block size, the number of blocks, the error
+        estimate and its uncertainty at each level (levels with at least two
+        blocks).
+    """
+    blocks = np.asarray(data, dtype=np.float64)
+    sizes, counts, errs, errs_err = [], [], [], []
+    size = 1
+    while len(blocks) >= 2:
+        n = len(blocks)
+        err = np.sqrt(np.var(blocks) / (n - 1))
+        sizes.append(size)
+        counts.append(n)
+        errs.append(err)
+        errs_err.append(err / np.sqrt(2.0 * (n - 1)))
+        # pairwise averages; an odd trailing block is dropped
+        blocks = 0.5 * (blocks[0:n - n % 2:2] + blocks[1:n - n % 2:2])
+        size *= 2
+    return np.array(sizes), np.array(counts), np.array(errs), np.array(errs_err)
+
+def optimal_block(sizes, errs, n_sample):
+    """
+    Returns the level of the block averaging whose error estimate is taken
+    as the error of the mean: the smallest block size B for which
+    B^3 > 2 N (err_B/err_1)^4 (Lee et al., Phys. Rev. E 83, 066706 (2011)),
+    or the last level if no block size satisfies the criterion.
+    """
+    if len(sizes) == 0:
+        return -1
+    if errs[0] == 0:
+        return 0
+    ok = np.flatnonzero(sizes.astype(np.float64)**3 > 2.0 * n_sample * (errs / errs[0])**4)
+    return int(ok[0]) if len(ok) else len(sizes) - 1
+
+def autocorrelation(data):
+    """
+    Normalized autocorrelation function of the samples computed with FFTs in
+    O(N log N); the series is zero padded to avoid the periodic wrap-around.
+    """
+    x = np.asarray(data, dtype=np.float64)
+    n = len(x)
+    dx = x - x.mean()
+    nfft = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(dx, n=nfft)
+    acf = np.fft.irfft(spectrum * np.conj(spectrum), n=nfft)[:n]
+    if acf[0] == 0:
+        return np.zeros(n)
+    return acf / acf[0]
+
+def integrated_time(data, c=5.0):
+    """
+    Integrated autocorrelation time tau = 1 + 2 sum_k acf(k), in units of the
+    sampling interval, with the automatic window of Sokal: the sum runs up to
+    the smallest lag M with M >= c tau(M). The error of the mean is then
+    std * sqrt(tau / N).
+    """
+    acf = autocorrelation(data)
+    if len(acf) < 2:
+        return 1.0
+    taus = 2.0 * np.cumsum(acf) - 1.0
+    window = np.flatnonzero(np.arange(len(taus)) >= c * taus)
+    return float(taus[window[0]] if len(window) else taus[-1])
+
+def merge_moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """
+    Combines the weights (counts), means and sums of squared deviations of
+    two sets of samples (Chan et al.); the result is the same as adding the
+    samples one by one with Welford's algorithm. Works elementwise on arrays
+    and with zero weights.
+    """
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frac = np.where(n > 0, np.true_divide(n_b, n), 0.0)
+    return n, mean_a + delta * frac, m2_a + m2_b + delta * delta * n_a * frac
+
+class RunningStats:
+    """
+    Constant-memory statistics of a stream of samples, updated chunk by chunk.
+
+    The mean and variance are accumulated with the chunked form of Welford's
+    algorithm. The block averaging levels of block_average are accumulated
+    too: each level keeps the moments of its complete blocks and at most one
+    block awaiting its pair, so the memory grows as log2 of the number of
+    samples and the errors equal those of block_average. The histogram has
+    a fixed range; samples outside it are counted in n_under and n_over.
+    The state can be exported to (and restored from) a dict of plain Python
+    values, e.g. to continue the statistics when more samples are available.
+
+    Attributes:
+        levels (list): [count, mean, m2, pending block] of each level; level 0
+            holds the moments of the samples.
+        min, max (float): Extremes of the samples.
+        nbin (int): Number of histogram bins.
+        hist_range (tuple): (lo, hi) of the histogram or None.
+        hist (numpy.ndarray): Counts of the bins.
+        n_under, n_over (int): Samples below and above the histogram range.
+    """
+
+    def __init__(self, nbin=10, hist_range=None):
+        self.levels = []
+        self.min = np.inf
+        self.max = -np.inf
+        self.nbin = nbin
+        self.hist = np.zeros(nbin, dtype=np.int64)
+        self.n_under = 0
+        self.n_over = 0
+        self.hist_range = None
+        if hist_range is not None:
+            self.set_range(*hist_range)
+
+    @property
+    def n(self):
+        return self.levels[0][0] if self.levels else 0
+
+    @property
+    def mean(self):
+        return self.levels[0][1] if self.levels else np.nan
+
+    @property
+    def std(self):
+        """Standard deviation of the samples (ddof=1)."""
+        return np.sqrt(self.levels[0][2] / (self.n - 1)) if self.n > 1 else np.nan
+
+    @property
+    def err(self):
+        """Error of the mean for uncorrelated samples."""
+        return self.std / np.sqrt(self.n)
+
+    @property
+    def bin_edges(self):
+        lo, hi = self.hist_range
+        return lo + np.arange(self.nbin + 1) * ((hi - lo) / float(self.nbin))
+
+    def set_range(self, lo, hi):
+        """Sets the histogram range and resets the counts of the bins."""
+        self.hist_range = (float(lo), float(hi))
+        self.hist[:] = 0
+        self.n_under = 0
+        self.n_over = 0
+
+    def update_hist(self, data):
+        """Adds the samples to the histogram only."""
+        data = np.asarray(data, dtype=np.float64)
+        edges = self.bin_edges
+        self.hist += np.histogram(data, bins=edges)[0]
+        self.n_under += int(np.count_nonzero(data < edges[0]))
+        self.n_over += int(np.count_nonzero(data > edges[-1]))
+
+    def update(self, data):
+        """Adds a chunk of samples."""
+        blocks = np.asarray(data, dtype=np.float64)
+        if len(blocks) == 0:
+            return
+        self.min = min(self.min, float(blocks.min()))
+        self.max = max(self.max, float(blocks.max()))
+        if self.hist_range is not None:
+            self.update_hist(blocks)
+        ilevel = 0
+        while len(blocks):
+            if ilevel == len(self.levels):
+                self.levels.append([0, 0.0, 0.0, None])
+            level = self.levels[ilevel]
+            mean = float(blocks.mean())
+            n, mean, m2 = merge_moments(level[0], level[1], level[2],
+                                        len(blocks), mean, float(np.sum((blocks - mean)**2)))
+            level[:3] = int(n), float(mean), float(m2)
+            if level[3] is not None:
+                blocks = np.concatenate(([level[3]], blocks))
+            n = len(blocks)
+            level[3] = float(blocks[-1]) if n % 2 else None
+            blocks = 0.5 * (blocks[0:n - n % 2:2] + blocks[1:n - n % 2:2])
+            ilevel += 1
+
+    def block_average(self):
+        """Returns the levels of the block averaging as block_average does."""
+        levels = [level for level in self.levels if level[0] >= 2]
+        counts = np.array([level[0] for level in levels], dtype=np.int64)
+        errs = np.array([np.sqrt(level[2] / level[0] / (level[0] - 1)) for level in levels])
+        return 2**np.arange(len(levels)), counts, errs, errs / np.sqrt(2.0 * (counts - 1))
+
+    def state(self):
+        """Returns the state as a dict of plain Python values (e.g., for JSON)."""
+        return {'levels': [list(level) for level in self.levels], 'min': self.min,
+                'max': self.max, 'nbin': self.nbin, 'hist_range': self.hist_range,
+                'hist': self.hist.tolist(), 'n_under': self.n_under, 'n_over': self.n_over}
+
+    @classmethod
+    def from_state(cls, state):
+        """Restores the accumulator from the dict returned by state."""
+        stats = cls(state['nbin'], state['hist_range'])
+        stats.levels = [list(level) for level in state['levels']]
+        stats.min = state['min']
+        stats.max = state['max']
+        stats.hist = np.array(state['hist'], dtype=np.int64)
+        stats.n_under = state['n_under']
+        stats.n_over = state['n_over']
+        return stats
@@ -0,0 +1,293 @@
+###############################################################################
+# MIT License
+#
+# Copyright (c) 2026 ArisSgouros
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+###############################################################################
+
+import os
+import io
+import re
+import json
+import mmap
+import contextlib
+import numpy as np
+
+from dump_io import open_dump, compression_of
+
+# Extension of the cache directory of a log file (e.g., log.lammps.thermo)
+THERMO_CACHE_EXT = '.thermo'
+
+# Version of the cache layout
+THERMO_CACHE_VERSION = 1
+
+# Size of the chunks of rows parsed at once by ThermoStream
+THERMO_CHUNK_BYTES = 1 << 24
+
+# Lines matched at once by NUMERIC_LINES; the regex engine keeps state for
+# each repetition, so the memory of a match grows with the number of lines
+NUMERIC_LINES_MAX = 4096
+
+# Consecutive complete lines whose first token starts like a number
+NUMERIC_LINES = re.compile(rb'(?:[ \t]*[-+]?(?:\.?[0-9]|nan|inf)[^\n]*\n){0,%d}' % NUMERIC_LINES_MAX,
+                           re.IGNORECASE)
+
+class ThermoBlock:
+    """
+    The rows of a run block of a lammps log file (thermo output).
+
+    Attributes:
+        columns (list): Names of the thermo columns (e.g., ['Step', 'Temp']).
+        data (numpy.ndarray): Array of shape (n_row, n_col).
+        header_offset (int): Byte offset of the header line (-1 for the rows
+            of a block continued by ThermoStream).
+        start, end (int): Byte range of the rows in the log file.
+    """
+
+    def __init__(self, columns, data, header_offset, start, end):
+        self.columns = columns
+        self.data = data
+        self.header_offset = header_offset
+        self.start = start
+        self.end = end
+
+    def __len__(self):
+        return len(self.data)
+
+    def column(self, name):
+        """Returns the values of a thermo column."""
+        return self.data[:, self.columns.index(name)]
+
+def _block_end(buf, start, end_flag):
+    end = start
+    while True:
+        stop = NUMERIC_LINES.match(buf, end).end()
+        if stop == end:
+            break
+        end = stop
+    if end_flag is not None:
+        flag = buf.find(end_flag, start, end)
+        if flag >= 0:
+            end = buf.rfind(b'\n', 0, flag) + 1
+    return end
+
+def find_blocks(buf, header='Step', end_flag=None, offset=0):
+    """
+    Locates the run blocks of a log file.
+
+    A block starts after a line containing the header string and holds the
+    following lines whose first token is a number. It ends at the first other
+    line (e.g., 'Loop time of ..', a warning or an empty line), at a line
+    containing end_flag or at an incomplete trailing line.
+
+    Args:
+        buf: Contents of the log file (bytes or mmap).
+        header (str): Part of the header line of the blocks.
+        end_flag (str): If set, also ends the blocks at lines containing it.
+        offset (int): Byte offset from which the header lines are searched.
+
+    Yields:
+        tuple: The header line (str) and the byte offsets of the header and
+        of the start and end of the rows.
+    """
+    header = header.encode()
+    if end_flag is not None:
+        end_flag = end_flag.encode()
+    pos = offset
+    while True:
+        hit = buf.find(header, pos)
+        if hit < 0:
+            return
+        header_offset = buf.rfind(b'\n', 0, hit) + 1
+        start = buf.find(b'\n', hit) + 1
+        if start == 0:
+            return
+        end = _block_end(buf, start, end_flag)
+        yield bytes(buf[header_offset:start]).decode(), header_offset, start, end
+        pos = end
+
+def parse_block(buf, header_line, header_offset, start, end):
+    """Parses the rows of a block located by find_blocks to a ThermoBlock."""
+    columns = header_line.split()
+    if end > start:
+        data = np.loadtxt(io.BytesIO(buf[start:end]), ndmin=2, comments=None)
+    else:
+        data = np.empty((0, len(columns)))
+    return ThermoBlock(columns, data, header_offset, start, end)
+
+@contextlib.contextmanager
+def map_log(path):
+    """
+    Context manager giving the contents of a log file: compressed logs are
+    decompressed to memory (bytes) and plain ones are memory-mapped.
+    """
+    if compression_of(path) is not None:
+        with open_dump(path) as foo:
+            buf = foo.read()
+        yield buf
+        return
+    with open(path, 'rb') as foo:
+        if os.fstat(foo.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(foo.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
+
+def _read_log(path, header, end_flag):
+    with map_log(path) as buf:
+        return [parse_block(buf, *block) for block in find_blocks(buf, header, end_flag)]
+
+class ThermoStream:
+    """
+    Reads the thermo output of a log file in chunks of rows, so that the
+    memory use does not depend on the length of the run.
+
+    Iterating over the stream yields one ThermoBlock per chunk of rows (the
+    rows of a run block are split to chunks of about chunk_bytes bytes). The
+    stream keeps the byte offset up to which the log file has been read and
+    the columns of the run block open at that offset; a new stream created
+    with them reads only the rows appended to the log file since.
+    Compressed log files are decompressed to memory.
+
+    Attributes:
+        path (str): Path of the log file.
+        header (str): Part of the header line of the blocks.
+        end_flag (str): If set, also ends the blocks at lines containing it.
+        offset (int): Byte offset just after the last row read.
+        columns (list): Columns of the block which may be continued by rows
+            appended at offset or None.
+        chunk_bytes (int): Approximate size of the chunks of rows.
+    """
+
+    def __init__(self, path, header='Step', end_flag=None, offset=0, columns=None,
+                 chunk_bytes=THERMO_CHUNK_BYTES):
+        self.path = path
+        self.header = header
+        self.end_flag = end_flag
+        self.offset = offset
+        self.columns = columns
+        self.chunk_bytes = chunk_bytes
+
+    def _chunks(self, buf, header_offset, start, end):
+        pos = start
+        while pos < end:
+            cut = buf.find(b'\n', min(pos + self.chunk_bytes, end) - 1) + 1
+            block = parse_block(buf, ' '.join(self.columns), header_offset, pos, cut)
+            self.offset = pos = cut
+            yield block
+
+    def _close(self, buf, end):
+        self.offset = end
+        # a complete line after the rows ends the block for good
+        if buf.find(b'\n', end) >= 0:
+            self.columns = None
+
+    def __iter__(self):
+        end_flag = self.end_flag.encode() if self.end_flag is not None else None
+        with map_log(self.path) as buf:
+            if self.offset > len(buf):
+                raise ValueError('%s is shorter than the offset %d' % (self.path, self.offset))
+            if self.columns is not None:
+                # rows appended to the block open at offset
+                end = _block_end(buf, self.offset, end_flag)
+                yield from self._chunks(buf, -1, self.offset, end)
+                self._close(buf, end)
+            for header_line, header_offset, start, end in find_blocks(buf, self.header,
+                                                                      self.end_flag, self.offset):
+                self.columns = header_line.split()
+                yield from self._chunks(buf, header_offset, start, end)
+                self._close(buf, end)
+
+def thermo_cache_path(path):
+    """Returns the default path of the cache directory of a log file."""
+    return path + THERMO_CACHE_EXT
+
+def write_thermo_cache(path, blocks, header, end_flag=None, path_cache=None):
+    """
+    Stores the blocks of a log file to a directory of .npy files (one per
+    block) and meta.json, which holds the columns and byte ranges of the
+    blocks, the header and end_flag used and the size and modification time
+    of the log file.
+    """
+    if path_cache is None:
+        path_cache = thermo_cache_path(path)
+    os.makedirs(path_cache, exist_ok=True)
+    for iblock, block in enumerate(blocks):
+        np.save(os.path.join(path_cache, 'block_%d.npy' % iblock), block.data)
+    stat = os.stat(path)
+    meta = {'version': THERMO_CACHE_VERSION, 'header': header, 'end_flag': end_flag,
+            'size': stat.st_size, 'mtime': stat.st_mtime_ns,
+            'blocks': [{'columns': block.columns, 'header_offset': block.header_offset,
+                        'start': block.start, 'end': block.end} for block in blocks]}
+    with open(os.path.join(path_cache, 'meta.json'), 'w') as foo:
+        json.dump(meta, foo, indent=1)
+    return path_cache
+
+def read_thermo_cache(path, header, end_flag=None, path_cache=None):
+    """
+    Reads the cached blocks of a log file.
+
+    Returns:
+        list: The blocks (memory-mapped) or None if the cache is missing, was
+        written for another header or end_flag, or is older than the log.
+    """
+    if path_cache is None:
+        path_cache = thermo_cache_path(path)
+    path_meta = os.path.join(path_cache, 'meta.json')
+    if not os.path.exists(path_meta):
+        return None
+    with open(path_meta) as foo:
+        meta = json.load(foo)
+    stat = os.stat(path)
+    if (meta.get('version') != THERMO_CACHE_VERSION or meta['header'] != header
+            or meta['end_flag'] != end_flag or meta['size'] != stat.st_size
+            or meta['mtime'] != stat.st_mtime_ns):
+        return None
+    return [ThermoBlock(block['columns'],
+                        np.load(os.path.join(path_cache, 'block_%d.npy' % iblock), mmap_mode='r'),
+                        block['header_offset'], block['start'], block['end'])
+            for iblock, block in enumerate(meta['blocks'])]
+
+def read_thermo(path, header='Step', end_flag=None, cache=False):
+    """
+    Reads the thermo output of a lammps log file.
+
+    The run blocks are located with byte searches over the (memory-mapped)
+    file and the rows of each block are parsed at once with np.loadtxt.
+
+    Args:
+        path (str): Path of the log file (may be compressed).
+        header (str): Part of the header line of the blocks (e.g., 'Step' or
+            'Step Temp Press').
+        end_flag (str): If set, also ends the blocks at lines containing it.
+        cache (bool): Reuse the .npy cache of the log file (path + '.thermo')
+            if it is up to date and write it otherwise.
+
+    Returns:
+        list: One ThermoBlock per run block.
+    """
+    if cache:
+        blocks = read_thermo_cache(path, header, end_flag)
+        if blocks is not None:
+            return blocks
+    blocks = _read_log(path, header, end_flag)
+    if cache:
+        write_thermo_cache(path, blocks, header, end_flag)
+    return blocks
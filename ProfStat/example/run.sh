@@ -7,3 +7,6 @@ python ../prof_stat.py profile_sample -sum=1
 
 echo -e 'Test: process file profile_sample (export mean only)\n'
 python ../prof_stat.py profile_sample -sum=0 -std=0 -err=0 -density=0
+
+echo -e 'Test: process file profile_sample (every second frame)\n'
+python ../prof_stat.py profile_sample -read_every=2
@@ -26,16 +26,42 @@ import sys
 import argparse
 import os
 import math as m
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from stats import merge_moments
+from profile_index import build_profile_index, load_profile_index
 
 parser = argparse.ArgumentParser(description='Statistics of Lammps profiles')
 parser.add_argument('filename', type=str, help='Path of the profile file')
 parser.add_argument('-sum', type=int, default=0, help='Multiply the values with the weights')
 parser.add_argument('-read_every', type=int, default=1, help='Set the reading frequency')
+parser.add_argument('-tmin', type=int, default=None, help='Process the frames with timestep >= tmin')
+parser.add_argument('-tmax', type=int, default=None, help='Process the frames with timestep <= tmax')
+parser.add_argument('-index', type=int, default=0, help='Reuse (or create) the sidecar index of the frames (filename.idx)')
 parser.add_argument('-density', type=int, default=1, help='Calculate the density of each bin')
 parser.add_argument('-mean', type=int, default=1, help='Calculate the mean')
 parser.add_argument('-std', type=int, default=1, help='Calculate the std')
 parser.add_argument('-err', type=int, default=1, help='Calculate the standard error')
 
+# Bytes of the profile file parsed at once
+CHUNK_BYTES = 1 << 24
+
+def ReadFrames(data_file, index, iframes, n_bin, n_col):
+   # Yields arrays of shape (n_frame, 3 + n_bin*(3+n_col)) holding the frame
+   # header (timestep, number of bins, total count) and the bin rows of the
+   # selected frames. The frames are read by their byte offsets in batches
+   # of about CHUNK_BYTES, so the skipped ones are never read; every frame
+   # has the same number of tokens, so a batch is parsed at once and reshaped.
+   n_token = 3 + n_bin*(3+n_col)
+   # ends[k]: bytes of the first k selected frames
+   ends    = np.concatenate(([0], np.cumsum(index.records['nbytes'][iframes])))
+   start   = 0
+   while start < len(iframes):
+      stop   = max(int(np.searchsorted(ends, ends[start] + CHUNK_BYTES, side='right')) - 1, start + 1)
+      tokens = np.array(index.read_raw(data_file, iframes[start:stop]).split(), dtype=float)
+      yield tokens.reshape(stop - start, n_token)
+      start  = stop
 
 if __name__ == "__main__":
    args = parser.parse_args()
@@ -49,11 +75,12 @@ if __name__ == "__main__":
 
    print( 'File name     : ', filename)
    print( 'Read every    : ', read_every)
+   print( 'Timesteps     : ', args.tmin, args.tmax)
    print( 'Print density : ', print_density)
    print( 'Print mean    : ', print_mean)
    print( 'Print std     : ', print_std)
    print( 'Print err     : ', print_err)
-   print( 'Sum           : ', print_err)
+   print( 'Sum           : ', MultWeight)
 
    # Read the header and get the number of Columns and number of Bins
    data_file = open(filename, 'r')
@@ -78,56 +105,56 @@ if __name__ == "__main__":
 
    data_file.close()
 
-   prof_ave = [[0.0 for x in range(n_bin)] for y in range(n_col)]
-   prof_var = [[0.0 for x in range(n_bin)] for y in range(n_col)]
-   prof_dens = [0.0 for x in range(n_bin)]
-   prof_weight = [0 for x in range(n_bin)]
+   #
+   # Each bin of a frame holds n_count instances of the values (or, with
+   # -sum, one instance of n_count times the values). The frames of a chunk
+   # are reduced to the weight, mean and sum of squared deviations of each
+   # bin and column, which are merged to the running ones; the result is
+   # that of adding the instances one by one with Welford's algorithm.
+   #
+   prof_ave = np.zeros((n_bin, n_col))
+   prof_var = np.zeros((n_bin, n_col))
+   prof_dens = np.zeros(n_bin)
+   prof_weight = np.zeros(n_bin)
 
    n_frame=0
 
-   with open(sys.argv[1], 'r') as data_file:
-      # Skip the first three lines
-      data_file.readline()
-      data_file.readline()
-      data_file.readline()
-
-      while True:
-         # Skip frames
-         if (n_frame % read_every != 0):
-            for mm in range(n_bin+1):
-               data_file.readline(),
-
-         # Check if we reached end of file
-         line = data_file.readline()
-         if line == '': break
-
-         n_frame += 1
-         for mm in range(n_bin):
-            line = data_file.readline().split()
-            n_count = int(line[2])
-
-            # Append the instances per bin to the density profile
-            prof_dens[mm] += n_count
-
-            if MultWeight:
-               prof_weight[mm] += 1
-               for cc in range(n_col):
-                  x                 = n_count*float(line[cc+3])
-                  delta             = x - prof_ave[cc][mm]
-                  prof_ave[cc][mm] += delta/prof_weight[mm]
-                  delta2            = x - prof_ave[cc][mm]
-                  prof_var[cc][mm] += delta*delta2
-
-            if not MultWeight:
-               for ii in range(n_count):
-                  prof_weight[mm] += 1
-                  for cc in range(n_col):
-                     x                 = float(line[cc+3])
-                     delta             = x - prof_ave[cc][mm]
-                     prof_ave[cc][mm] += delta/prof_weight[mm]
-                     delta2            = x - prof_ave[cc][mm]
-                     prof_var[cc][mm] += delta*delta2
+   # Index the frames and select the ones within [tmin, tmax] and every
+   # read_every-th of them
+   index = load_profile_index(filename) if args.index else build_profile_index(filename)
+   if np.any(index.records['n_row'] != n_bin):
+      sys.exit("Error: the number of bins changes along the profile file")
+   iframes = index.select(args.tmin, args.tmax, read_every)
+
+   with open(filename, 'rb') as data_file:
+      for frames in ReadFrames(data_file, index, iframes, n_bin, n_col):
+         n_frame += len(frames)
+
+         rows    = frames[:, 3:].reshape(len(frames), n_bin, 3+n_col)
+         n_count = rows[:, :, 2]
+         values  = rows[:, :, 3:]
+
+         # Append the instances per bin to the density profile
+         prof_dens += n_count.sum(axis=0)
+
+         if MultWeight:
+            values = values*n_count[:, :, np.newaxis]
+            weight = np.ones_like(n_count)
+         else:
+            weight = n_count
+
+         w_chunk  = weight.sum(axis=0)[:, np.newaxis]
+         with np.errstate(divide='ignore', invalid='ignore'):
+            ave_chunk = np.where(w_chunk > 0, np.einsum('fb,fbc->bc', weight, values)/w_chunk, 0.0)
+         var_chunk = np.einsum('fb,fbc->bc', weight, (values - ave_chunk)**2)
+
+         weight_all, prof_ave, prof_var = merge_moments(prof_weight[:, np.newaxis], prof_ave, prof_var,
+                                                        w_chunk, ave_chunk, var_chunk)
+         prof_weight = weight_all[:, 0]
 
+   with np.errstate(divide='ignore', invalid='ignore'):
+      prof_std = np.sqrt(prof_var/(prof_weight[:, np.newaxis]-1))
+      prof_err = prof_std/np.sqrt(prof_weight[:, np.newaxis])
 
    print("%-16s " %("coord"), end='')
    print( "%-16s " %("weight"), end='')
@@ -152,15 +179,15 @@ if __name__ == "__main__":
       # Print the Averages
       if print_mean:
          for jj in range(n_col):
-            print( "%-16f " % (prof_ave[jj][ii]), end='')
+            print( "%-16f " % (prof_ave[ii][jj]), end='')
       # Print the STD
       if print_std and n_frame > 1:
          for jj in range(n_col):
-            print( "%-16f " % (m.sqrt(prof_var[jj][ii]/(prof_weight[ii]-1))), end='')
+            print( "%-16f " % (prof_std[ii][jj]), end='')
       # Print the Error
       if print_err and n_frame > 1:
          for jj in range(n_col):
-            print( "%-16f " %(m.sqrt(prof_var[jj][ii]/(prof_weight[ii]-1)/prof_weight[ii])), end='')
+            print( "%-16f " %(prof_err[ii][jj]), end='')
 
       print()
 print()
@@ -27,12 +27,15 @@ import os
 import argparse
 import numpy as np
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from atom_style import get_atom_style, read_atoms, set_columns, format_atoms
+
 parser = argparse.ArgumentParser(description='Fold sheet to cnt')
 parser.add_argument('data_file_in', type=str, help='Path of the lammps data file')
 parser.add_argument('-data_file_out', default='o.pos.data', type=str, help='Path of the lammps data file')
 parser.add_argument('-dim_roll', type=str, default='x', help='x, y or z')
 parser.add_argument('-dim_norm', type=str, default='z', help='x, y or z')
-parser.add_argument('-atomtype', type=str, default='full', help='Set the atomtype in the Lammps data file (e.g., full, atomic, etc.)')
+parser.add_argument('-atomtype', type=str, default='full', help='Set the atomtype in the Lammps data file (e.g., full, atomic, charge or "hybrid sphere dipole")')
 parser.add_argument('-adjust_norm', type=float, default='30.0', help='Adjust the normal direction of the box to avoid overlap')
 
 dim2int = {"x":0, "y":1, "z":2}
@@ -55,12 +58,9 @@ if __name__ == "__main__":
   print("adjust_norm : 2*r + ", adjust_norm)
 
   # Deal with the format of the Lammps data file
-  if atomtype == 'full':
-    kType = 2
-    kColX = 4
-    kColY = 5
-    kColZ = 6
-  else:
+  try:
+    style = get_atom_style(atomtype)
+  except ValueError:
     print('unsupported format of Lammps data files for the atom type ' + atomtype)
     sys.exit()
 
@@ -105,22 +105,12 @@ if __name__ == "__main__":
       line_i += 1
 
   # Read the atom coordinates
-  rr_list = []
-  type_list = []
-  for ii in range(n_atom):
-     lsplit = lines[line_atom+ii].split()
-     type_ = int(lsplit[kType])
-     xx = float(lsplit[kColX])
-     yy = float(lsplit[kColY])
-     zz = float(lsplit[kColZ])
-     rr_list.append([xx, yy, zz])
-     type_list.append(type_)
+  table = read_atoms(lines[line_atom:line_atom+n_atom])
+  types = table[:, style.col['type']].astype(np.int64)
+  rr = table[:, style.xyz].astype(np.float64)
 
   # calculate the reference normal position of the sheet
-  norm_ref = 0.0
-  for rr in rr_list:
-    norm_ref += rr[dim_norm]
-  norm_ref /= n_atom
+  norm_ref = np.mean(rr[:, dim_norm])
   print("norm_ref: ", norm_ref)
 
   # calculate the length of the sheet along the folding direction
@@ -130,15 +120,11 @@ if __name__ == "__main__":
   radius = length / (2.0*np.pi)
 
   # apply the deformation
-  rr_cnt_list = []
-  for rr in rr_list:
-    theta = rr[dim_roll]/radius
-    dr_ref = rr[dim_norm]-norm_ref
-    rr_cnt = rr
-    radius_ref = radius + dr_ref
-    rr_cnt[dim_norm] = radius_ref*np.cos(theta) + norm_ref
-    rr_cnt[dim_roll] = radius_ref*np.sin(theta)
-    rr_cnt_list.append(rr_cnt)
+  theta = rr[:, dim_roll]/radius
+  radius_ref = radius + rr[:, dim_norm] - norm_ref
+  rr_cnt = rr.copy()
+  rr_cnt[:, dim_norm] = radius_ref*np.cos(theta) + norm_ref
+  rr_cnt[:, dim_roll] = radius_ref*np.sin(theta)
 
   if adjust_norm > 1e-5:
     box_dim_norm_new = 2.0*radius + adjust_norm
@@ -154,16 +140,8 @@ if __name__ == "__main__":
   lines[line_box + 1] = "%.9f %.9f ylo yhi\n" % (Llo[1], Lhi[1])
   lines[line_box + 2] = "%.9f %.9f zlo zhi\n" % (Llo[2], Lhi[2])
 
-  ii = 0
-  for rr in rr_cnt_list:
-    line = lines[line_atom+ii]
-    lsplit = line.split()
-    lsplit[kColX] = str(rr[0])
-    lsplit[kColY] = str(rr[1])
-    lsplit[kColZ] = str(rr[2])
-    jline =  " ".join(lsplit)
-    lines[line_atom+ii] = jline + "\n"
-    ii += 1
+  table = set_columns(table, style.xyz, rr_cnt)
+  lines[line_atom:line_atom+n_atom] = format_atoms(table)
 
   # export data file
   with open(data_file_out, 'w') as g:
@@ -181,11 +159,5 @@ if __name__ == "__main__":
   foo.write("%f %f\n" % (Llo[1], Lhi[1]))
   foo.write("%f %f\n" % (Llo[2], Lhi[2]))
   foo.write("ITEM: ATOMS id type xu yu zu\n")
-  ii = 1
-  type_ = 1
-  for ii in range(len(rr_cnt_list)):
-    rr = rr_cnt_list[ii]
-    type_ = type_list[ii]
-    foo.write("%d %d %f %f %f\n" % (ii, type_, rr[0], rr[1], rr[2]))
-    ii += 1
+  np.savetxt(foo, np.column_stack((np.arange(n_atom), types, rr_cnt)), fmt="%d %d %f %f %f")
   foo.close()
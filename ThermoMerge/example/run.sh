@@ -20,3 +20,9 @@ echo -e "  header string : 'Step KinEng aux1 aux2'"
 echo -e "  hide last     : True"
 echo -e "  output        : 'o.log_step_kineng_aux1_aux2_hide_last'"
 python ../thermo_merge.py o.sample_log "Step KinEng aux1 aux2" -hide_last 1 > o.log_step_kineng_aux1_aux2_hide_last
+
+echo -e "Testing thermo_merge:"
+echo -e "  header string : 'Step KinEng aux1'"
+echo -e "  merge step    : True"
+echo -e "  output        : 'o.log_step_kineng_aux1_merge_step.csv'"
+python ../thermo_merge.py o.sample_log "Step KinEng aux1" -merge_step 1 -o o.log_step_kineng_aux1_merge_step.csv
@@ -26,11 +26,22 @@ import os
 import sys
 import math
 import argparse
+import numpy as np
 
-parser = argparse.ArgumentParser(description='Decimate lammps dump files')
-parser.add_argument('filename', type=str, help='Path of the lammps thermo file')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from follow import follow_lines
+from dump_io import open_dump, compression_of
+from thermo_io import find_blocks, map_log, read_thermo
+
+parser = argparse.ArgumentParser(description='Merge the thermo outputs of lammps log files')
+parser.add_argument('filename', type=str, nargs='+', help='Path(s) of the lammps thermo file(s) (e.g., log.lammps.0 log.lammps.1 ..)')
 parser.add_argument('header_part', type=str, help='Part of the header')
 parser.add_argument('-hide_last', type=int, default=0, help='Show value from last step.')
+parser.add_argument('-merge_step', type=int, default=0, help='Merge the columns of header_part of all blocks on the Step column; rows of repeated steps (e.g., from restarts) are taken from the last block')
+parser.add_argument('-o', '--output', type=str, default='-', help='Output file (default: stdout); with -merge_step .csv, .npy or text, otherwise compressed by the extension .gz, .xz or .zst')
+parser.add_argument('-follow', type=int, default=0, help='Keep merging the lines appended by a running simulation')
+parser.add_argument('-interval', type=float, default=5.0, help='Time between checks for appended lines with -follow (s)')
+parser.add_argument('-timeout', type=float, default=0, help='Stop following when no line was appended for this long (s; 0: never)')
 
 def is_number(s):
   try:
@@ -39,45 +50,144 @@ def is_number(s):
   except ValueError:
     return False
 
-if __name__ == "__main__":
-  args = parser.parse_args()
-  filename = args.filename
-  header_part = args.header_part
-  hide_last = args.hide_last
+def MergeBlocks(filenames, header_part, hide_last, out):
+  """
+  Copies the rows of the thermo blocks located by byte searches over the
+  memory-mapped (or, if compressed, decompressed) files; the rows are
+  written verbatim without being parsed.
+  """
+  iblock = 0
+  skip_current_frame = False
+  for filename in filenames:
+    with map_log(filename) as buf:
+      for header, header_offset, start, end in find_blocks(buf, header_part):
+        if iblock > 0 and hide_last:
+          skip_current_frame = True
+        if skip_current_frame and end > start:
+          start = buf.find(b'\n', start) + 1
+          skip_current_frame = False
+        out.write(buf[start:end])
+        iblock += 1
 
+def MergeSteps(filenames, header_part):
+  """
+  Merges the blocks of the thermo files on the Step column.
+
+  header_part lists the merged columns; the thermo blocks whose header has
+  all of them are used and the others are skipped. The rows of all blocks
+  are sorted by step and, for repeated steps (e.g., overlapping restart
+  segments), the row of the last block in file order is kept.
+
+  Returns:
+    numpy.ndarray: Array of shape (n_step, n_col) sorted by step.
+  """
+  columns = header_part.split()
+  if 'Step' not in columns:
+    raise ValueError('the header must contain the Step column: %s' % header_part)
+  data = []
+  for filename in filenames:
+    for block in read_thermo(filename, 'Step'):
+      if not all(name in block.columns for name in columns):
+        continue
+      data.append(block.data[:, [block.columns.index(name) for name in columns]])
+  if not data:
+    return np.empty((0, len(columns)))
+  data = np.concatenate(data)
+
+  # stable sort by step: the last row of each step comes from the last block
+  steps = data[:, columns.index('Step')]
+  order = np.argsort(steps, kind='stable')
+  steps = steps[order]
+  last = np.append(steps[1:] != steps[:-1], True)
+  return data[order[last]]
+
+def WriteSteps(data, columns, output):
+  """Writes the merged rows as CSV (.csv), a structured .npy array or text."""
+  dtype = [(name, np.int64 if name == 'Step' else np.float64) for name in columns]
+  if output.endswith('.npy'):
+    table = np.empty(len(data), dtype=dtype)
+    for icol, name in enumerate(columns):
+      table[name] = data[:, icol]
+    np.save(output, table)
+    return
+  fmt = ['%d' if name == 'Step' else '%.16g' for name in columns]
+  delimiter = ',' if output.endswith('.csv') else ' '
+  out = sys.stdout if output == '-' else open(output, 'w')
+  out.write(delimiter.join(columns) + '\n')
+  np.savetxt(out, data, fmt=fmt, delimiter=delimiter)
+  if out is not sys.stdout:
+    out.close()
+
+def MergeLines(lines, header_part, hide_last, out):
+  """Writes the rows of the thermo blocks line by line (used with -follow)."""
   # Set flags
   print_flag = False
   first_header = True
   skip_current_frame = False
 
-  # print the header
-  print( header_part)
-
-  with open(filename) as openfileobject:
-    for cur_line in openfileobject:
-
-        # Check if this line starts with string. If yes don't print.
-        if cur_line.split(None, 1):
-           if not is_number(cur_line.split(None, 1)[0]):
-              print_flag = False
-        else:
-           print_flag = False
-
-        # Print except if skip_current_frame says otherwise.
-        if print_flag:
-           if not skip_current_frame:
-              print( cur_line, end = '')
-           else:
-              skip_current_frame = False
-
-        # If this line is a header start printing
-        if header_part in cur_line:
-           if first_header:
-              first_header = False
-              skip_current_frame = False
-           else:
-              if hide_last:
-                 skip_current_frame = True
-           print_flag = True
+  for cur_line in lines:
+
+      # Check if this line starts with string. If yes don't print.
+      if cur_line.split(None, 1):
+         if not is_number(cur_line.split(None, 1)[0]):
+            print_flag = False
+      else:
+         print_flag = False
+
+      # Print except if skip_current_frame says otherwise.
+      if print_flag:
+         if not skip_current_frame:
+            out.write(cur_line)
+         else:
+            skip_current_frame = False
+
+      # If this line is a header start printing
+      if header_part in cur_line:
+         if first_header:
+            first_header = False
+            skip_current_frame = False
+         else:
+            if hide_last:
+               skip_current_frame = True
+         print_flag = True
+
+if __name__ == "__main__":
+  args = parser.parse_args()
+  filenames = args.filename
+  header_part = args.header_part
+  hide_last = args.hide_last
+
+  if args.merge_step:
+    try:
+      data = MergeSteps(filenames, header_part)
+    except ValueError as err:
+      print("Error:", err, file=sys.stderr)
+      sys.exit(1)
+    WriteSteps(data, header_part.split(), args.output)
+    sys.exit(0)
+
+  if args.follow and len(filenames) > 1:
+    print("Error: -follow supports a single thermo file", file=sys.stderr)
+    sys.exit(1)
+  if args.follow and compression_of(filenames[0]) is not None:
+    print("Error: -follow supports an uncompressed thermo file", file=sys.stderr)
+    sys.exit(1)
+
+  if not args.follow:
+    with open_dump(args.output, 'wb') as out:
+      out.write((header_part + '\n').encode())
+      MergeBlocks(filenames, header_part, hide_last, out)
+    sys.exit(0)
+
+  out = sys.stdout if args.output == '-' else open(args.output, 'w')
+  out.write(header_part + '\n')
+  with open(filenames[0]) as openfileobject:
+    lines = follow_lines(openfileobject, args.interval, args.timeout, on_wait=out.flush)
+    try:
+      MergeLines(lines, header_part, hide_last, out)
+    except KeyboardInterrupt:
+      pass
+  if out is not sys.stdout:
+    out.close()
 
   sys.exit(0)
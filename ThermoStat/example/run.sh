@@ -1,2 +1,3 @@
 #!/bin/bash
+python ../thermo_hist.py in.sample_log 'Step val1 val2 val3' 'END FLAG' -nbin 20 -skip 0 -stream 1 -range val1:0:1 > o.stream.log
 python ../thermo_hist.py in.sample_log 'Step val1 val2 val3' 'END FLAG' -nbin 20 -skip 0 > o.log
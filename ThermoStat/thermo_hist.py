@@ -25,24 +25,41 @@
 import sys
 import os
 import argparse
+import json
 import math as m
 import numpy as np
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from thermo_io import read_thermo, ThermoStream
+from stats import block_average, optimal_block, integrated_time, RunningStats
+
 parser = argparse.ArgumentParser(description='Statistics of thermo quantities')
 parser.add_argument('thermo_file', type=str, help='Path of the lammps thermo file')
 parser.add_argument('header', type=str, help='header')
 parser.add_argument('end_flag', type=str, help='end_flag')
 parser.add_argument('-skip', type=int, default=0, help='skip lines')
 parser.add_argument('-nbin', type=int, default=10, help='histogram bins')
+parser.add_argument('-cols', type=str, default=None, help='Comma separated thermo columns (default: the columns of the header except Step)')
+parser.add_argument('-cache', type=int, default=0, help='Reuse (or create) the .npy cache of the parsed thermo blocks')
+parser.add_argument('-stream', type=int, default=0, help='Constant-memory statistics over chunks of rows (no autocorrelation time)')
+parser.add_argument('-range', type=str, nargs='+', default=[], help='Fixed histogram ranges (e.g., val1:0:1 val2:-5:5); otherwise -stream makes two passes')
+parser.add_argument('-checkpoint', type=str, default=None, help='Path of the state of -stream; it is updated with the rows appended to the log file since')
 
 
 args = parser.parse_args()
 FILENAME          = args.thermo_file
 HEADER            = args.header
-THERMO_QUANTITIES = ["val1", "val2", "val3"]
+THERMO_QUANTITIES = [col for col in HEADER.split() if col != "Step"]
+if args.cols is not None:
+   THERMO_QUANTITIES = args.cols.split(',')
 END_FLAG          = args.end_flag
 N_HIST_BINS       = args.nbin
 N_SKIP_LINES      = args.skip
+HIST_RANGES       = {}
+for hist_range in args.range:
+   thermo, lo, hi = hist_range.rsplit(':', 2)
+   HIST_RANGES[thermo] = (float(lo), float(hi))
+STREAM            = bool(args.stream) or args.checkpoint is not None
 
 #sys.exit()
 
@@ -52,93 +69,187 @@ N_SKIP_LINES      = args.skip
 
 #FILENAME          = "o.sample_log.0"
 #HEADER            = "Step val1 val2 val3"
-#THERMO_QUANTITIES = ["val1", "val2", "val3"]
+#THERMO_QUANTITIES = [col for col in HEADER.split() if col != "Step"]
 #END_FLAG          = "END FLAG"
 #N_HIST_BINS       = 100
 #N_SKIP_LINES      = 0
 
 
-THERMO_DATA = {}
-for thermo in THERMO_QUANTITIES:
-   THERMO_DATA[thermo] = []
+def WriteHist(thermo, hist, bin_edge):
+   foo = open("o.hist."+thermo, 'w')
+   for ii in range(len(hist)):
+      foo.write("%-15d %-15f %-15f\n" % (ii, bin_edge[ii], hist[ii]))
+   foo.close()
 
-log_data = {}
+def WriteBlocks(thermo, sizes, counts, errs, errs_err, iopt):
+   # export the block averaging levels; * marks the chosen one
+   foo = open("o.block."+thermo, 'w')
+   foo.write("%-15s %-15s %-15s %-15s\n" % ("block_size", "n_block", "err", "err_err"))
+   for ii in range(len(sizes)):
+      foo.write("%-15d %-15d %-15f %-15f %s\n" % (sizes[ii], counts[ii], errs[ii], errs_err[ii], "*" if ii == iopt else ""))
+   foo.close()
 
-for ifile in range(1):
+def CheckColumns(columns):
+   # the quantities must be columns of the thermo blocks found
+   missing = [thermo for thermo in THERMO_QUANTITIES if thermo not in columns]
+   if missing:
+      sys.exit("ERROR: no thermo column %s in the block header (available: %s)"
+               % (", ".join(missing), ", ".join(col for col in columns if col != "Step")))
+
+def ReadCheckpoint(filename):
+   # the state is discarded if it belongs to other settings or if the log
+   # file is shorter than the bytes already read
+   if filename is None or not os.path.exists(filename):
+      return None
+   with open(filename) as foo:
+      state = json.load(foo)
+   if (state["thermo_file"] != os.path.abspath(FILENAME) or state["header"] != HEADER
+         or state["end_flag"] != END_FLAG or state["skip"] != N_SKIP_LINES
+         or state["nbin"] != N_HIST_BINS or list(state["stats"]) != THERMO_QUANTITIES
+         or os.path.getsize(FILENAME) < state["offset"]):
+      print("Discarding the checkpoint %s" % filename, file=sys.stderr)
+      return None
+   return state
+
+def WriteCheckpoint(filename, stream, n_row, accs):
+   state = {"thermo_file": os.path.abspath(FILENAME), "header": HEADER, "end_flag": END_FLAG,
+            "skip": N_SKIP_LINES, "nbin": N_HIST_BINS, "offset": stream.offset,
+            "columns": stream.columns, "n_row": n_row,
+            "stats": {thermo: accs[thermo].state() for thermo in accs}}
+   with open(filename + ".tmp", 'w') as foo:
+      json.dump(state, foo)
+   os.replace(filename + ".tmp", filename)
+
+def StreamRows(stream, n_row, update, n_row_max=None):
+   # feeds the rows of the chunks after the first N_SKIP_LINES rows (and up
+   # to n_row_max rows) to update
+   for block in stream:
+      if n_row_max is not None and n_row + len(block) > n_row_max:
+         block.data = block.data[:max(n_row_max - n_row, 0)]
+      skip = min(max(N_SKIP_LINES - n_row, 0), len(block))
+      n_row += len(block)
+      if skip < len(block):
+         update(block, skip)
+   return n_row
+
+if not STREAM:
+   #
+   # Locate the thermo blocks between the header and END_FLAG and parse each
+   # block at once; the first N_SKIP_LINES rows are skipped
+   #
+   blocks = []
+   if os.path.exists(FILENAME):
+      blocks = read_thermo(FILENAME, HEADER, END_FLAG, cache=bool(args.cache))
+   for block in blocks:
+      CheckColumns(block.columns)
 
-   FILENAME_FULL = FILENAME
+   THERMO_DATA = {}
+   for thermo in THERMO_QUANTITIES:
+      data = [block.column(thermo) for block in blocks]
+      THERMO_DATA[thermo] = np.concatenate(data)[N_SKIP_LINES:] if data else np.empty(0)
 
-   if not os.path.exists(FILENAME_FULL):
-       break
    #
-   foo = open(FILENAME_FULL, 'r')
-
-   #Skip the first lines untill reaching the header
-   iline = 0
-   read_flag = False
-   while True:
-       line = foo.readline()
-
-       if line == '':
-          break
-       if END_FLAG in line:
-          read_flag = False
-
-       if read_flag:
-          iline += 1
-          if iline > N_SKIP_LINES:
-              thermo_line = line.split()
-              for ithermo in THERMO_QUANTITIES:
-                  icol = col_of_thermo[ithermo]
-                  THERMO_DATA[ithermo].append(float(thermo_line[icol]))
-
-       if not read_flag and HEADER in line:
-          read_flag = True
-          header = line.split()
-          col_of_thermo = {}
-
-          icol = 0
-          for ithermo in header:
-              for jthermo in THERMO_QUANTITIES:
-                  if ithermo == jthermo:
-                      col_of_thermo[ithermo] = icol
-              icol += 1
-foo.close()
+   # Statistics of each quantity. The error of the mean is given for
+   # uncorrelated samples (err), from block averaging (err_block) and from the
+   # integrated autocorrelation time tau (err_acf, in units of the sampling
+   # interval). The histograms and the error estimates of the block averaging
+   # levels are exported to o.hist.* and o.block.*.
+   #
+   STATS = ["mean", "std", "err", "err_block", "tau", "err_acf"]
+   THERMO_STATS = {}
+   for ithermo in THERMO_DATA:
+      data    = THERMO_DATA[ithermo]
+      n_data  = len(data)
+      std     = np.std(data, ddof=1)
+      sizes, counts, errs, errs_err = block_average(data)
+      iopt    = optimal_block(sizes, errs, n_data)
+      tau     = integrated_time(data)
+      THERMO_STATS[ithermo] = {
+         "mean"      : np.average(data),
+         "std"       : std,
+         "err"       : std/np.sqrt(n_data),
+         "err_block" : errs[iopt],
+         "tau"       : tau,
+         "err_acf"   : std*np.sqrt(tau/n_data),
+      }
+
+      # export the histogram
+      min_val = data.min()
+      max_val = data.max()
+      nbin    = N_HIST_BINS
+      step    = (max_val - min_val) / float(N_HIST_BINS)
+      bins    = min_val + np.arange(nbin + 1)*step
+
+      hist, bin_edge = np.histogram(data, bins=bins, density=False)
+      WriteHist(ithermo, hist, bin_edge)
+      WriteBlocks(ithermo, sizes, counts, errs, errs_err, iopt)
+
+else:
+   #
+   # Constant-memory statistics: the rows are read in chunks and accumulated
+   # to a RunningStats per quantity. Histograms without a fixed -range take
+   # a second pass over the log file with the range of the first one. With
+   # -checkpoint the accumulators are stored along with the offset of the
+   # last row read, and later calls read only the rows appended since.
+   #
+   STATS = ["mean", "std", "err", "err_block"]
+   state = ReadCheckpoint(args.checkpoint)
+   if state is None:
+      offset, columns, n_row = 0, None, 0
+      accs = {thermo: RunningStats(N_HIST_BINS, HIST_RANGES.get(thermo)) for thermo in THERMO_QUANTITIES}
+   else:
+      offset, columns, n_row = state["offset"], state["columns"], state["n_row"]
+      accs = {thermo: RunningStats.from_state(state["stats"][thermo]) for thermo in THERMO_QUANTITIES}
+
+   def Update(block, skip):
+      CheckColumns(block.columns)
+      for thermo in THERMO_QUANTITIES:
+         accs[thermo].update(block.column(thermo)[skip:])
+
+   def UpdateHist(block, skip):
+      for thermo in THERMO_QUANTITIES:
+         if thermo in second_pass:
+            accs[thermo].update_hist(block.column(thermo)[skip:])
+
+   stream = ThermoStream(FILENAME, HEADER, END_FLAG, offset, columns)
+   n_row_end = StreamRows(stream, n_row, Update) if os.path.exists(FILENAME) else n_row
+
+   # the second pass is limited to the rows of the first one, since the log
+   # file may grow in between
+   second_pass = [thermo for thermo in THERMO_QUANTITIES
+                  if accs[thermo].hist_range is None and accs[thermo].n]
+   for thermo in second_pass:
+      accs[thermo].set_range(accs[thermo].min, accs[thermo].max)
+   if second_pass:
+      StreamRows(ThermoStream(FILENAME, HEADER, END_FLAG), 0, UpdateHist, n_row_end)
+
+   if args.checkpoint is not None:
+      WriteCheckpoint(args.checkpoint, stream, n_row_end, accs)
+
+   THERMO_STATS = {}
+   for ithermo in THERMO_QUANTITIES:
+      acc = accs[ithermo]
+      sizes, counts, errs, errs_err = acc.block_average()
+      iopt = optimal_block(sizes, errs, acc.n)
+      THERMO_STATS[ithermo] = {
+         "mean"      : acc.mean,
+         "std"       : acc.std,
+         "err"       : acc.err,
+         "err_block" : errs[iopt] if len(errs) else np.nan,
+      }
+      if acc.hist_range is not None:
+         WriteHist(ithermo, acc.hist, acc.bin_edges)
+         if acc.n_under or acc.n_over:
+            print("%s: %d samples below and %d above the histogram range" % (ithermo, acc.n_under, acc.n_over), file=sys.stderr)
+      WriteBlocks(ithermo, sizes, counts, errs, errs_err, iopt)
 
 print("%-15s " % ("thermo"), end='')
-for ithermo in THERMO_DATA:
+for ithermo in THERMO_STATS:
    print("%-15s " % ithermo, end='')
 print()
 
-print("%-15s " % ("mean"), end='')
-for data in THERMO_DATA.values():
-   print("%-15f " % np.average(data), end='')
-print()
-
-print("%-15s " % ("std"), end='')
-for data in THERMO_DATA.values():
-   print("%-15f " % np.std(data, ddof=1), end='')
-print()
-
-print("%-15s " % ("err"), end='')
-for data in THERMO_DATA.values():
-   print("%-15f " % (np.std(data, ddof=1)/np.sqrt(len(data))), end='')
-print()
-
-# export histograms
-
-for ithermo in THERMO_DATA:
-   data    = THERMO_DATA[ithermo]
-   min_val = min(data)
-   max_val = max(data)
-   nbin    = N_HIST_BINS
-   step    = (max_val - min_val) / float(N_HIST_BINS)
-   bins    = [min_val + ii*step for ii in range(nbin + 1)]
-
-   foo = open("o.hist."+ithermo, 'w')
-
-   hist, bin_edge = np.histogram(data, bins=bins, density=False)
-
-   for ii in range(nbin):
-      foo.write("%-15d %-15f %-15f\n" % (ii, bin_edge[ii], hist[ii]))
-   foo.close()
+for stat in STATS:
+   print("%-15s " % (stat), end='')
+   for ithermo in THERMO_STATS:
+      print("%-15f " % THERMO_STATS[ithermo][stat], end='')
+   print()
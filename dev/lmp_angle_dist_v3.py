@@ -3,6 +3,10 @@ import sys
 import ast
 import numpy as np
 import math as m
+from itertools import islice
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from dump_cache import load_frames
 
 DUMP_COL_ID    = 0
 DUMP_COL_MOLID = 1
@@ -100,83 +104,51 @@ print( "Number of Frames:",nFrame )
 
 # Initialize the array of vectors with dimensions:
 # [Nframe x NAngles x 3]
-angles_frame = [[0.0 for j in range(nAngle)] for j in range(nFrame)]
+angles_frame = np.zeros((nFrame, nAngle))
+angle_ids_arr = np.array(angle_ids, dtype=np.int64).reshape(nAngle, 3)
 all_angles = []
 #
 # Load the atom trajectories
 #
-f = open(sys.argv[4],"r")
 print( "Reading the trajectory file",sys.argv[4],".." )
-#for NFrame in range(20):
-for tt in range(nFrame):
+for tt, frame in enumerate(islice(load_frames(sys.argv[4]), nFrame)):
 
-   f.readline()                # ITEM: TIMESTEP
-   Timestep = int(f.readline())
+   Timestep = frame.timestep
 
    if (nFrame > 10 and tt % int(nFrame / 10.0) == 0):
       print( "time step = ", Timestep )
 
-   f.readline()                # ITEM: NUMBER OF ATOMS
-   nAtoms = int(f.readline())
-   f.readline()                # ITEM: BOX BOUNDS
-   Dim = f.readline().split()  # xlo xhi
-   LL0 = float(Dim[1])-float(Dim[0])
-   Dim = f.readline().split()  # ylo yhi
-   LL1 = float(Dim[1])-float(Dim[0])
-   Dim = f.readline().split()  # zlo zhi
-   LL2 = float(Dim[1])-float(Dim[0])
-   f.readline()                # ITEM: FORMAT
+   box = frame.box
+   LL = box[:,1] - box[:,0]
    #
-   # Loop over all atoms and create a
-   # dictionary for atom IDs and coordinates
+   # Map the atom IDs to the rows of the frame
    #
-   pos = {}
-   for ii in range(nAtoms):
-      line = f.readline().split()
-      id = int(line[DUMP_COL_ID])
-      xx = float(line[DUMP_COL_X])
-      yy = float(line[DUMP_COL_Y])
-      zz = float(line[DUMP_COL_Z])
-      pos.update({id:[xx,yy,zz]})
+   atoms = frame.select_columns([DUMP_COL_ID, DUMP_COL_X, DUMP_COL_Y, DUMP_COL_Z])
+   names = atoms.dtype.names
+   ids = atoms[names[0]]
+   pos = np.column_stack((atoms[names[1]], atoms[names[2]], atoms[names[3]]))
+   row_of_id = np.empty(ids.max()+1, dtype=np.int64)
+   row_of_id[ids] = np.arange(len(ids))
    #
    # Now lets calculate the angle vectors!
    #
-   bId = 0
-   aid = 0
-   for angle in angle_ids:
-
-       bond_a0 = pos[angle[0]][0]-pos[angle[1]][0]
-       bond_a1 = pos[angle[0]][1]-pos[angle[1]][1]
-       bond_a2 = pos[angle[0]][2]-pos[angle[1]][2]
-
-       # Lets perform a minimum image just to be sure!
-       bond_a0 -= LL0 * round(bond_a0 / LL0)
-       bond_a1 -= LL1 * round(bond_a1 / LL1)
-       bond_a2 -= LL2 * round(bond_a2 / LL2)
-
-       bond_a_mag = m.sqrt(bond_a0*bond_a0+bond_a1*bond_a1+bond_a2*bond_a2)
+   pos_0 = pos[row_of_id[angle_ids_arr[:,0]]]
+   pos_1 = pos[row_of_id[angle_ids_arr[:,1]]]
+   pos_2 = pos[row_of_id[angle_ids_arr[:,2]]]
 
-       bond_b0 = pos[angle[2]][0]-pos[angle[1]][0]
-       bond_b1 = pos[angle[2]][1]-pos[angle[1]][1]
-       bond_b2 = pos[angle[2]][2]-pos[angle[1]][2]
+   bond_a = pos_0 - pos_1
+   bond_b = pos_2 - pos_1
 
-       # Lets perform a minimum image just to be sure!
-       bond_b0 -= LL0 * round(bond_b0 / LL0)
-       bond_b1 -= LL1 * round(bond_b1 / LL1)
-       bond_b2 -= LL2 * round(bond_b2 / LL2)
+   # Lets perform a minimum image just to be sure!
+   bond_a -= LL * np.round(bond_a / LL)
+   bond_b -= LL * np.round(bond_b / LL)
 
-       bond_b_mag = m.sqrt(bond_b0*bond_b0+bond_b1*bond_b1+bond_b2*bond_b2)
+   bond_a_mag = np.sqrt(np.sum(bond_a*bond_a, axis=1))
+   bond_b_mag = np.sqrt(np.sum(bond_b*bond_b, axis=1))
 
-       angles_frame[tt][aid] = m.acos( (bond_a0*bond_b0 + bond_a1*bond_b1+ bond_a2*bond_b2)  / (bond_a_mag * bond_b_mag) )
-
-       #print((bond_a0, bond_a1, bond_a2, bond_a_mag, bond_b0, bond_b1, bond_b2, bond_b_mag, "#", angle, ) )
-
-   #    all_angles.append( angles_frame[tt][aid] )
-
-       aid += 1
-f.close()
+   angles_frame[tt] = np.arccos( np.sum(bond_a*bond_b, axis=1) / (bond_a_mag * bond_b_mag) )
 
-all_angles = [ item for sublist in angles_frame for item in sublist ]
+all_angles = angles_frame.flatten()
 
 #
 # Get the total angle length distributions
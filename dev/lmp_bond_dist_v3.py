@@ -3,7 +3,10 @@ import sys
 import ast
 import numpy as np
 import math as m
+from itertools import islice
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../LmpIo/')))
+from dump_cache import load_frames
 
 
 DUMP_COL_ID    = 0
@@ -104,62 +107,39 @@ print ( "Number of Frames:",nFrame )
 
 # Initialize the array of vectors with dimensions:
 # [Nframe x NBonds x 3]
-segvec = [[[0.0 for d in range(3)] for j in range(nBond)] for t in range(nFrame)]
+segvec = np.zeros((nFrame, nBond, 3))
+bond_ids = np.array(bonds, dtype=np.int64).reshape(nBond, 2)
 #
 # Load the atom trajectories
 #
-f = open(sys.argv[4],"r")
 print ( "Reading the trajectory file",sys.argv[4],".." )
-#for NFrame in range(20):
-for tt in range(nFrame):
+for tt, frame in enumerate(islice(load_frames(sys.argv[4]), nFrame)):
 
-   f.readline()                # ITEM: TIMESTEP
-   Timestep = int(f.readline())
+   Timestep = frame.timestep
 
-   if (tt % int(nFrame / 10.0) == 0):
+   if (tt % max(int(nFrame / 10.0), 1) == 0):
       print ( "time step = ", Timestep )
 
-   f.readline()                # ITEM: NUMBER OF ATOMS
-   nAtoms = int(f.readline())
-   f.readline()                # ITEM: BOX BOUNDS
-   Dim = f.readline().split()  # xlo xhi
-   LL0 = float(Dim[1])-float(Dim[0])
-   Dim = f.readline().split()  # ylo yhi
-   LL1 = float(Dim[1])-float(Dim[0])
-   Dim = f.readline().split()  # zlo zhi
-   LL2 = float(Dim[1])-float(Dim[0])
-   f.readline()                # ITEM: FORMAT
+   box = frame.box
+   LL = box[:,1] - box[:,0]
    #
-   # Loop over all atoms and create a
-   # dictionary for atom IDs and coordinates
+   # Map the atom IDs to the rows of the frame
    #
-   pos = {}
-   for ii in range(nAtoms):
-      line = f.readline().split()
-      id = int(line[DUMP_COL_ID])
-      xx = float(line[DUMP_COL_X])
-      yy = float(line[DUMP_COL_Y])
-      zz = float(line[DUMP_COL_Z])
-      pos.update({id:[xx,yy,zz]})
+   atoms = frame.select_columns([DUMP_COL_ID, DUMP_COL_X, DUMP_COL_Y, DUMP_COL_Z])
+   names = atoms.dtype.names
+   ids = atoms[names[0]]
+   pos = np.column_stack((atoms[names[1]], atoms[names[2]], atoms[names[3]]))
+   row_of_id = np.empty(ids.max()+1, dtype=np.int64)
+   row_of_id[ids] = np.arange(len(ids))
    #
    # Now lets calculate the bond vectors!
    #
-   bId = 0
-   for bond in bonds:
+   bond_vec = pos[row_of_id[bond_ids[:,1]]] - pos[row_of_id[bond_ids[:,0]]]
 
-       bondLen0 = pos[bond[1]][0]-pos[bond[0]][0]
-       bondLen1 = pos[bond[1]][1]-pos[bond[0]][1]
-       bondLen2 = pos[bond[1]][2]-pos[bond[0]][2]
+   # Lets perform a minimum image just to be sure!
+   bond_vec -= LL * np.round(bond_vec / LL)
 
-       # Lets perform a minimum image just to be sure!
-       bondLen0 -= LL0 * round(bondLen0 / LL0)
-       bondLen1 -= LL1 * round(bondLen1 / LL1)
-       bondLen2 -= LL2 * round(bondLen2 / LL2)
-
-       segvec[tt][bId]=[bondLen0,bondLen1,bondLen2]
-
-       bId += 1
-f.close()
+   segvec[tt] = bond_vec
 #
 # Get the bond length distributions
 #